@@ -0,0 +1,181 @@
+"""Applicant store benchmarks: sort and filter at registration-window scale."""
+import os
+import random
+import time
+
+from benchmarks.timing import measure, summarize
+
+ROWS = int(os.environ.get('YARA_BENCH_ROWS', 1_000_000))
+BATCH = 50_000
+
+BANKS = ('ملی', 'ملت', 'صادرات', 'تجارت', 'سپه', 'رفاه')
+LOAN_TYPES = ('ازدواج', 'فرزند')
+STATUSES = ('در صف', 'در حال ثبت', 'ثبت شده', 'ناموفق')
+
+
+def synthetic_batch(rng, start, count):
+    names = [f"نام{i}" for i in range(500)]
+    return {
+        'national_id': [rng.randrange(10 ** 10) for _ in range(count)],
+        'first_name': [rng.choice(names) for _ in range(count)],
+        'last_name': [rng.choice(names) for _ in range(count)],
+        'phone': [9_000_000_000 + rng.randrange(10 ** 9) for _ in range(count)],
+        'loan_type': [rng.choice(LOAN_TYPES) for _ in range(count)],
+        'bank': [rng.choice(BANKS) for _ in range(count)],
+        'status': [rng.choice(STATUSES) for _ in range(count)],
+        'registered_at': list(range(1_700_000_000 + start, 1_700_000_000 + start + count)),
+    }
+
+
+def build_store(rows=ROWS, seed=1):
+    from core.applicants.store import ApplicantStore
+
+    rng = random.Random(seed)
+    store = ApplicantStore()
+    for start in range(0, rows, BATCH):
+        store.append_columns(synthetic_batch(rng, start, min(BATCH, rows - start)))
+    return store
+
+
+def bench_store(repeat):
+    results = {}
+    start = time.perf_counter()
+    store = build_store()
+    results['store.load'] = summarize([(time.perf_counter() - start) * 1000.0])
+
+    repeat = max(3, repeat // 4)
+    for name in ('national_id', 'last_name', 'bank'):
+        column = store.column_index[name]
+        # What the GUI thread pays to hand a column to the sort-index worker,
+        # then the build itself, which runs on the worker in the app
+        start = time.perf_counter()
+        build = store.sort_index_builder(column)
+        results[f'store.sort_index_copy.{name}'] = summarize([(time.perf_counter() - start) * 1000.0])
+        start = time.perf_counter()
+        store.install_sort_index(build())
+        results[f'store.sort_index.{name}'] = summarize([(time.perf_counter() - start) * 1000.0])
+        results[f'store.sort.{name}'] = measure(lambda: store.view(column, True), repeat=repeat)
+
+    loan_filter = {'loan_type': {'ازدواج'}}
+    bank_filter = {'loan_type': {'ازدواج'}, 'bank': {'ملی'}}
+    results['store.filter.loan_type'] = measure(lambda: store.view(None, False, loan_filter), repeat=repeat)
+    results['store.filter_sort.bank'] = measure(
+        lambda: store.view(store.column_index['national_id'], False, bank_filter), repeat=repeat)
+
+    rng = random.Random(2)
+    results['store.append_sorted_1k'] = measure(
+        lambda: (store.append_columns(synthetic_batch(rng, 0, 1000)),
+                 store.sorted_rows(store.column_index['national_id'])),
+        repeat=repeat)
+    return results
+
+
+def bench_search(repeat):
+    from core.applicants.search import ApplicantSearchIndex
+    from core.applicants.store import ApplicantStore
+
+    # Index attached up front, so loading includes incremental indexing
+    rng = random.Random(1)
+    store = ApplicantStore()
+    index = ApplicantSearchIndex(store)
+    store.add_index(index)
+    start = time.perf_counter()
+    for batch_start in range(0, ROWS, BATCH):
+        store.append_columns(synthetic_batch(rng, batch_start, min(BATCH, ROWS - batch_start)))
+    results = {'search.load_indexed': summarize([(time.perf_counter() - start) * 1000.0])}
+
+    national_id = store.value(ROWS // 2, store.column_index['national_id'])
+    queries = {
+        'national_id.full': national_id,
+        'national_id.prefix4': national_id[:4],
+        'national_id.prefix2': national_id[:2],
+        'phone.prefix': '0912',
+        'name.token': 'نام123',
+        'name.prefix': 'نام12',
+        'name.two_words': 'نام12 نام34',
+        'name_and_digits': f'نام12 {national_id[:3]}',
+    }
+    for name, query in queries.items():
+        results[f'search.{name}'] = measure(lambda query=query: index.search(query), repeat=repeat)
+
+    rows = index.search('نام12')
+    loan_filter = {'loan_type': {'ازدواج'}}
+    results['search.view_sorted'] = measure(
+        lambda: store.view(store.column_index['last_name'], False, loan_filter, rows), repeat=repeat)
+
+    edited = rng.sample(range(ROWS), 1000)
+    results['search.update_1k'] = measure(
+        lambda: store.update_many('phone', {row: rng.randrange(10 ** 9) for row in edited}),
+        repeat=max(3, repeat // 4))
+    return results
+
+
+def bench_logs(repeat):
+    import logging
+
+    from core.events import EventBus
+    from core.logs import LogRing, RingLogHandler
+
+    ring = LogRing()
+    handler = RingLogHandler(ring, EventBus())
+    logger = logging.Logger('bench.logs')
+    logger.addHandler(handler)
+    banks = BANKS
+    lines = 10_000
+
+    def ingest():
+        for i in range(lines):
+            logger.info("session %d login ok", i, extra={'bot': 'marriage-loan', 'bank': banks[i % 6]})
+
+    results = {'logs.ingest_10k': measure(ingest, repeat=max(3, repeat // 4))}
+    while ring.next_seq < ring.capacity:
+        ingest()
+    bank_filter = ring.compile_filter(bot='marriage-loan', bank=banks[0])
+    level_filter = ring.compile_filter(min_level=logging.WARNING)
+    results['logs.select.bank'] = measure(lambda: ring.select(bank_filter), repeat=repeat)
+    results['logs.select.level'] = measure(lambda: ring.select(level_filter), repeat=repeat)
+    return results
+
+
+def bench_instrument(repeat):
+    from core import instrument
+
+    calls = 100_000
+
+    @instrument.timed('bench.call')
+    def timed_call():
+        pass
+
+    def plain_call():
+        pass
+
+    def run(fn):
+        return lambda: [fn() for _ in range(calls)]
+
+    def with_timer():
+        for _ in range(calls):
+            with instrument.timer('bench.block'):
+                pass
+
+    repeat = max(3, repeat // 4)
+    results = {'instrument.plain_100k': measure(run(plain_call), repeat=repeat)}
+    enabled = instrument.enabled()
+    try:
+        instrument.enable(False)
+        results['instrument.off.timed_100k'] = measure(run(timed_call), repeat=repeat)
+        results['instrument.off.timer_100k'] = measure(with_timer, repeat=repeat)
+        instrument.enable()
+        results['instrument.on.timed_100k'] = measure(run(timed_call), repeat=repeat)
+        results['instrument.on.timer_100k'] = measure(with_timer, repeat=repeat)
+    finally:
+        instrument.enable(enabled)
+        instrument.instruments.reset()
+    return results
+
+
+SUITES = {
+    'data': bench_store,
+    'search': bench_search,
+    'logs': bench_logs,
+    'instrument': bench_instrument,
+}
@@ -0,0 +1,226 @@
+"""Bot engine throughput against the local stand-in bank."""
+import os
+import tempfile
+import threading
+import time
+
+from benchmarks.timing import measure, summarize
+
+SESSIONS = int(os.environ.get('YARA_BENCH_SESSIONS', 2000))
+BANK_LATENCY = float(os.environ.get('YARA_BENCH_BANK_LATENCY', 0.005))
+# Connections per bank host; sessions beyond this wait for a pooled one
+HOST_LIMIT = int(os.environ.get('YARA_BENCH_HOST_LIMIT', 64))
+PROCESSES = int(os.environ.get('YARA_BENCH_PROCESSES', min(4, os.cpu_count() or 1)))
+
+
+def run_sessions(engine, sessions):
+    done = threading.Event()
+    remaining = [len(sessions)]
+    lock = threading.Lock()
+
+    def on_result(result):
+        with lock:
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                done.set()
+
+    engine.add_result_callback(on_result)
+    start = time.perf_counter()
+    engine.submit_many(sessions)
+    done.wait()
+    return time.perf_counter() - start
+
+
+def bench_engine(repeat):
+    from core.bots.engine import BotEngine
+    from core.bots.loan_bot import LoanRegistrationSession, MARRIAGE_LOAN
+    from core.net.transport import Transport
+    from core.testing.mock_bank import MockBankThread
+
+    results = {}
+    with MockBankThread(latency=BANK_LATENCY) as bank:
+        engine = BotEngine(default_bank_limit=256).start()
+        transport = Transport(host_limit=HOST_LIMIT)
+        try:
+            sessions = [
+                LoanRegistrationSession(MARRIAGE_LOAN, 'mock', bank.base_url,
+                                        {'national_id': f"{i:010d}", 'phone': '09120000000'},
+                                        transport=transport)
+                for i in range(SESSIONS)
+            ]
+            elapsed = run_sessions(engine, sessions)
+            stats = engine.stats.as_dict()
+            pool, = transport.stats().values()
+        finally:
+            engine.call_soon(transport.close)
+            engine.stop()
+
+    metric = summarize([elapsed * 1000.0 / SESSIONS])
+    metric['unit'] = 'ms/session'
+    metric['sessions_per_sec'] = SESSIONS / elapsed
+    metric['failed'] = stats['failed'] + stats['timed_out']
+    metric['connections'] = bank.connections
+    metric['connections_reused'] = pool['reused']
+    metric['pool_wait_ms_avg'] = pool['wait_ms_avg']
+    results['engine.session'] = metric
+    return results
+
+
+def bench_process_pool(repeat):
+    from core.bots.loan_bot import LoanRegistrationSession, MARRIAGE_LOAN
+    from core.bots.process_pool import ProcessBotPool
+    from core.testing.mock_bank import MockBankThread
+
+    results = {}
+    with MockBankThread(latency=BANK_LATENCY) as bank:
+        pool = ProcessBotPool(processes=PROCESSES).start()
+        try:
+            sessions = [
+                LoanRegistrationSession(MARRIAGE_LOAN, 'mock', bank.base_url,
+                                        {'national_id': f"{i:010d}", 'phone': '09120000000'})
+                for i in range(SESSIONS)
+            ]
+            elapsed = run_sessions(pool, sessions)
+            stats = pool.stats.as_dict()
+        finally:
+            pool.stop()
+
+    # Includes spawning the workers; progress polling is not exercised here
+    metric = summarize([elapsed * 1000.0 / SESSIONS])
+    metric['unit'] = 'ms/session'
+    metric['sessions_per_sec'] = SESSIONS / elapsed
+    metric['failed'] = stats['failed'] + stats['timed_out']
+    metric['processes'] = pool.processes
+    metric['connections'] = bank.connections
+    results['engine.process_session'] = metric
+    return results
+
+
+def bench_jobs(repeat):
+    from core.bots.jobs import JobQueue
+
+    jobs = 5000
+    producers = 8
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        queue = JobQueue(os.path.join(directory, 'jobs.db'))
+        try:
+            payload = {'national_id': '0012345678', 'phone': '09120000000', 'row': 0}
+            start = time.perf_counter()
+            queue.enqueue_many([('marriage-loan', 'mock', payload)] * jobs)
+            batch = time.perf_counter() - start
+
+            # One job per call from several threads; group commit shares fsyncs
+            def produce():
+                for _ in range(jobs // producers):
+                    queue.enqueue('marriage-loan', 'mock', payload)
+            commits = queue.stats['commits']
+            threads = [threading.Thread(target=produce) for _ in range(producers)]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            single = time.perf_counter() - start
+            single_commits = queue.stats['commits'] - commits
+
+            start = time.perf_counter()
+            done = 0
+            while True:
+                leased = queue.dequeue(256)
+                if not leased:
+                    break
+                for job in leased:
+                    queue.complete(job, {'ok': True})
+                done += len(leased)
+            queue.flush()
+            drain = time.perf_counter() - start
+        finally:
+            queue.close()
+
+    for name, elapsed, count in (('jobs.enqueue_batch', batch, jobs),
+                                 ('jobs.enqueue_threads', single, jobs),
+                                 ('jobs.dequeue_ack', drain, done)):
+        metric = summarize([elapsed * 1000.0 / count])
+        metric['unit'] = 'ms/job'
+        metric['jobs_per_sec'] = count / elapsed
+        results[name] = metric
+    results['jobs.enqueue_threads']['commits'] = single_commits
+    return results
+
+
+def bench_notify(repeat):
+    from core.bots.engine import BotEngine
+    from core.bots.jobs import JobQueue
+    from core.net.transport import Transport
+    from core.notifications import HttpProvider, NotificationDispatcher
+    from core.testing.sms_provider import MockSmsThread
+
+    messages = 20000
+    results = {}
+    # A gateway that takes 20ms per call and refuses more than 4 calls at once
+    with MockSmsThread(latency=0.02, per_message=0.0001, capacity=4) as gateway, \
+            tempfile.TemporaryDirectory() as directory:
+        outbox = JobQueue(os.path.join(directory, 'outbox.db'))
+        engine = BotEngine().start()
+        transport = Transport(host_limit=16)
+        dispatcher = NotificationDispatcher(outbox, [HttpProvider('sms', gateway.url, 200, transport)])
+        try:
+            run = engine.run_coroutine(dispatcher.run())
+            start = time.perf_counter()
+            dispatcher.notify_many([('sms', f"0912{i:07d}", f"پیام {i}", None) for i in range(messages)])
+            queued = time.perf_counter() - start
+            while outbox.pending():
+                time.sleep(0.02)
+            elapsed = time.perf_counter() - start
+            stats = dispatcher.stats('sms')
+            run.cancel()
+        finally:
+            engine.call_soon(transport.close)
+            engine.stop()
+            outbox.close()
+
+    metric = summarize([elapsed * 1000.0 / messages])
+    metric['unit'] = 'ms/message'
+    metric['messages_per_sec'] = messages / elapsed
+    metric['queue_ms'] = queued * 1000.0
+    metric['requests'] = gateway.requests
+    metric['busy'] = stats['busy']
+    metric['delivered'] = len(gateway.sent)
+    results['notify.blast'] = metric
+    return results
+
+
+def bench_live_stats(repeat):
+    from core.bots.engine import SessionResult, SUCCEEDED, FAILED, EngineStats
+    from core.bots.live_stats import LiveStats
+
+    results = {}
+    batch = [SessionResult(i, ('marriage-loan', 'child-loan')[i % 2], 'bank', (SUCCEEDED, FAILED)[i % 3 == 0],
+                           None, None, 0.1, None) for i in range(1000)]
+    stats = LiveStats()
+    stats.watch('engine', EngineStats())
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        stats.on_finished(batch)
+        samples.append((time.perf_counter() - start) * 1000.0 / len(batch))
+    metric = summarize(samples)
+    metric['unit'] = 'ms/result'
+    results['live_stats.ingest'] = metric
+
+    # A refresh reads counters only, so it costs the same however many results came before
+    metric = measure(lambda: [stats.snapshot(bot) for bot in ('marriage-loan', 'child-loan')], repeat)
+    metric['results_seen'] = repeat * len(batch)
+    results['live_stats.snapshot'] = metric
+    return results
+
+
+SUITES = {
+    'engine': bench_engine,
+    'engine-process': bench_process_pool,
+    'jobs': bench_jobs,
+    'notify': bench_notify,
+    'live-stats': bench_live_stats,
+}
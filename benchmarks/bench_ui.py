@@ -0,0 +1,211 @@
+"""Window-level benchmarks: startup, navigation, sidebar and top menu."""
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.timing import measure, summarize
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_probe(*args):
+    output = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.probes', *args],
+        cwd=REPO_ROOT, env=os.environ.copy(),
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def bench_startup(repeat):
+    # Cold numbers need a fresh interpreter each time
+    repeat = max(3, repeat // 4)
+    return {
+        'import.ui.main_window': summarize([run_probe('import', 'ui.main_window') for _ in range(repeat)]),
+        'import.main': summarize([run_probe('import', 'main') for _ in range(repeat)]),
+        'startup.first_frame': summarize([run_probe('first-frame') for _ in range(repeat)]),
+    }
+
+
+def bench_window(repeat):
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+
+    from ui.main_window import MainWindow
+    from ui.routes import ROUTES
+
+    window = MainWindow()
+    window.show()
+    app.processEvents()
+    results = {}
+
+    for route_id in ROUTES:
+        def visit_cold(route_id=route_id):
+            window.change_page(route_id)
+            app.processEvents()
+
+        def reset(route_id=route_id):
+            # Start from a page other than the target, with the target torn down
+            window.change_page('home' if route_id != 'home' else 'settings')
+            window.router.prefetch_queue.clear()
+            if route_id != 'home':
+                window.pages.evict(route_id)
+            app.processEvents()
+
+        results[f'change_page.cold.{route_id}'] = measure(visit_cold, repeat=repeat, setup=reset)
+        results[f'change_page.warm.{route_id}'] = measure(
+            visit_cold, repeat=repeat,
+            setup=lambda route_id=route_id: (
+                window.change_page('home' if route_id != 'home' else 'settings'),
+                app.processEvents()
+            )
+        )
+
+    # Tutorial pages with the document cache emptied first: parse and layout
+    # cost, against the cached change_page numbers above
+    from ui.documents import get_document_cache
+
+    def clear_tutorial(route_id):
+        get_document_cache().clear()
+        window.change_page('home')
+        window.router.prefetch_queue.clear()
+        window.pages.evict(route_id)
+        app.processEvents()
+
+    for route_id in ROUTES:
+        if route_id.startswith('education'):
+            results[f'change_page.uncached.{route_id}'] = measure(
+                lambda route_id=route_id: (window.change_page(route_id), app.processEvents()),
+                repeat=repeat,
+                setup=lambda route_id=route_id: clear_tutorial(route_id)
+            )
+
+    sidebar = window.sidebar
+
+    def collapse():
+        sidebar.collapse()
+        app.processEvents()
+
+    def expand():
+        sidebar.expand()
+        app.processEvents()
+
+    results['sidebar.collapse'] = measure(collapse, repeat=repeat, setup=expand)
+    results['sidebar.expand'] = measure(expand, repeat=repeat, setup=collapse)
+    expand()
+
+    top_menu = window.top_menu
+    for route_id, route in ROUTES.items():
+        if not route.items:
+            continue
+        empty = ROUTES['home']
+        results[f'update_menu.{route_id}'] = measure(
+            lambda route=route: top_menu.update_menu(route.title, route.icon, route.items),
+            repeat=repeat,
+            setup=lambda: top_menu.update_menu(empty.title, empty.icon, empty.items)
+        )
+
+    window.close()
+    window.deleteLater()
+    app.processEvents()
+    return results
+
+
+def bench_icons(repeat):
+    import tempfile
+
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtGui import QPixmapCache
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+
+    from ui.icons import IconService
+    from ui.routes import ROUTES
+
+    names = sorted({route.icon for route in ROUTES.values()}
+                   | {route.sidebar.icon for route in ROUTES.values() if route.sidebar})
+    sizes = (16, 18, 20, 40)
+
+    def fetch_all(service):
+        for size in sizes:
+            for name in names:
+                service.pixmap(name, size)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        def cold():
+            QPixmapCache.clear()
+            fetch_all(IconService(cache_path=directory))
+
+        def clear_disk():
+            for entry in os.scandir(directory):
+                os.remove(entry.path)
+
+        # Every icon drawn from scratch, then loaded from the saved atlases
+        results['icons.rasterize'] = measure(cold, repeat=repeat, setup=clear_disk)
+        saved = IconService(cache_path=directory)
+        fetch_all(saved)
+        saved.save()
+        results['icons.from_disk'] = measure(cold, repeat=repeat)
+
+        service = IconService(cache_path=directory)
+        fetch_all(service)
+        results['icons.cached_lookup_x100'] = measure(
+            lambda: [fetch_all(service) for _ in range(100)], repeat=repeat)
+    app.processEvents()
+    return results
+
+
+def bench_menu(repeat):
+    from PyQt5.QtWidgets import QApplication, QWidget
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+
+    from ui.components.sidebar import Sidebar
+    from ui.styles.compiler import apply_app_stylesheet
+
+    apply_app_stylesheet(app)
+    entries = 100
+    sidebars = []
+
+    def build():
+        sidebar = Sidebar()
+        for i in range(entries):
+            sidebar.add_menu_item(f"ربات شماره {i}", f'bot-{i}', "🤖")
+        sidebar.show()
+        app.processEvents()
+        sidebars.append(sidebar)
+
+    def discard():
+        while sidebars:
+            sidebars.pop().deleteLater()
+        app.processEvents()
+
+    results = {'menu.build_100': measure(build, repeat=repeat, setup=discard)}
+    discard()
+    build()
+    sidebar = sidebars[0]
+    results['menu.widgets_100'] = summarize([len(sidebar.findChildren(QWidget))] * 3)
+    results['menu.widgets_100']['unit'] = 'widgets'
+    results['menu.repaint'] = measure(lambda: sidebar.menu_widget.grab(), repeat=repeat)
+
+    def toggle():
+        sidebar.collapse()
+        sidebar.finish_animation()
+        sidebar.expand()
+        sidebar.finish_animation()
+        app.processEvents()
+
+    results['menu.collapse_expand_100'] = measure(toggle, repeat=repeat)
+    discard()
+    return results
+
+
+SUITES = {
+    'startup': bench_startup,
+    'window': bench_window,
+    'icons': bench_icons,
+    'menu': bench_menu,
+}
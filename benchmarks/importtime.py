@@ -0,0 +1,63 @@
+"""Per-module import time report.
+
+    python -m benchmarks.importtime                 # ui.main_window
+    python -m benchmarks.importtime main -n 30
+    python -m benchmarks.importtime ui --json
+
+Runs the import in a fresh interpreter with ``-X importtime`` and lists the
+modules with the largest cumulative time (ms), i.e. including everything
+they pulled in themselves.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(module_name):
+    """Return [(module, self_ms, cumulative_ms, depth)] in import order."""
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {module_name}"],
+        cwd=REPO_ROOT, check=True, capture_output=True, text=True
+    ).stderr
+
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header line
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(fields[0]) / 1000.0, int(fields[1]) / 1000.0, depth))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('module', nargs='?', default='ui.main_window')
+    parser.add_argument('-n', '--top', type=int, default=20)
+    parser.add_argument('--json', action='store_true', help="print JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    rows = import_times(args.module)
+    top = sorted(rows, key=lambda row: row[2], reverse=True)[:args.top]
+
+    if args.json:
+        json.dump([{'module': name, 'self_ms': self_ms, 'cumulative_ms': cumulative_ms}
+                   for name, self_ms, cumulative_ms, _ in top], sys.stdout, indent=2)
+        sys.stdout.write('\n')
+        return 0
+
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, self_ms, cumulative_ms, _ in top:
+        print(f"{cumulative_ms:14.2f} {self_ms:9.2f}  {name}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""Measurements that need a fresh interpreter.
+
+Run as ``python -m benchmarks.probes <probe> [args]``; each probe prints a
+single JSON number (milliseconds) on stdout.
+"""
+import json
+import sys
+import time
+
+
+def probe_import(module_name):
+    start = time.perf_counter()
+    __import__(module_name)
+    return (time.perf_counter() - start) * 1000.0
+
+
+def probe_first_frame():
+    from PyQt5.QtCore import QEvent, QObject, QTimer
+    from PyQt5.QtWidgets import QApplication
+
+    start = time.perf_counter()
+    app = QApplication(sys.argv[:1])
+
+    from ui.main_window import MainWindow
+
+    result = {}
+
+    class FirstPaint(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint and 'ms' not in result:
+                result['ms'] = (time.perf_counter() - start) * 1000.0
+                QTimer.singleShot(0, app.quit)
+            return False
+
+    window = MainWindow()
+    paint_filter = FirstPaint()
+    app.installEventFilter(paint_filter)
+    window.show()
+    # Offscreen platforms may never paint; do not hang the suite
+    QTimer.singleShot(10000, app.quit)
+    app.exec_()
+    app.removeEventFilter(paint_filter)
+    return result.get('ms', float('nan'))
+
+
+def main(argv):
+    probe = argv[0]
+    if probe == 'import':
+        value = probe_import(argv[1])
+    elif probe == 'first-frame':
+        value = probe_first_frame()
+    else:
+        raise SystemExit(f"unknown probe: {probe}")
+    print(json.dumps(value))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,98 @@
+"""Run the benchmark suites and optionally compare against a baseline.
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.run -o results.json
+    python -m benchmarks.run --baseline results.json --threshold 0.25
+
+The process exits with status 1 when any metric is slower than its baseline
+by more than the threshold (relative) and the noise floor (absolute ms).
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+# Must be set before anything imports Qt
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+
+def load_suites():
+    from benchmarks import bench_data, bench_engine, bench_ui
+
+    suites = {}
+    suites.update(bench_ui.SUITES)
+    suites.update(bench_data.SUITES)
+    suites.update(bench_engine.SUITES)
+    return suites
+
+
+def run_suites(names, repeat):
+    suites = load_suites()
+    metrics = {}
+    for name in names or suites:
+        if name not in suites:
+            raise SystemExit(f"unknown suite: {name} (available: {', '.join(suites)})")
+        metrics.update(suites[name](repeat))
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'qpa': os.environ.get('QT_QPA_PLATFORM'),
+            'repeat': repeat,
+        },
+        'metrics': metrics,
+    }
+
+
+def compare(current, baseline, threshold, noise_floor_ms):
+    """Return a list of (name, base, now, ratio) for regressed metrics."""
+    regressions = []
+    for name, base in baseline['metrics'].items():
+        now = current['metrics'].get(name)
+        if now is None:
+            continue
+        base_value, now_value = base['value'], now['value']
+        if now_value - base_value <= noise_floor_ms:
+            continue
+        ratio = now_value / base_value if base_value else float('inf')
+        if ratio > 1.0 + threshold:
+            regressions.append((name, base_value, now_value, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('suites', nargs='*', help="suites to run (default: all)")
+    parser.add_argument('-o', '--output', help="write results JSON here")
+    parser.add_argument('-n', '--repeat', type=int, default=20)
+    parser.add_argument('--baseline', help="results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="allowed relative slowdown (0.25 = 25%%)")
+    parser.add_argument('--noise-floor', type=float, default=0.5,
+                        help="ignore slowdowns smaller than this many ms")
+    args = parser.parse_args(argv)
+
+    results = run_suites(args.suites, args.repeat)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    else:
+        json.dump(results, sys.stdout, indent=2, sort_keys=True)
+        sys.stdout.write('\n')
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold, args.noise_floor)
+    for name, base_value, now_value, ratio in regressions:
+        print(f"REGRESSION {name}: {base_value:.2f} ms -> {now_value:.2f} ms ({ratio:.2f}x)",
+              file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,31 @@
+import statistics
+import time
+
+
+def summarize(samples_ms):
+    """Reduce raw samples (ms) to the stats we store; `value` is the median."""
+    samples_ms = sorted(samples_ms)
+    return {
+        'value': statistics.median(samples_ms),
+        'min': samples_ms[0],
+        'max': samples_ms[-1],
+        'mean': statistics.fmean(samples_ms),
+        'samples': len(samples_ms),
+        'unit': 'ms',
+    }
+
+
+def measure(fn, repeat=20, warmup=1, setup=None):
+    """Time `fn()` `repeat` times, calling `setup()` untimed before each run."""
+    for _ in range(warmup):
+        if setup is not None:
+            setup()
+        fn()
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return summarize(samples)
@@ -0,0 +1,185 @@
+"""Streaming readers for applicant lists exported by the intake system.
+
+Files are read line by line and yielded as column batches ready for
+ApplicantStore.append_columns, so memory stays bounded by the batch size no
+matter how large the file is.
+"""
+import csv
+import json
+import os
+import time
+
+from core.applicants.store import APPLICANT_COLUMNS, DIGITS
+from core.text import digits_only, normalize_phone, normalize_text
+
+# Header spellings seen in intake exports, after normalize_text
+HEADER_ALIASES = {
+    'national_id': 'national_id', 'کد ملی': 'national_id', 'کدملی': 'national_id',
+    'first_name': 'first_name', 'نام': 'first_name',
+    'last_name': 'last_name', 'نام خانوادگی': 'last_name', 'نام‌خانوادگی': 'last_name',
+    'phone': 'phone', 'mobile': 'phone', 'موبایل': 'phone', 'تلفن همراه': 'phone',
+    'شماره همراه': 'phone', 'شماره موبایل': 'phone',
+    'loan_type': 'loan_type', 'نوع وام': 'loan_type',
+    'bank': 'bank', 'بانک': 'bank',
+    'status': 'status', 'وضعیت': 'status',
+    'registered_at': 'registered_at', 'زمان ثبت': 'registered_at',
+}
+
+IMPORT_COLUMNS = ('national_id', 'first_name', 'last_name', 'phone',
+                  'loan_type', 'bank', 'status', 'registered_at')
+
+DELIMITED_FORMATS = {'.csv': ',', '.tsv': '\t', '.tab': '\t', '.txt': None}
+JSON_LINES_FORMATS = ('.jsonl', '.ndjson')
+
+DEFAULT_STATUS = 'در صف'
+
+# Longest identifier each digits column can hold; longer ones are typos
+DIGIT_WIDTHS = {column.name: column.width for column in APPLICANT_COLUMNS if column.kind == DIGITS}
+# Timestamps beyond this would not fit the store's 64-bit column
+MAX_INT_DIGITS = 18
+
+
+class ImportCancelled(Exception):
+    pass
+
+
+class InvalidRecord(ValueError):
+    """A record that can't be imported; it is counted as failed and skipped."""
+
+
+def supported_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    return extension in DELIMITED_FORMATS or extension in JSON_LINES_FORMATS
+
+
+def _normalize_value(column, value):
+    if value is None:
+        return None
+    value = str(value)
+    if column in DIGIT_WIDTHS:
+        value = normalize_phone(value) if column == 'phone' else digits_only(value)
+        if len(value) > DIGIT_WIDTHS[column]:
+            raise InvalidRecord(f"{column} longer than {DIGIT_WIDTHS[column]} digits")
+        return value or None
+    if column == 'registered_at':
+        value = digits_only(value)
+        if len(value) > MAX_INT_DIGITS:
+            raise InvalidRecord(f"{column} longer than {MAX_INT_DIGITS} digits")
+        return int(value) if value else None
+    return normalize_text(value)
+
+
+class _LineReader:
+    """Iterates decoded lines of a binary file while counting bytes read."""
+
+    def __init__(self, f, encoding):
+        self.f = f
+        self.encoding = encoding
+        self.bytes_read = 0
+
+    def __iter__(self):
+        for raw in self.f:
+            self.bytes_read += len(raw)
+            yield raw.decode(self.encoding)
+
+
+def _delimited_records(lines, delimiter):
+    if delimiter is None:
+        first = next(lines, '')
+        delimiter = '\t' if first.count('\t') > first.count(',') else ','
+        lines = _prepend(first, lines)
+    reader = csv.reader(lines, delimiter=delimiter)
+    header = next(reader, None)
+    if header is None:
+        return
+    columns = [HEADER_ALIASES.get(normalize_text(name).lower()) for name in header]
+    for record in reader:
+        if record:
+            yield {name: value for name, value in zip(columns, record) if name}
+
+
+def _json_records(lines):
+    # None stands for a line that is not a JSON object (or not JSON at all)
+    for line in lines:
+        line = line.strip()
+        if line:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                yield None
+                continue
+            if not isinstance(record, dict):
+                yield None
+                continue
+            yield {HEADER_ALIASES[key]: value for key, value in record.items()
+                   if key in HEADER_ALIASES}
+
+
+def _prepend(first, rest):
+    yield first
+    yield from rest
+
+
+def read_applicant_batches(path, batch_size=5000, defaults=None, encoding='utf-8-sig',
+                           cancel_event=None):
+    """Yield (columns, rows_so_far, failed_so_far, bytes_read, total_bytes) for each batch.
+
+    `columns` maps every IMPORT_COLUMNS name to a list of normalized values.
+    Records that can't be imported (a JSON line that is malformed or not an
+    object, an identifier too long for its column) are skipped and counted
+    in `failed_so_far`; the last batch may be empty just to report them.
+    `defaults` fills columns the file does not have (e.g. the loan type of
+    the page the import was started from). Setting `cancel_event` stops the
+    import with ImportCancelled at the next batch boundary.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if not supported_format(path):
+        raise ValueError(f"unsupported applicant list format: {extension or path}")
+
+    defaults = dict(defaults or {})
+    defaults.setdefault('status', DEFAULT_STATUS)
+    imported_at = int(time.time())
+    total_bytes = os.path.getsize(path)
+    rows = 0
+    failed = reported_failed = 0
+
+    def empty_batch():
+        return {name: [] for name in IMPORT_COLUMNS}
+
+    with open(path, 'rb') as f:
+        lines = _LineReader(f, encoding)
+        if extension in JSON_LINES_FORMATS:
+            records = _json_records(iter(lines))
+        else:
+            records = _delimited_records(iter(lines), DELIMITED_FORMATS[extension])
+
+        batch = empty_batch()
+        count = 0
+        for record in records:
+            if record is None:
+                failed += 1
+                continue
+            try:
+                values = [_normalize_value(name, record.get(name)) for name in IMPORT_COLUMNS]
+            except InvalidRecord:
+                failed += 1
+                continue
+            for name, value in zip(IMPORT_COLUMNS, values):
+                if value is None or value == '':
+                    value = defaults.get(name, imported_at if name == 'registered_at' else None)
+                batch[name].append(value)
+            count += 1
+            if count == batch_size:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ImportCancelled()
+                rows += count
+                reported_failed = failed
+                yield batch, rows, failed, lines.bytes_read, total_bytes
+                batch = empty_batch()
+                count = 0
+
+        if count or failed != reported_failed:
+            if cancel_event is not None and cancel_event.is_set():
+                raise ImportCancelled()
+            rows += count
+            yield batch, rows, failed, lines.bytes_read, total_bytes
@@ -0,0 +1,278 @@
+"""Search index over an ApplicantStore.
+
+National IDs and phone numbers are searched by digit prefix. Each is kept
+as a few sorted runs of (value << ROW_BITS | row) integers, so a prefix is
+one bisect per run. Runs come from appended batches and are merged
+binary-counter style, keeping their number logarithmic.
+
+Names are searched by token prefix. Name columns are dictionary-encoded
+in the store, so tokens are taken from the distinct values only: a sorted
+token list maps each token to the name codes containing it, and each code
+has a posting array of its rows.
+
+The index follows the store through add_index(): appended rows are added
+batch by batch, and edited rows are re-added and marked stale, so old
+entries are filtered out at query time instead of being searched for and
+deleted.
+"""
+from array import array
+from bisect import bisect_left, insort
+from collections import defaultdict
+from itertools import chain, compress, filterfalse, islice, repeat
+from operator import lshift, ne, or_
+
+from core.text import digits_only, normalize_text
+
+# Low bits of a packed entry hold the row id (up to 2**26 - 1 rows)
+ROW_BITS = 26
+ROW_MASK = (1 << ROW_BITS) - 1
+
+DIGIT_COLUMNS = ('national_id', 'phone')
+NAME_COLUMNS = ('first_name', 'last_name')
+
+
+class _DigitIndex:
+    def __init__(self, store, name):
+        self.column = store.column_index[name]
+        self.width = store.columns[self.column].width
+        self.values = store._data[self.column].values
+        self.runs = []
+        self.stale = set()      # rows edited since they were first indexed
+
+    def add(self, rows):
+        # Packed as value << ROW_BITS | row with C-level maps; missing values
+        # (-1) pack to negative numbers and are filtered out
+        packed = map(or_, map(lshift, map(self.values.__getitem__, rows), repeat(ROW_BITS)), rows)
+        run = array('Q', sorted(filter((0).__le__, packed)))
+        if not run:
+            return
+        self.runs.append(run)
+        # Merge while the previous run is not much bigger; sorted() sees two
+        # ascending runs and merges them in C
+        while len(self.runs) > 1 and len(self.runs[-2]) <= 2 * len(self.runs[-1]):
+            last = self.runs.pop()
+            previous = self.runs.pop()
+            self.runs.append(array('Q', sorted(previous + last)))
+
+    def edited(self, rows):
+        self.stale.update(rows)
+        self.add(rows)
+
+    def prefix(self, digits):
+        """Rows whose value, zero-padded to the column width, starts with `digits`."""
+        if not digits or len(digits) > self.width:
+            return set()
+        scale = 10 ** (self.width - len(digits))
+        low = int(digits) * scale << ROW_BITS
+        high = (int(digits) + 1) * scale << ROW_BITS
+        rows = set()
+        for run in self.runs:
+            start = bisect_left(run, low)
+            end = bisect_left(run, high, start)
+            if start < end:
+                rows.update(map(ROW_MASK.__and__, run[start:end]))
+        if self.stale:
+            # Entries for an edited row's old value are still in the runs
+            values = self.values
+            rows.difference_update([row for row in self.stale & rows
+                                    if not low >> ROW_BITS <= values[row] < high >> ROW_BITS])
+        return rows
+
+
+class _NameIndex:
+    def __init__(self, store, names):
+        self.columns = [store.column_index[name] for name in names]
+        self.data = [store._data[column] for column in self.columns]
+        self.tokens = []                        # sorted distinct tokens
+        self.refs = defaultdict(list)           # token -> [(name column slot, code)]
+        self.postings = [[] for _ in self.columns]   # slot -> code -> array of rows
+        self.stale = set()
+
+    def _new_codes(self, slot):
+        data = self.data[slot]
+        postings = self.postings[slot]
+        for code in range(len(postings), len(data.values)):
+            postings.append(array('I'))
+            for token in set(normalize_text(data.values[code]).split()):
+                refs = self.refs[token]
+                if not refs:
+                    insort(self.tokens, token)
+                refs.append((slot, code))
+
+    def add(self, rows):
+        for slot, data in enumerate(self.data):
+            self._new_codes(slot)
+            postings = self.postings[slot]
+            codes = data.codes
+            for row in rows:
+                postings[codes[row]].append(row)
+
+    def edited(self, rows):
+        self.stale.update(rows)
+        self.add(rows)
+
+    def matching_codes(self, token):
+        """(slot, code) pairs of names with a token starting with `token`."""
+        refs = set()
+        position = bisect_left(self.tokens, token)
+        while position < len(self.tokens) and self.tokens[position].startswith(token):
+            refs.update(self.refs[self.tokens[position]])
+            position += 1
+        return refs
+
+    def count(self, refs):
+        """Posting entries behind `refs`, an upper bound on the rows they match."""
+        return sum(len(self.postings[slot][code]) for slot, code in refs)
+
+    def _codes_by_slot(self, refs):
+        allowed = [set() for _ in self.data]
+        for slot, code in refs:
+            allowed[slot].add(code)
+        return allowed
+
+    def _outdated(self, rows, refs):
+        """Edited rows among `rows` whose current names don't match `refs`."""
+        allowed = self._codes_by_slot(refs)
+        return [row for row in self.stale.intersection(rows)
+                if not any(data.codes[row] in codes for data, codes in zip(self.data, allowed))]
+
+    def token(self, token):
+        return self.rows(self.matching_codes(token))
+
+    def rows(self, refs):
+        rows = set()
+        for slot, code in refs:
+            rows.update(self.postings[slot][code])
+        if self.stale:
+            rows.difference_update(self._outdated(rows, refs))
+        return rows
+
+    def sorted_rows(self, refs):
+        """Ascending array of the rows matching `refs`, without building a set.
+
+        Postings are mostly ascending runs, which sorted() merges in C; a row
+        reachable through several postings then sits next to its duplicates.
+        """
+        merged = array('I')
+        for slot, code in refs:
+            merged += self.postings[slot][code]
+        rows = sorted(merged)
+        if self.stale or len({slot for slot, _ in refs}) > 1:
+            rows = compress(rows, chain(map(ne, rows, islice(rows, 1, None)), (True,)))
+            if self.stale:
+                outdated = set(self._outdated(merged, refs))
+                if outdated:
+                    rows = filterfalse(outdated.__contains__, rows)
+        return array('I', rows)
+
+    def narrow(self, rows, refs):
+        """The rows of the set `rows` that also match `refs`."""
+        if len(rows) * 8 < self.count(refs):
+            # Far fewer candidates than postings: look up their current names
+            allowed = self._codes_by_slot(refs)
+            return {row for row in rows
+                    if any(data.codes[row] in codes for data, codes in zip(self.data, allowed))}
+        matched = set()
+        for slot, code in refs:
+            matched.update(rows.intersection(self.postings[slot][code]))
+        if self.stale:
+            matched.difference_update(self._outdated(matched, refs))
+        return matched
+
+
+class ApplicantSearchIndex:
+    """Prefix search on national ID and phone, token search on names.
+
+    A query is split into words; all-digit words match national IDs and
+    phone numbers, other words match name tokens, and a row has to match
+    every word. Text and digits are normalized the same way as on import.
+
+    Only the narrowest word's rows are collected: name words are ranked by
+    their posting sizes, and the others just filter those candidates. A
+    lone name word is merged straight from its postings.
+    """
+
+    def __init__(self, store, digit_columns=DIGIT_COLUMNS, name_columns=NAME_COLUMNS):
+        self.store = store
+        self.digit_indexes = {name: _DigitIndex(store, name) for name in digit_columns}
+        self.names = _NameIndex(store, name_columns)
+        self.name_columns = set(name_columns)
+        self.size = 0
+        if len(store):
+            self.appended(0, len(store) - 1)
+
+    # Store hooks (see ApplicantStore.add_index)
+
+    def appended(self, first, last):
+        rows = range(first, last + 1)
+        for index in self.digit_indexes.values():
+            index.add(rows)
+        self.names.add(rows)
+        self.size = last + 1
+
+    def updated(self, name, rows):
+        if name in self.digit_indexes:
+            self.digit_indexes[name].edited(rows)
+        elif name in self.name_columns:
+            self.names.edited(rows)
+
+    # Queries
+
+    @staticmethod
+    def is_digit_word(word):
+        digits = digits_only(word)
+        return bool(digits) and len(digits) == len(word)
+
+    def match_word(self, word):
+        if self.is_digit_word(word):
+            digits = digits_only(word)
+            rows = set()
+            for name, index in self.digit_indexes.items():
+                rows |= index.prefix(digits)
+                if name == 'phone' and digits.startswith('9'):
+                    # Mobile numbers are often typed without the leading 0
+                    rows |= index.prefix('0' + digits)
+            return rows
+        return self.names.token(word)
+
+    def search(self, query):
+        """Sorted array of matching row ids, or None for an empty query."""
+        words = normalize_text(query).split()
+        if not words:
+            return None
+        # Longest digit words first: they usually narrow the result the most
+        digit_words = sorted(filter(self.is_digit_word, words), key=len, reverse=True)
+        # Name words by how many rows they can match at most, smallest first
+        name_refs = sorted((self.names.matching_codes(word) for word in words
+                            if not self.is_digit_word(word)), key=self.names.count)
+        if not digit_words and len(name_refs) == 1:
+            return self.names.sorted_rows(name_refs[0])
+
+        if digit_words:
+            rows = self.match_word(digit_words[0])
+            for word in digit_words[1:]:
+                if not rows:
+                    break
+                rows &= self.match_word(word)
+        else:
+            rows = self.names.rows(name_refs.pop(0))
+        # Later name words only filter the candidates; their own rows are never collected
+        for refs in name_refs:
+            if not rows:
+                break
+            rows = self.names.narrow(rows, refs)
+        return array('I', sorted(rows))
+
+
+_default_index = None
+
+
+def get_search_index():
+    """Index over the shared applicant store, kept up to date from now on."""
+    global _default_index
+    if _default_index is None:
+        from core.applicants.store import get_store
+        store = get_store()
+        _default_index = ApplicantSearchIndex(store)
+        store.add_index(_default_index)
+    return _default_index
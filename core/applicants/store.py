@@ -0,0 +1,408 @@
+from array import array
+from bisect import insort
+from collections import namedtuple
+from heapq import merge
+from itertools import compress, islice
+from weakref import WeakMethod
+
+INT = 'int'
+DIGITS = 'digits'        # numeric identifiers shown zero-padded to `width`
+CATEGORY = 'category'    # dictionary-encoded text
+
+Column = namedtuple('Column', 'name title kind width')
+
+APPLICANT_COLUMNS = (
+    Column('national_id', 'کد ملی', DIGITS, 10),
+    Column('first_name', 'نام', CATEGORY, 0),
+    Column('last_name', 'نام خانوادگی', CATEGORY, 0),
+    Column('phone', 'شماره همراه', DIGITS, 11),
+    Column('loan_type', 'نوع وام', CATEGORY, 0),
+    Column('bank', 'بانک', CATEGORY, 0),
+    Column('status', 'وضعیت', CATEGORY, 0),
+    Column('registered_at', 'زمان ثبت', INT, 0),
+)
+
+MISSING = -1
+
+
+class _IntColumn:
+    def __init__(self, column):
+        self.column = column
+        self.values = array('q')
+
+    def convert(self, values):
+        # OverflowError for a value wider than 64 bits, before anything is stored
+        return array('q', (MISSING if v in (None, '') else int(v) for v in values))
+
+    def extend(self, converted):
+        self.values.extend(converted)
+
+    def set(self, row, value):
+        self.values[row] = MISSING if value in (None, '') else int(value)
+
+    def copy(self):
+        other = type(self)(self.column)
+        other.values = self.values[:]
+        return other
+
+    def get(self, row):
+        value = self.values[row]
+        return None if value == MISSING else value
+
+    def sort_key(self):
+        return self.values.__getitem__
+
+    def sort_keys(self):
+        return self.values
+
+
+class _DigitsColumn(_IntColumn):
+    def get(self, row):
+        value = self.values[row]
+        return '' if value == MISSING else f"{value:0{self.column.width}d}"
+
+
+class _CategoryColumn:
+    def __init__(self, column):
+        self.column = column
+        self.codes = array('I')
+        self.values = []
+        self.index = {}
+
+    def code_for(self, value):
+        value = '' if value is None else str(value)
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def convert(self, values):
+        # New values stay in the dictionary even if the batch is dropped; unused
+        # entries are harmless
+        return array('I', map(self.code_for, values))
+
+    def extend(self, converted):
+        self.codes.extend(converted)
+
+    def set(self, row, value):
+        self.codes[row] = self.code_for(value)
+
+    def copy(self):
+        # Enough of the column to compute sort keys from on another thread
+        other = _CategoryColumn(self.column)
+        other.codes = self.codes[:]
+        other.values = list(self.values)
+        return other
+
+    def get(self, row):
+        return self.values[self.codes[row]]
+
+    def sort_key(self):
+        codes, values = self.codes, self.values
+        return lambda row: values[codes[row]]
+
+    def sort_keys(self):
+        # Rank of each distinct value, looked up per row at C speed
+        order = sorted(range(len(self.values)), key=self.values.__getitem__)
+        rank = array('I', bytes(4 * len(order)))
+        for position, code in enumerate(order):
+            rank[code] = position
+        return array('I', map(rank.__getitem__, self.codes))
+
+    def mask(self, allowed):
+        return bytes(value in allowed for value in self.values)
+
+
+class _StrongRef:
+    # Same call signature as a weakref, for plain functions
+    def __init__(self, target):
+        self.target = target
+
+    def __call__(self):
+        return self.target
+
+
+_COLUMN_TYPES = {INT: _IntColumn, DIGITS: _DigitsColumn, CATEGORY: _CategoryColumn}
+
+
+class ApplicantStore:
+    """Column-oriented, array-backed applicant table.
+
+    Each column is a typed array (text columns are dictionary-encoded), so a
+    row costs a few machine words rather than a Python object. Sort orders
+    are cached per column and extended incrementally as rows are appended.
+    Not thread-safe: mutate it from the GUI thread only. Sort orders can
+    still be built elsewhere, see sort_index_builder().
+    """
+
+    # Rows per slice when building a sort order off the GUI thread
+    SORT_SLICE = 1 << 14
+
+    def __init__(self, columns=APPLICANT_COLUMNS):
+        self.columns = tuple(columns)
+        self.column_index = {column.name: i for i, column in enumerate(self.columns)}
+        self._data = [_COLUMN_TYPES[column.kind](column) for column in self.columns]
+        self._size = 0
+        self._sort_cache = {}   # column index -> (array of rows, rows covered)
+        self._rank_cache = {}   # column index -> position of each row in that order
+        self._edits = [0] * len(self.columns)
+        self._mask_cache = {}   # (column index, allowed values) -> bytearray, one byte per row
+        self._listeners = []
+        self._indexes = []
+
+    def __len__(self):
+        return self._size
+
+    def add_listener(self, callback):
+        """callback(kind, first, last); kind is 'appended' or 'updated'.
+
+        Bound methods are held weakly so a deleted view does not stay
+        subscribed (and alive) for the lifetime of the store.
+        """
+        if hasattr(callback, '__self__'):
+            callback = WeakMethod(callback)
+        else:
+            callback = _StrongRef(callback)
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        self._listeners = [ref for ref in self._listeners if ref() not in (None, callback)]
+
+    def add_index(self, index):
+        """Keep `index` current: index.appended(first, last) after appends and
+        index.updated(name, rows) after edits, both before listeners run."""
+        self._indexes.append(index)
+
+    def _notify(self, kind, first, last):
+        for ref in list(self._listeners):
+            callback = ref()
+            if callback is None:
+                self._listeners.remove(ref)
+            else:
+                callback(kind, first, last)
+
+    def append_columns(self, columns):
+        """Append a batch given as {column name: list of values}."""
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) != 1:
+            raise ValueError("all columns in a batch must have the same length")
+        count = lengths.pop()
+        if not count:
+            return
+        # Convert every column before extending any, so a bad value leaves the
+        # store as it was instead of with columns of different lengths
+        converted = [data.convert(columns.get(name) or [None] * count)
+                     for name, data in zip(self.column_index, self._data)]
+        for data, values in zip(self._data, converted):
+            data.extend(values)
+        first = self._size
+        self._size += count
+        for index in self._indexes:
+            index.appended(first, self._size - 1)
+        self._notify('appended', first, self._size - 1)
+
+    def append_rows(self, rows):
+        """Append dicts keyed by column name."""
+        rows = list(rows)
+        self.append_columns({name: [row.get(name) for row in rows] for name in self.column_index})
+
+    def update(self, row, name, value):
+        column = self.column_index[name]
+        self._data[column].set(row, value)
+        # An edited key invalidates that column's order; row masks are patched
+        self._invalidate_order(column)
+        for (mask_column, allowed), row_mask in self._mask_cache.items():
+            # Rows past the end of a mask are filled in when it is next used
+            if mask_column == column and row < len(row_mask):
+                row_mask[row] = self._data[column].get(row) in allowed
+        for index in self._indexes:
+            index.updated(name, (row,))
+        self._notify('updated', row, row)
+
+    def update_many(self, name, values):
+        """Set column `name` for many rows at once ({row: value} or pairs);
+        listeners hear one 'updated' spanning the touched rows."""
+        values = dict(values)
+        if not values:
+            return
+        column = self.column_index[name]
+        data = self._data[column]
+        for row, value in values.items():
+            data.set(row, value)
+        self._invalidate_order(column)
+        for (mask_column, allowed), row_mask in self._mask_cache.items():
+            if mask_column == column:
+                covered = len(row_mask)
+                for row in values:
+                    if row < covered:
+                        row_mask[row] = data.get(row) in allowed
+        for index in self._indexes:
+            index.updated(name, values.keys())
+        self._notify('updated', min(values), max(values))
+
+    def _invalidate_order(self, column):
+        self._sort_cache.pop(column, None)
+        self._rank_cache.pop(column, None)
+        self._edits[column] += 1
+
+    def value(self, row, column):
+        return self._data[column].get(row)
+
+    def row(self, row):
+        return {column.name: data.get(row) for column, data in zip(self.columns, self._data)}
+
+    def distinct(self, name):
+        data = self._data[self.column_index[name]]
+        if not isinstance(data, _CategoryColumn):
+            raise TypeError(f"{name} is not a category column")
+        return sorted(value for value in data.values if value)
+
+    def sorted_rows(self, column):
+        """Row ids in ascending order of `column`, maintained incrementally."""
+        cached = self._sort_cache.get(column)
+        if cached is not None and cached[1] == self._size:
+            return cached[0]
+
+        data = self._data[column]
+        if cached is not None and (self._size - cached[1]) * 32 < cached[1]:
+            # A few new rows: binary-insert them into the existing order
+            order, covered = cached
+            key = data.sort_key()
+            for row in range(covered, self._size):
+                insort(order, row, key=key)
+        else:
+            keys = data.sort_keys()
+            order = array('I', sorted(range(self._size), key=keys.__getitem__))
+        self._sort_cache[column] = (order, self._size)
+        return order
+
+    def has_sort_index(self, column):
+        """True when the order of `column` and each row's rank in it cover every row."""
+        cached = self._sort_cache.get(column)
+        rank = self._rank_cache.get(column)
+        return cached is not None and cached[1] == self._size and rank is not None and len(rank) == self._size
+
+    def sort_index_builder(self, column):
+        """A callable building the order of `column` as it is now, on any thread.
+
+        The column is copied here, on the GUI thread. The callable sorts it
+        in slices of SORT_SLICE rows and merges them, so no single step holds
+        the GIL long enough to stall the GUI, and also works out each row's
+        position, which lets filtered views sort only the rows they keep.
+        Pass what it returns to install_sort_index() on the GUI thread; it
+        returns None instead if `cancel_event` is set, checked every slice.
+        """
+        data = self._data[column].copy()
+        size = self._size
+        edits = self._edits[column]
+        step = self.SORT_SLICE
+
+        def build(cancel_event=None):
+            key = data.sort_keys().__getitem__
+            runs = []
+            for start in range(0, size, step):
+                if cancel_event is not None and cancel_event.is_set():
+                    return None
+                runs.append(sorted(range(start, min(start + step, size)), key=key))
+            merged = merge(*runs, key=key)
+            order = array('I')
+            rank = array('I', bytes(4 * size))
+            for start in range(0, size, step):
+                if cancel_event is not None and cancel_event.is_set():
+                    return None
+                order.extend(islice(merged, step))
+                for position in range(start, len(order)):
+                    rank[order[position]] = position
+            return column, order, rank, size, edits
+
+        return build
+
+    def install_sort_index(self, built):
+        """Adopt a sort_index_builder() result unless the column changed since."""
+        column, order, rank, size, edits = built
+        cached = self._sort_cache.get(column)
+        # An order covering the same rows is the same order; adopting it adds the ranks
+        if edits != self._edits[column] or (cached is not None and cached[1] > size):
+            return False
+        self._sort_cache[column] = (order, size)
+        self._rank_cache[column] = rank
+        return True
+
+    def warm_sort_index(self, column):
+        if not self.install_sort_index(self.sort_index_builder(column)()):
+            self.sorted_rows(column)
+
+    def row_mask(self, name, allowed):
+        """bytearray with 1 for each row whose `name` value is in `allowed`."""
+        column = self.column_index[name]
+        key = (column, frozenset(allowed))
+        row_mask = self._mask_cache.get(key)
+        if row_mask is None:
+            row_mask = self._mask_cache[key] = bytearray()
+        if len(row_mask) < self._size:
+            data = self._data[column]
+            value_mask = data.mask(key[1])
+            row_mask.extend(map(value_mask.__getitem__, data.codes[len(row_mask):]))
+        return row_mask
+
+    def view(self, sort_column=None, descending=False, filters=None, rows=None):
+        """Row ids for a sorted and/or filtered view; None means all rows in order.
+
+        `filters` maps a category column name to the set of allowed values.
+        `rows` (ascending row ids, e.g. search results) limits the view to
+        those rows.
+        """
+        if rows is not None:
+            return self._subset_view(rows, sort_column, descending, filters)
+        if sort_column is None and not filters:
+            return None
+
+        # One byte per row, ANDed across filters as big integers
+        row_mask = None
+        for name, allowed in (filters or {}).items():
+            column_mask = self.row_mask(name, allowed)
+            if row_mask is None:
+                row_mask = column_mask
+            else:
+                row_mask = (int.from_bytes(row_mask, 'little')
+                            & int.from_bytes(column_mask, 'little')).to_bytes(self._size, 'little')
+
+        if sort_column is None:
+            return array('I', compress(range(self._size), row_mask))
+
+        rows = self.sorted_rows(sort_column)
+        if row_mask is not None:
+            rank = self._rank_cache.get(sort_column)
+            if rank is not None and len(rank) == self._size:
+                # Sorting the rows kept by their position costs less than
+                # walking the whole order, as long as the filter is selective
+                selected = array('I', compress(range(self._size), row_mask))
+                if len(selected) * 4 < self._size:
+                    return array('I', sorted(selected, key=rank.__getitem__, reverse=descending))
+        if descending:
+            rows = rows[::-1]
+        if row_mask is not None:
+            rows = array('I', compress(rows, map(row_mask.__getitem__, rows)))
+        return rows
+
+    def _subset_view(self, rows, sort_column, descending, filters):
+        # Cost follows the subset, not the table: masks are indexed per row
+        # and the sort uses per-row keys instead of a full-table order
+        for name, allowed in (filters or {}).items():
+            row_mask = self.row_mask(name, allowed)
+            rows = array('I', compress(rows, map(row_mask.__getitem__, rows)))
+        if sort_column is not None:
+            rows = array('I', sorted(rows, key=self._data[sort_column].sort_key(), reverse=descending))
+        return rows
+
+
+_default_store = None
+
+
+def get_store():
+    """The application-wide applicant store shared by pages and bots."""
+    global _default_store
+    if _default_store is None:
+        _default_store = ApplicantStore()
+    return _default_store
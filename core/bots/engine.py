@@ -0,0 +1,332 @@
+"""Asyncio runtime for bot registration sessions.
+
+All sessions run as tasks on one event loop in a dedicated thread, so
+thousands of concurrent bank sessions cost a coroutine each instead of a
+thread each. The GUI talks to the engine only through thread-safe calls
+(submit, cancel) and callbacks, which publish_session_events turns into
+coalesced event-bus traffic for the Qt side (core.events).
+"""
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from collections import Counter, namedtuple
+
+from core import instrument
+from core.events import SESSION_PROGRESS, SESSION_FINISHED, BOT_STATS, get_event_bus
+
+SessionResult = namedtuple('SessionResult', 'session_id bot bank state result error elapsed tag')
+SessionProgress = namedtuple('SessionProgress', 'session_id bot bank stage progress')
+
+log = logging.getLogger('yara.bots.engine')
+
+# Final session states
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+TIMED_OUT = 'timed_out'
+CANCELLED = 'cancelled'
+
+
+class RegistrationSession:
+    """One applicant's registration run at one bank.
+
+    Subclasses implement `run(ctx)`; its return value becomes the session
+    result. `ctx.report(stage, progress)` publishes intermediate progress;
+    `stages` lists the stage names a session reports, in order. `tag` is an
+    opaque caller reference (e.g. the applicant's store row) echoed in the
+    SessionResult.
+    """
+
+    bot = 'bot'
+    stages = ()
+
+    def __init__(self, bank, applicant, timeout=None, tag=None):
+        self.bank = bank
+        self.applicant = applicant
+        self.timeout = timeout
+        self.tag = tag
+        self.session_id = None
+
+    async def run(self, ctx):
+        raise NotImplementedError
+
+
+class SessionContext:
+    def __init__(self, engine, session):
+        self.engine = engine
+        self.session = session
+
+    def report(self, stage, progress=None):
+        self.engine._emit_progress(self.session, stage, progress)
+
+
+class EngineStats:
+    def __init__(self):
+        self.submitted = 0
+        self.running = 0
+        self.finished = {SUCCEEDED: 0, FAILED: 0, TIMED_OUT: 0, CANCELLED: 0}
+        self.started_at = time.monotonic()
+        # Sessions per bot waiting for a bank slot and running, kept current
+        # by whoever owns the stats; other threads only read single entries
+        self.queued_by_bot = Counter()
+        self.running_by_bot = Counter()
+
+    def as_dict(self):
+        done = sum(self.finished.values())
+        elapsed = time.monotonic() - self.started_at
+        return dict(self.finished, submitted=self.submitted, running=self.running,
+                    queued=self.submitted - self.running - done,
+                    sessions_per_sec=done / elapsed if elapsed > 0 else 0.0)
+
+
+class BotEngine:
+    # Concurrent sessions per bank unless set_bank_limit says otherwise
+    DEFAULT_BANK_LIMIT = 64
+    DEFAULT_TIMEOUT = 120.0
+
+    def __init__(self, default_bank_limit=None, default_timeout=None):
+        self.default_bank_limit = default_bank_limit or self.DEFAULT_BANK_LIMIT
+        self.default_timeout = default_timeout or self.DEFAULT_TIMEOUT
+        self.bank_limits = {}
+
+        self.loop = None
+        self.thread = None
+        self._ready = threading.Event()
+        self._semaphores = {}      # bank -> asyncio.Semaphore, loop thread only
+        self._tasks = {}           # session_id -> asyncio.Task, loop thread only
+        self._ids = itertools.count(1)
+        self._result_callbacks = []
+        self._progress_callbacks = []
+        self.stats = EngineStats()
+
+    # Lifecycle
+
+    def start(self):
+        if self.thread is not None:
+            return self
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run_loop, name='bot-engine', daemon=True)
+        self.thread.start()
+        self._ready.wait()
+        return self
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(self._ready.set)
+        self.loop.run_forever()
+        self.loop.close()
+
+    def stop(self, timeout=5.0):
+        if self.thread is None:
+            return
+        future = asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop)
+        future.result(timeout)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout)
+        self.thread = None
+        self._ready.clear()
+
+    async def _shutdown(self):
+        # Sessions and anything else scheduled through run_coroutine
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def call_soon(self, fn, *args):
+        """Run `fn(*args)` on the engine loop thread."""
+        self.loop.call_soon_threadsafe(fn, *args)
+
+    def run_coroutine(self, coro):
+        """Schedule `coro` on the engine loop; returns a concurrent Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    # Callbacks run on the engine thread and must be quick and thread-safe
+
+    def add_result_callback(self, callback):
+        self._result_callbacks.append(callback)
+
+    def add_progress_callback(self, callback):
+        self._progress_callbacks.append(callback)
+
+    def _emit_progress(self, session, stage, progress):
+        for callback in self._progress_callbacks:
+            callback(session.session_id, session.bot, session.bank, stage, progress)
+
+    # Sessions
+
+    def set_bank_limit(self, bank, limit):
+        """Change a bank's concurrency cap (None: back to the default); applies
+        to sessions started later."""
+        if limit is None:
+            self.bank_limits.pop(bank, None)
+        else:
+            self.bank_limits[bank] = limit
+        self.call_soon(self._semaphores.pop, bank, None)
+
+    def set_default_bank_limit(self, limit):
+        self.default_bank_limit = limit
+        self.call_soon(self._semaphores.clear)
+
+    def submit(self, session):
+        """Queue a session from any thread; returns its id."""
+        session.session_id = next(self._ids)
+        self.stats.submitted += 1
+        self.call_soon(self._start_session, session)
+        return session.session_id
+
+    def submit_many(self, sessions):
+        ids = []
+        for session in sessions:
+            session.session_id = next(self._ids)
+            ids.append(session.session_id)
+        self.stats.submitted += len(ids)
+        self.call_soon(self._start_sessions, sessions)
+        return ids
+
+    def cancel(self, session_id):
+        self.call_soon(self._cancel, session_id)
+
+    def cancel_all(self):
+        self.call_soon(self._cancel_all)
+
+    def _start_sessions(self, sessions):
+        for session in sessions:
+            self._start_session(session)
+
+    def _start_session(self, session):
+        task = self.loop.create_task(self.run_session(session))
+        self._tasks[session.session_id] = task
+
+    def _cancel(self, session_id):
+        task = self._tasks.get(session_id)
+        if task is not None:
+            task.cancel()
+
+    def _cancel_all(self):
+        for task in self._tasks.values():
+            task.cancel()
+
+    def _semaphore(self, bank):
+        semaphore = self._semaphores.get(bank)
+        if semaphore is None:
+            limit = self.bank_limits.get(bank, self.default_bank_limit)
+            semaphore = self._semaphores[bank] = asyncio.Semaphore(limit)
+        return semaphore
+
+    async def run_session(self, session):
+        """Run one session to completion on the calling loop.
+
+        Sessions submitted from other threads go through submit(); process
+        workers (core.bots.process_pool) await this directly.
+        """
+        # submit() registered the task already; direct callers register here
+        self._tasks.setdefault(session.session_id, asyncio.current_task())
+        stats = self.stats
+        started = None
+        result = error = None
+        stats.queued_by_bot[session.bot] += 1
+        try:
+            async with self._semaphore(session.bank):
+                started = time.monotonic()
+                stats.queued_by_bot[session.bot] -= 1
+                stats.running += 1
+                stats.running_by_bot[session.bot] += 1
+                try:
+                    timeout = session.timeout or self.default_timeout
+                    result = await asyncio.wait_for(session.run(SessionContext(self, session)), timeout)
+                    state = SUCCEEDED
+                finally:
+                    stats.running -= 1
+                    stats.running_by_bot[session.bot] -= 1
+        except asyncio.CancelledError:
+            state = CANCELLED
+        except asyncio.TimeoutError:
+            state, error = TIMED_OUT, 'timeout'
+        except Exception as e:
+            state, error = FAILED, f"{type(e).__name__}: {e}"
+        finally:
+            self._tasks.pop(session.session_id, None)
+            if started is None:
+                stats.queued_by_bot[session.bot] -= 1
+
+        stats.finished[state] += 1
+        elapsed = time.monotonic() - started if started is not None else 0.0
+        instrument.count('bots.sessions.' + state)
+        instrument.sample('bots.session.' + session.bot, elapsed * 1000.0)
+        log.log(logging.INFO if state in (SUCCEEDED, CANCELLED) else logging.WARNING,
+                "session %d %s in %.2fs%s", session.session_id, state, elapsed,
+                f": {error}" if error else '', extra={'bot': session.bot, 'bank': session.bank})
+        outcome = SessionResult(session.session_id, session.bot, session.bank, state, result, error,
+                                elapsed, session.tag)
+        for callback in self._result_callbacks:
+            callback(outcome)
+        return outcome
+
+
+def publish_session_events(runtime, bus, source='engine'):
+    """Forward a BotEngine's (or ProcessBotPool's) callbacks to an event bus.
+
+    Progress is keyed by session so a burst of updates costs one delivery;
+    results are never coalesced. Stats are republished, keyed by `source`,
+    whenever a session finishes.
+    """
+    def on_progress(session_id, bot, bank, stage, progress):
+        bus.publish(SESSION_PROGRESS, SessionProgress(session_id, bot, bank, stage, progress),
+                    key=session_id)
+
+    def on_result(outcome):
+        bus.publish(SESSION_FINISHED, outcome)
+        bus.publish(BOT_STATS, dict(runtime.stats.as_dict(), source=source), key=source)
+
+    runtime.add_progress_callback(on_progress)
+    runtime.add_result_callback(on_result)
+
+
+def follow_settings(engine, settings):
+    """Apply bots.* settings to `engine` now and whenever they change."""
+    prefix = 'bots.bank_limit.'
+    for key, limit in settings.items(prefix).items():
+        engine.set_bank_limit(key[len(prefix):], limit)
+
+    def on_changed(changes):
+        for key, value in changes.items():
+            if key == 'bots.bank_limit':
+                engine.set_default_bank_limit(value)
+            elif key.startswith(prefix):
+                engine.set_bank_limit(key[len(prefix):], value)
+            elif key == 'bots.timeout':
+                engine.default_timeout = value
+
+    settings.add_listener(on_changed)
+
+
+_default_engine = None
+
+
+def get_engine():
+    """The application-wide engine, started on first use."""
+    global _default_engine
+    if _default_engine is None:
+        from core.bots.live_stats import get_live_stats
+        from core.settings import get_settings
+        settings = get_settings()
+        _default_engine = BotEngine(settings['bots.bank_limit'], settings['bots.timeout']).start()
+        follow_settings(_default_engine, settings)
+        publish_session_events(_default_engine, get_event_bus())
+        get_live_stats().watch('engine', _default_engine.stats)
+        # Sleeps on the loop; readings are only kept while instruments are on
+        _default_engine.run_coroutine(instrument.watch_loop_latency('bots.loop_latency'))
+    return _default_engine
+
+
+def shutdown_engine():
+    """Stop the application-wide engine if it was ever started."""
+    global _default_engine
+    if _default_engine is not None:
+        from core.net.transport import close_transport
+        # Pooled connections belong to the engine loop; close them there first
+        _default_engine.call_soon(close_transport)
+        _default_engine.stop()
+        _default_engine = None
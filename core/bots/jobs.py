@@ -0,0 +1,477 @@
+"""Durable job queue for bot submissions, kept in SQLite.
+
+Each job is one registration to run (bot, bank and a JSON payload). Jobs move
+queued -> leased -> done, or back to queued with a backoff delay after a
+failure, until `max_attempts` failures mark them failed. A leased job carries
+a visibility deadline in `available_at`; if nobody acknowledges it by then it
+is handed out again, so a lost worker never loses a job.
+
+Writes are group-committed: enqueues, acks and failures from any thread are
+queued for a writer thread that commits everything waiting in one
+transaction, so a burst of thousands of operations costs a handful of
+fsyncs. enqueue() waits for its commit by default (the job is on disk when it
+returns); acks don't, so a crash can lose the last few acks and those jobs
+run again: delivery is at least once. dequeue() leases a batch in one
+transaction.
+
+The app is the only user of its queue file, so on open every job still
+leased belongs to a run that died with the process; recovery puts those jobs
+back in the queue and the next run resumes them.
+"""
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from core import instrument
+from core.bots.engine import SUCCEEDED, CANCELLED
+from core.paths import data_dir
+
+Job = namedtuple('Job', 'id bot bank payload attempts')
+
+# Job states
+QUEUED = 'queued'
+LEASED = 'leased'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED_JOB = 'cancelled'
+
+log = logging.getLogger('yara.bots.jobs')
+
+_SCHEMA = (
+    '''CREATE TABLE IF NOT EXISTS jobs (
+        id INTEGER PRIMARY KEY,
+        bot TEXT NOT NULL,
+        bank TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        state TEXT NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        available_at REAL NOT NULL,
+        created_at REAL NOT NULL,
+        updated_at REAL NOT NULL,
+        result TEXT,
+        error TEXT
+    )''',
+    # Only runnable jobs are indexed; finished ones never slow down dequeue
+    '''CREATE INDEX IF NOT EXISTS jobs_due ON jobs (available_at)
+        WHERE state IN ('queued', 'leased')''',
+    'CREATE INDEX IF NOT EXISTS jobs_created ON jobs (created_at)',
+    'CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state)',
+)
+
+_INSERT = '''INSERT INTO jobs (id, bot, bank, payload, state, available_at, created_at, updated_at)
+             VALUES (?, ?, ?, ?, 'queued', ?, ?, ?)'''
+_COMPLETE = "UPDATE jobs SET state = 'done', result = ?, error = NULL, updated_at = ? WHERE id = ?"
+_RETRY = "UPDATE jobs SET state = 'queued', available_at = ?, error = ?, updated_at = ? WHERE id = ?"
+_FAIL = "UPDATE jobs SET state = 'failed', error = ?, updated_at = ? WHERE id = ?"
+_RELEASE = """UPDATE jobs SET state = 'queued', attempts = MAX(attempts - 1, 0), available_at = ?,
+              updated_at = ? WHERE id = ? AND state = 'leased'"""
+_CANCEL = '''UPDATE jobs SET state = 'cancelled', updated_at = ?
+             WHERE id = ? AND state IN ('queued', 'leased')'''
+
+
+class _Commit:
+    """A group of statements committed together; `done` is set afterwards."""
+
+    def __init__(self, statements):
+        self.statements = statements
+        self.done = threading.Event()
+        self.error = None
+
+
+class JobQueue:
+    DEFAULT_LEASE = 300.0
+    DEFAULT_MAX_ATTEMPTS = 5
+    BACKOFF_BASE = 2.0
+    BACKOFF_MAX = 300.0
+
+    def __init__(self, path=None, max_attempts=None, lease=None):
+        self.path = path or os.path.join(data_dir(), 'jobs.db')
+        self.max_attempts = max_attempts or self.DEFAULT_MAX_ATTEMPTS
+        self.lease = lease or self.DEFAULT_LEASE
+        self.listeners = []
+        self.stats = {'enqueued': 0, 'leased': 0, 'completed': 0, 'retried': 0, 'failed': 0,
+                      'commits': 0, 'recovered': 0}
+
+        self._commits = []                 # _Commit objects waiting for the writer
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._db_lock = threading.Lock()   # one connection, shared by writer and dequeue
+        self._closed = False
+        self._connection = self._connect()
+        self._next_id = self._connection.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM jobs').fetchone()[0]
+        self._recover()
+        self._writer = threading.Thread(target=self._write_loop, name='job-writer', daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=FULL')
+        for statement in _SCHEMA:
+            connection.execute(statement)
+        return connection
+
+    def _recover(self):
+        now = time.time()
+        cursor = self._connection.execute(
+            "UPDATE jobs SET state = 'queued', available_at = ?, updated_at = ? WHERE state = 'leased'",
+            (now, now))
+        self.stats['recovered'] = cursor.rowcount
+        if cursor.rowcount:
+            log.info("recovered %d jobs left running by the previous run", cursor.rowcount)
+
+    def add_listener(self, callback):
+        """Call `callback()` after newly enqueued jobs are committed (writer thread)."""
+        self.listeners.append(callback)
+
+    # Group commit
+
+    def _submit(self, statements, wait):
+        commit = _Commit(statements)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("job queue is closed")
+            self._commits.append(commit)
+            self._wake.notify()
+        if wait:
+            commit.done.wait()
+            if commit.error is not None:
+                raise commit.error
+        return commit
+
+    def _write_loop(self):
+        while True:
+            with self._lock:
+                while not self._commits and not self._closed:
+                    self._wake.wait()
+                if not self._commits:
+                    return
+                # Whatever queued up during the previous commit goes in this one
+                commits, self._commits = self._commits, []
+            self._write(commits)
+
+    def _write(self, commits):
+        error = None
+        with self._db_lock, instrument.timer('jobs.commit'):
+            try:
+                with self._connection:
+                    self._connection.execute('BEGIN')
+                    for commit in commits:
+                        for sql, rows in commit.statements:
+                            self._connection.executemany(sql, rows)
+                self.stats['commits'] += 1
+            except sqlite3.Error as e:
+                log.error("job queue commit failed: %s", e)
+                error = e
+        for commit in commits:
+            commit.error = error
+            commit.done.set()
+        if error is None and any(sql is _INSERT for commit in commits for sql, _ in commit.statements):
+            for callback in self.listeners:
+                callback()
+
+    def flush(self):
+        """Wait until everything submitted so far is committed."""
+        self._submit([], wait=True)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._wake.notify()
+        self._writer.join()
+        self._connection.close()
+
+    # Producers
+
+    def enqueue(self, bot, bank, payload, wait=True):
+        return self.enqueue_many([(bot, bank, payload)], wait)[0]
+
+    def enqueue_many(self, jobs, wait=True):
+        """Add (bot, bank, payload) jobs; returns their ids.
+
+        With `wait` the call returns once the jobs are committed; they share
+        a transaction with whatever other threads submitted meanwhile.
+        """
+        now = time.time()
+        rows = []
+        with self._lock:
+            for bot, bank, payload in jobs:
+                rows.append((self._next_id, bot, bank, json.dumps(payload, ensure_ascii=False),
+                             now, now, now))
+                self._next_id += 1
+        if rows:
+            self._submit([(_INSERT, rows)], wait)
+            self.stats['enqueued'] += len(rows)
+        return [row[0] for row in rows]
+
+    # Consumers
+
+    def dequeue(self, limit=1, lease=None, bot=None):
+        """Lease up to `limit` due jobs (only `bot`'s, if given), oldest first.
+
+        A leased job is handed out again if it is neither completed, failed
+        nor released within `lease` seconds.
+        """
+        now = time.time()
+        lease = lease or self.lease
+        where = '' if bot is None else 'AND bot = ?'
+        params = (now,) if bot is None else (now, bot)
+        with self._db_lock:
+            with self._connection:
+                self._connection.execute('BEGIN IMMEDIATE')
+                rows = self._connection.execute(
+                    f'''SELECT id, bot, bank, payload, attempts FROM jobs
+                        WHERE state IN ('queued', 'leased') AND available_at <= ? {where}
+                        ORDER BY available_at LIMIT ?''', params + (limit,)).fetchall()
+                # A lease that ran out on the last allowed attempt ends the job
+                expired = [(f"lease expired after {attempts} attempts", now, job_id)
+                           for job_id, _, _, _, attempts in rows if attempts >= self.max_attempts]
+                jobs = [Job(job_id, bot, bank, json.loads(payload), attempts + 1)
+                        for job_id, bot, bank, payload, attempts in rows
+                        if attempts < self.max_attempts]
+                self._connection.executemany(_FAIL, expired)
+                self._connection.executemany(
+                    '''UPDATE jobs SET state = 'leased', attempts = attempts + 1, available_at = ?,
+                       updated_at = ? WHERE id = ?''', [(now + lease, now, job.id) for job in jobs])
+        self.stats['leased'] += len(jobs)
+        self.stats['failed'] += len(expired)
+        return jobs
+
+    def backoff(self, attempts):
+        """Seconds before retrying a job that has failed `attempts` times."""
+        delay = min(self.BACKOFF_MAX, self.BACKOFF_BASE * 2 ** (attempts - 1))
+        # Jitter, so jobs that failed together don't all retry together
+        return delay * random.uniform(0.5, 1.0)
+
+    def complete(self, job, result=None):
+        self._submit([(_COMPLETE, [(json.dumps(result, ensure_ascii=False), time.time(), job.id)])],
+                     wait=False)
+        self.stats['completed'] += 1
+
+    def fail(self, job, error, retry=True):
+        """Record a failed attempt; retried after a backoff unless attempts ran out."""
+        now = time.time()
+        if retry and job.attempts < self.max_attempts:
+            statement = (_RETRY, [(now + self.backoff(job.attempts), error, now, job.id)])
+            self.stats['retried'] += 1
+        else:
+            statement = (_FAIL, [(error, now, job.id)])
+            self.stats['failed'] += 1
+        self._submit([statement], wait=False)
+
+    def release(self, job):
+        """Give a leased job back without counting the attempt (e.g. on shutdown)."""
+        now = time.time()
+        self._submit([(_RELEASE, [(now, now, job.id)])], wait=False)
+
+    def cancel(self, job_ids):
+        now = time.time()
+        self._submit([(_CANCEL, [(now, job_id) for job_id in job_ids])], wait=False)
+
+    # Inspection
+
+    def counts(self):
+        """{state: number of jobs}, including changes not yet committed."""
+        self.flush()
+        with self._db_lock:
+            return dict(self._connection.execute('SELECT state, COUNT(*) FROM jobs GROUP BY state'))
+
+    def recent(self, since):
+        """Jobs created at or after `since` (a time.time() value), in any state."""
+        self.flush()
+        with self._db_lock:
+            rows = self._connection.execute(
+                'SELECT id, bot, bank, payload, attempts FROM jobs WHERE created_at >= ? ORDER BY id',
+                (since,)).fetchall()
+        return [Job(job_id, bot, bank, json.loads(payload), attempts)
+                for job_id, bot, bank, payload, attempts in rows]
+
+    def pending(self):
+        """Whether any job is queued or leased, including changes not yet committed."""
+        self.flush()
+        with self._db_lock:
+            return bool(self._connection.execute(
+                "SELECT EXISTS(SELECT 1 FROM jobs WHERE state IN ('queued', 'leased'))").fetchone()[0])
+
+
+class JobRunner:
+    """Feeds queued jobs to a BotEngine (or ProcessBotPool) and acks the results.
+
+    `make_session(job)` turns a job into a RegistrationSession. At most
+    `concurrency` jobs are leased at a time; the runner thread tops up as
+    sessions finish, leasing in batches, and polls every `poll_interval`
+    seconds for jobs whose backoff has passed.
+    """
+
+    DEFAULT_CONCURRENCY = 256
+    POLL_INTERVAL = 1.0
+
+    def __init__(self, queue, runtime, make_session, concurrency=None, poll_interval=None):
+        self.queue = queue
+        self.runtime = runtime
+        self.make_session = make_session
+        self.concurrency = concurrency or self.DEFAULT_CONCURRENCY
+        self.poll_interval = poll_interval or self.POLL_INTERVAL
+        self.running = {}              # session_id -> Job
+        self.thread = None
+        self._stopping = False
+        self._submitting = False
+        self._early = {}               # session_id -> result that beat submit_many back
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        runtime.add_result_callback(self.on_result)
+        queue.add_listener(self.wake)
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name='job-runner', daemon=True)
+            self.thread.start()
+        return self
+
+    def wake(self):
+        with self._lock:
+            self._wake.notify()
+
+    def stop(self, timeout=5.0):
+        """Stop leasing jobs. Sessions still running are released as their
+        results (usually cancellations when the engine stops) come in."""
+        with self._lock:
+            self._stopping = True
+            self._wake.notify()
+        if self.thread is not None:
+            self.thread.join(timeout)
+            self.thread = None
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._stopping and len(self.running) >= self.concurrency:
+                    self._wake.wait()
+                if self._stopping:
+                    return
+                free = self.concurrency - len(self.running)
+            jobs = self.queue.dequeue(free)
+            if not jobs:
+                with self._lock:
+                    if not self._stopping:
+                        self._wake.wait(self.poll_interval)
+                continue
+            self._submit(jobs)
+
+    def _submit(self, jobs):
+        sessions = []
+        for job in jobs:
+            try:
+                sessions.append((job, self.make_session(job)))
+            except Exception as e:
+                self.queue.fail(job, f"{type(e).__name__}: {e}", retry=False)
+        if not sessions:
+            return
+        # Not held across submit_many: a runtime may report results from
+        # inside it (ProcessBotPool's done callbacks), and on_result takes the
+        # lock. Results for ids we don't know yet wait in _early meanwhile.
+        with self._lock:
+            self._submitting = True
+        session_ids = ()
+        finished = []
+        try:
+            session_ids = self.runtime.submit_many([session for _, session in sessions])
+        finally:
+            with self._lock:
+                self._submitting = False
+                early, self._early = self._early, {}
+                for session_id, (job, _) in zip(session_ids, sessions):
+                    outcome = early.pop(session_id, None)
+                    if outcome is None:
+                        self.running[session_id] = job
+                    else:
+                        finished.append((job, outcome))
+                stopping = self._stopping
+        for job, outcome in finished:
+            self._acknowledge(job, outcome, stopping)
+
+    def on_result(self, outcome):
+        with self._lock:
+            job = self.running.pop(outcome.session_id, None)
+            if job is None and self._submitting:
+                self._early[outcome.session_id] = outcome
+                return
+            stopping = self._stopping
+            self._wake.notify()
+        if job is not None:
+            self._acknowledge(job, outcome, stopping)
+
+    def _acknowledge(self, job, outcome, stopping):
+        if outcome.state == SUCCEEDED:
+            self.queue.complete(job, outcome.result)
+        elif outcome.state == CANCELLED:
+            if stopping:
+                # Shutting down: the next run picks the job up again
+                self.queue.release(job)
+            else:
+                self.queue.cancel([job.id])
+        else:
+            self.queue.fail(job, outcome.error)
+
+
+_default_queue = None
+_default_runner = None
+
+
+def queue_path():
+    return os.path.join(data_dir(), 'jobs.db')
+
+
+def get_job_queue():
+    """The application job queue, opened (and recovered) on first use."""
+    global _default_queue
+    if _default_queue is None:
+        from core.settings import get_settings
+        _default_queue = JobQueue(queue_path(), get_settings()['bots.max_attempts'])
+    return _default_queue
+
+
+def get_bot_runtime():
+    """Where bot sessions run: the worker process pool when bots.processes
+    is above zero, otherwise the in-process engine."""
+    from core.settings import get_settings
+    if get_settings()['bots.processes'] > 0:
+        from core.bots.process_pool import get_process_pool
+        return get_process_pool()
+    from core.bots.engine import get_engine
+    return get_engine()
+
+
+def get_job_runner():
+    """Runner feeding the application queue to the bot runtime, started on first use."""
+    global _default_runner
+    if _default_runner is None:
+        from core.bots.loan_bot import session_for_job
+        _default_runner = JobRunner(get_job_queue(), get_bot_runtime(), session_for_job).start()
+    return _default_runner
+
+
+def resume_jobs():
+    """Start the runner if a previous run left jobs unfinished."""
+    if _default_runner is None and os.path.exists(queue_path()) and get_job_queue().pending():
+        get_job_runner()
+
+
+def stop_job_runner():
+    """Stop leasing jobs; call before the engine stops so its cancellations
+    put running jobs back in the queue."""
+    if _default_runner is not None:
+        _default_runner.stop()
+
+
+def close_job_queue():
+    global _default_queue, _default_runner
+    _default_runner = None
+    if _default_queue is not None:
+        _default_queue.close()
+        _default_queue = None
@@ -0,0 +1,118 @@
+"""Per-bot session statistics kept current as results arrive.
+
+Nothing here looks at job history: every SESSION_FINISHED result bumps a
+counter and a one-minute sliding window, and queued/running are read from
+the EngineStats of the runtimes being watched, which keep them per bot as
+sessions start and finish. A snapshot therefore costs the same with ten
+finished jobs as with ten million.
+"""
+import time
+from collections import namedtuple
+
+from core.bots.engine import SUCCEEDED, FAILED, TIMED_OUT, CANCELLED
+from core.events import SESSION_FINISHED, get_event_bus
+
+BotSnapshot = namedtuple('BotSnapshot', 'queued running succeeded failed per_minute')
+
+
+class SlidingCount:
+    """Events seen in the last `window` seconds, in one-second buckets.
+
+    add() and count() first clear the buckets that fell out of the window
+    since the last call, at most `window` of them, so both are O(1).
+    """
+
+    def __init__(self, window=60, clock=time.monotonic):
+        self.window = window
+        self.clock = clock
+        self.buckets = [0] * window
+        self.total = 0
+        self.second = int(clock())     # the second the newest bucket belongs to
+
+    def _advance(self):
+        second = int(self.clock())
+        for step in range(1, min(second - self.second, self.window) + 1):
+            index = (self.second + step) % self.window
+            self.total -= self.buckets[index]
+            self.buckets[index] = 0
+        self.second = max(second, self.second)
+        return second
+
+    def add(self, n=1):
+        self.buckets[self._advance() % self.window] += n
+        self.total += n
+
+    def count(self):
+        self._advance()
+        return self.total
+
+
+class BotCounters:
+    __slots__ = ('succeeded', 'failed', 'cancelled', 'finished')
+
+    def __init__(self, window, clock):
+        self.succeeded = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.finished = SlidingCount(window, clock)
+
+
+class LiveStats:
+    """Running totals per bot since launch, fed by SESSION_FINISHED batches.
+
+    Sessions that failed or timed out count as failed; cancelled ones are
+    kept apart and left out of the throughput, which counts sessions that
+    ran to an end in the last minute.
+    """
+
+    WINDOW = 60
+
+    def __init__(self, window=None, clock=time.monotonic):
+        self.window = window or self.WINDOW
+        self.clock = clock
+        self.bots = {}
+        self.runtimes = {}     # source -> EngineStats
+
+    def watch(self, source, stats):
+        """Read queued and running sessions from `stats` (an EngineStats)."""
+        self.runtimes[source] = stats
+
+    def counters(self, bot):
+        counters = self.bots.get(bot)
+        if counters is None:
+            counters = self.bots[bot] = BotCounters(self.window, self.clock)
+        return counters
+
+    def on_finished(self, results):
+        for outcome in results:
+            counters = self.counters(outcome.bot)
+            if outcome.state == SUCCEEDED:
+                counters.succeeded += 1
+            elif outcome.state in (FAILED, TIMED_OUT):
+                counters.failed += 1
+            elif outcome.state == CANCELLED:
+                counters.cancelled += 1
+                continue
+            counters.finished.add()
+
+    def snapshot(self, bot):
+        counters = self.counters(bot)
+        queued = running = 0
+        for stats in tuple(self.runtimes.values()):
+            # Counter lookups; the runtimes' own threads keep them current
+            queued += max(stats.queued_by_bot[bot], 0)
+            running += max(stats.running_by_bot[bot], 0)
+        return BotSnapshot(queued, running, counters.succeeded, counters.failed,
+                           counters.finished.count() * 60.0 / self.window)
+
+
+_default_stats = None
+
+
+def get_live_stats():
+    """The application's live statistics, subscribed to the event bus on first use."""
+    global _default_stats
+    if _default_stats is None:
+        _default_stats = LiveStats()
+        get_event_bus().subscribe(SESSION_FINISHED, _default_stats.on_finished)
+    return _default_stats
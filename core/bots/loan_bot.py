@@ -0,0 +1,64 @@
+"""Registration sessions for the marriage-loan and child-loan bots."""
+from core.bots.engine import RegistrationSession, SUCCEEDED, FAILED, TIMED_OUT, CANCELLED
+from core.net.http import json_body, HttpError
+from core.net.transport import CookieJar, get_transport
+
+MARRIAGE_LOAN = 'marriage-loan'
+CHILD_LOAN = 'child-loan'
+
+LOAN_TYPES = {MARRIAGE_LOAN: 'ازدواج', CHILD_LOAN: 'فرزند'}
+
+# Applicant status shown in the applicants table once a session ends
+APPLICANT_STATUS = {SUCCEEDED: 'ثبت شد', FAILED: 'ناموفق', TIMED_OUT: 'ناموفق', CANCELLED: 'لغو شد'}
+
+
+class LoanRegistrationSession(RegistrationSession):
+    """Logs an applicant into a bank portal and files a loan registration."""
+
+    stages = ('login', 'register', 'done')
+
+    def __init__(self, bot, bank, base_url, applicant, timeout=None, transport=None, tag=None):
+        super().__init__(bank, applicant, timeout, tag)
+        self.bot = bot
+        self.base_url = base_url.rstrip('/')
+        self.transport = transport
+        # Cookies belong to the applicant, connections to the shared pool
+        self.cookies = CookieJar()
+
+    async def request(self, method, path, body=None):
+        transport = self.transport or get_transport()
+        response = await transport.request(method, self.base_url + path, body=body or b'',
+                                           jar=self.cookies)
+        if response.status != 200:
+            raise HttpError(f"{method} {path}: HTTP {response.status}")
+        return json_body(response)
+
+    async def run(self, ctx):
+        ctx.report('login', 0.0)
+        await self.request('POST', '/login', {'national_id': self.applicant['national_id']})
+        ctx.report('register', 0.5)
+        result = await self.request('POST', '/register', {
+            'loan_type': LOAN_TYPES[self.bot],
+            'national_id': self.applicant['national_id'],
+            'phone': self.applicant.get('phone'),
+        })
+        ctx.report('done', 1.0)
+        return result
+
+
+def registration_job(bot, bank, base_url, applicant, row=None):
+    """(bot, bank, payload) for JobQueue.enqueue_many; `row` is the applicant's store row."""
+    return bot, bank, {'base_url': base_url, 'applicant': applicant, 'row': row}
+
+
+def session_for_job(job):
+    payload = job.payload
+    return LoanRegistrationSession(job.bot, job.bank, payload['base_url'], payload['applicant'],
+                                   tag=payload.get('row'))
+
+
+def record_results(store, results):
+    """Write the outcome of finished sessions tagged with a store row."""
+    store.update_many('status', {outcome.tag: APPLICANT_STATUS[outcome.state]
+                                 for outcome in results
+                                 if outcome.tag is not None and outcome.bot in LOAN_TYPES})
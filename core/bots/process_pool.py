@@ -0,0 +1,427 @@
+"""Run bot sessions in worker processes instead of the GUI process.
+
+Sessions are shipped to a ProcessPoolExecutor in chunks; each worker runs its
+chunk concurrently on a long-lived event loop with its own BotEngine and
+transport. Progress does not travel back as pickled messages: every session
+in flight owns a slot in a shared-memory array, taken from a free list when
+it is submitted and given back once its chunk is done, that workers write
+and the parent polls
+(see ui.workers.bot_bridge.PoolBridge, which polls once per frame). Only the
+final SessionResults are pickled, once per chunk.
+
+A crashing worker breaks its executor: chunks that had started fail, chunks
+still queued (every slot still QUEUED) move to a fresh executor. Workers are
+replaced after about `recycle_after` sessions each so leaks in scraping code
+stay bounded: the pool retires its executor (which finishes the chunks it
+already has) and starts a fresh one. ProcessPoolExecutor's own
+max_tasks_per_child can deadlock on Python 3.11, so it is not used.
+"""
+import asyncio
+import itertools
+import multiprocessing
+import os
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from multiprocessing import shared_memory
+
+from core.bots.engine import (BotEngine, EngineStats, SessionResult, FAILED, CANCELLED,
+                              publish_session_events)
+from core.events import get_event_bus
+
+# Slot states
+QUEUED = 0
+RUNNING = 1
+DONE = 2
+
+NO_STAGE = 0xFF
+NO_PROGRESS = 0xFFFF
+PROGRESS_SCALE = 10000
+
+
+class ProgressSlots:
+    """Fixed array of per-session progress slots over a shared buffer.
+
+    Stored as parallel arrays (seq, session id, state, stage, cancel flag,
+    progress) so the parent can diff the seq array in one pass. A writer makes
+    seq odd while it updates a slot; readers skip slots whose seq is odd or
+    changed under them.
+    """
+
+    def __init__(self, buffer, slots):
+        self.slots = slots
+        offset = 0
+        views = []
+        for fmt, size in (('I', 4), ('I', 4), ('B', 1), ('B', 1), ('B', 1), ('H', 2)):
+            # Keep every array aligned to its item size
+            offset += -offset % size
+            views.append(buffer[offset:offset + slots * size].cast(fmt))
+            offset += slots * size
+        self.seq, self.ids, self.states, self.stages, self.cancel, self.progress = views
+
+    @staticmethod
+    def buffer_size(slots):
+        return slots * (4 + 4 + 1 + 1 + 1 + 2) + 8
+
+    def write(self, slot, session_id, state, stage=NO_STAGE, progress=NO_PROGRESS):
+        self.seq[slot] = (self.seq[slot] + 1) & 0xFFFFFFFF
+        self.ids[slot] = session_id
+        self.states[slot] = state
+        self.stages[slot] = stage
+        self.progress[slot] = progress
+        self.seq[slot] = (self.seq[slot] + 1) & 0xFFFFFFFF
+
+    def read(self, slot):
+        """Return (session_id, state, stage, progress), or None mid-write."""
+        seq = self.seq[slot]
+        if seq & 1:
+            return None
+        record = (self.ids[slot], self.states[slot], self.stages[slot], self.progress[slot])
+        return record if self.seq[slot] == seq else None
+
+    def release(self):
+        for view in (self.seq, self.ids, self.states, self.stages, self.cancel, self.progress):
+            view.release()
+
+
+# Worker process side
+
+_worker = None
+
+
+class _Worker:
+    def __init__(self, shm_name, slots, bank_limit):
+        self.shm = shared_memory.SharedMemory(shm_name)
+        self.slots = ProgressSlots(self.shm.buf, slots)
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.engine = BotEngine(default_bank_limit=bank_limit)
+        self.engine.loop = self.loop
+        self.engine.add_progress_callback(self.on_progress)
+        self.engine.add_result_callback(self.on_result)
+        self.session_slots = {}    # session_id -> (slot, stages)
+
+    def on_progress(self, session_id, bot, bank, stage, progress):
+        slot, stages = self.session_slots[session_id]
+        code = stages.index(stage) if stage in stages else NO_STAGE
+        value = NO_PROGRESS if progress is None else int(max(0.0, min(progress, 1.0)) * PROGRESS_SCALE)
+        self.slots.write(slot, session_id, RUNNING, code, value)
+
+    def on_result(self, outcome):
+        slot, _ = self.session_slots[outcome.session_id]
+        self.slots.write(slot, outcome.session_id, DONE)
+
+    async def run_chunk(self, sessions, slots):
+        for session, slot in zip(sessions, slots):
+            self.session_slots[session.session_id] = (slot, session.stages)
+        watcher = asyncio.ensure_future(self.watch_cancellations(sessions, slots))
+        try:
+            results = await asyncio.gather(*(self.run_one(session, slot)
+                                             for session, slot in zip(sessions, slots)))
+        finally:
+            watcher.cancel()
+            for session in sessions:
+                self.session_slots.pop(session.session_id, None)
+        return results
+
+    async def run_one(self, session, slot):
+        if self.slots.cancel[slot]:
+            self.slots.write(slot, session.session_id, DONE)
+            return SessionResult(session.session_id, session.bot, session.bank, CANCELLED,
+                                 None, None, 0.0, session.tag)
+        self.slots.write(slot, session.session_id, RUNNING)
+        return await self.engine.run_session(session)
+
+    async def watch_cancellations(self, sessions, slots, interval=0.1):
+        while True:
+            await asyncio.sleep(interval)
+            for session, slot in zip(sessions, slots):
+                if self.slots.cancel[slot]:
+                    self.engine.cancel(session.session_id)
+
+
+def _init_worker(shm_name, slots, bank_limit):
+    global _worker
+    _worker = _Worker(shm_name, slots, bank_limit)
+
+
+def _run_chunk(sessions, slots):
+    return _worker.loop.run_until_complete(_worker.run_chunk(sessions, slots))
+
+
+# Parent side
+
+class ProcessBotPool:
+    """BotEngine look-alike that runs sessions in worker processes.
+
+    Result callbacks run on an executor thread; progress callbacks run on
+    whichever thread calls poll().
+    """
+
+    DEFAULT_RECYCLE_AFTER = 500
+    # A worker runs one chunk at a time, so this is also its concurrency
+    DEFAULT_CHUNK_SIZE = 64
+    DEFAULT_SLOTS = 16384
+
+    def __init__(self, processes=None, recycle_after=None, chunk_size=None, slots=None,
+                 bank_limit=None):
+        self.processes = processes or os.cpu_count() or 1
+        self.recycle_after = recycle_after or self.DEFAULT_RECYCLE_AFTER
+        self.chunk_size = chunk_size or self.DEFAULT_CHUNK_SIZE
+        self.slot_count = slots or self.DEFAULT_SLOTS
+        self.bank_limit = bank_limit or BotEngine.DEFAULT_BANK_LIMIT
+
+        self.executor = None
+        self.retired = []          # executors finishing their last chunks
+        self._chunks = Counter()   # executor -> chunks submitted and not done
+        self.executor_sessions = 0
+        self.generations = 0
+        self.shm = None
+        self.slots = None
+        self._lock = threading.Lock()
+        self._executor_lock = threading.Lock()
+        self._active = {}          # session_id -> session
+        self._slot_of = {}         # session_id -> slot, for sessions in flight
+        self._free_slots = []
+        self._seen = None          # seq array bytes at the previous poll
+        self._delivered = {}       # session_id -> seq last delivered
+        self._ids = itertools.count(1)
+        self._result_callbacks = []
+        self._progress_callbacks = []
+        self.stats = EngineStats()
+        self.crashed_chunks = 0
+
+    def start(self):
+        if self.executor is not None:
+            return self
+        self.shm = shared_memory.SharedMemory(create=True, size=ProgressSlots.buffer_size(self.slot_count))
+        self.slots = ProgressSlots(self.shm.buf, self.slot_count)
+        self._free_slots = list(range(self.slot_count - 1, -1, -1))
+        self._seen = self.slots.seq.tobytes()
+        self.executor = self._new_executor()
+        return self
+
+    def _new_executor(self):
+        self.executor_sessions = 0
+        self.generations += 1
+        return ProcessPoolExecutor(
+            self.processes, mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker, initargs=(self.shm.name, self.slot_count, self.bank_limit))
+
+    def _executor_for(self, sessions):
+        if self.executor_sessions >= self.recycle_after * self.processes:
+            self.executor.shutdown(wait=False)
+            self.retired.append(self.executor)
+            self.executor = self._new_executor()
+        self.executor_sessions += sessions
+        return self.executor
+
+    def stop(self):
+        if self.executor is None:
+            return
+        self.cancel_all()
+        for executor in self.retired + [self.executor]:
+            executor.shutdown(wait=True, cancel_futures=True)
+        self.retired.clear()
+        self._chunks.clear()
+        self.executor = None
+        self.slots.release()
+        self.slots = None
+        self.shm.close()
+        self.shm.unlink()
+        self.shm = None
+
+    def add_result_callback(self, callback):
+        self._result_callbacks.append(callback)
+
+    def add_progress_callback(self, callback):
+        self._progress_callbacks.append(callback)
+
+    # Sessions
+
+    def submit(self, session):
+        return self.submit_many([session])[0]
+
+    def submit_many(self, sessions):
+        if not sessions:
+            return []
+        with self._lock:
+            if len(sessions) > len(self._free_slots):
+                raise RuntimeError(f"more than {self.slot_count} bot sessions in flight")
+            for session in sessions:
+                session.session_id = next(self._ids)
+                # A slot is only reused once its previous session's chunk is done,
+                # so no two sessions in flight share a cancel flag or progress
+                slot = self._free_slots.pop()
+                self.slots.cancel[slot] = 0
+                self.slots.write(slot, session.session_id, QUEUED)
+                self._active[session.session_id] = session
+                self._slot_of[session.session_id] = slot
+                self.stats.queued_by_bot[session.bot] += 1
+            self.stats.submitted += len(sessions)
+
+        # Small batches are still spread over all workers
+        chunk_size = min(self.chunk_size, -(-len(sessions) // self.processes))
+        for start in range(0, len(sessions), chunk_size):
+            self._submit_chunk(sessions[start:start + chunk_size])
+        return [session.session_id for session in sessions]
+
+    def _submit_chunk(self, chunk):
+        with self._lock:
+            slots = [self._slot_of[session.session_id] for session in chunk]
+        with self._executor_lock:
+            try:
+                executor = self._executor_for(len(chunk))
+                future = executor.submit(_run_chunk, chunk, slots)
+            except BrokenProcessPool:
+                self.retired.append(self.executor)
+                self.executor = self._new_executor()
+                executor = self._executor_for(len(chunk))
+                future = executor.submit(_run_chunk, chunk, slots)
+            self._chunks[executor] += 1
+        # Outside the lock: an already finished future runs the callback right here
+        future.add_done_callback(partial(self._chunk_done, chunk, executor))
+
+    def _executor_done(self, executor):
+        # Retired executors are dropped once their last chunk is done
+        with self._executor_lock:
+            self._chunks[executor] -= 1
+            if self._chunks[executor] <= 0:
+                del self._chunks[executor]
+                if executor in self.retired:
+                    self.retired.remove(executor)
+
+    def _never_started(self, chunk):
+        for session in chunk:
+            record = self.slots.read(self._slot_of[session.session_id])
+            if record is None or record[:2] != (session.session_id, QUEUED):
+                return False
+        return True
+
+    def cancel(self, session_id):
+        with self._lock:
+            if session_id in self._active:
+                self.slots.cancel[self._slot_of[session_id]] = 1
+
+    def cancel_all(self):
+        with self._lock:
+            for slot in self._slot_of.values():
+                self.slots.cancel[slot] = 1
+
+    def _chunk_done(self, chunk, executor, future):
+        self._executor_done(executor)
+        if future.cancelled():
+            results = [SessionResult(s.session_id, s.bot, s.bank, CANCELLED, None, None, 0.0, s.tag)
+                       for s in chunk]
+        elif future.exception() is not None:
+            error = future.exception()
+            if isinstance(error, BrokenProcessPool) and self.executor is not None \
+                    and self._never_started(chunk):
+                self._submit_chunk(chunk)
+                return
+            self.crashed_chunks += 1
+            error = f"{type(error).__name__}: {error}"
+            results = [SessionResult(s.session_id, s.bot, s.bank, FAILED, None, error, 0.0, s.tag)
+                       for s in chunk]
+        else:
+            results = future.result()
+
+        with self._lock:
+            for outcome in results:
+                self._active.pop(outcome.session_id, None)
+                self._delivered.pop(outcome.session_id, None)
+                slot = self._slot_of.pop(outcome.session_id, None)
+                if slot is not None:
+                    self._free_slots.append(slot)
+                self.stats.finished[outcome.state] += 1
+            self.stats.running = self._count_running()
+        for outcome in results:
+            for callback in self._result_callbacks:
+                callback(outcome)
+
+    def _count_running(self):
+        # Also refreshes the per-bot counts, from the same pass over the sessions in flight
+        states = self.slots.states
+        active, running = Counter(), Counter()
+        for session_id, session in self._active.items():
+            active[session.bot] += 1
+            if states[self._slot_of[session_id]] == RUNNING:
+                running[session.bot] += 1
+        self.stats.running_by_bot = running
+        self.stats.queued_by_bot = active - running
+        return sum(running.values())
+
+    # Progress
+
+    def poll(self):
+        """Deliver progress for slots changed since the last poll.
+
+        Returns the number of updates delivered. Cheap enough to call every
+        frame: one bytes comparison when nothing changed, otherwise a pass
+        over the sessions in flight.
+        """
+        if self.slots is None:
+            return 0
+        seq = self.slots.seq.tobytes()
+        if seq == self._seen:
+            return 0
+        self._seen = seq
+        current = memoryview(seq).cast('I')
+
+        updates = []
+        with self._lock:
+            for session_id, session in self._active.items():
+                slot = self._slot_of[session_id]
+                if self.slots.states[slot] != RUNNING:
+                    continue
+                if current[slot] == self._delivered.get(session_id):
+                    continue
+                record = self.slots.read(slot)
+                if record is None or record[0] != session_id or record[1] != RUNNING:
+                    continue
+                self._delivered[session_id] = current[slot]
+                _, _, stage, progress = record
+                stages = session.stages
+                updates.append((session_id, session.bot, session.bank,
+                                stages[stage] if stage < len(stages) else '',
+                                None if progress == NO_PROGRESS else progress / PROGRESS_SCALE))
+            self.stats.running = self._count_running()
+
+        for update in updates:
+            for callback in self._progress_callbacks:
+                callback(*update)
+        return len(updates)
+
+
+_default_pool = None
+
+
+def get_process_pool():
+    """The application-wide worker pool, started on first use.
+
+    Used when the bots.processes setting is above zero (see
+    core.bots.jobs.get_bot_runtime); bots.recycle_after sizes worker
+    lifetimes (0 picks the default). YARA_BOT_PROCESSES and
+    YARA_BOT_RECYCLE_AFTER override them.
+    """
+    global _default_pool
+    if _default_pool is None:
+        from core.bots.live_stats import get_live_stats
+        from core.settings import get_settings
+        settings = get_settings()
+        _default_pool = ProcessBotPool(settings['bots.processes'],
+                                       settings['bots.recycle_after'] or None,
+                                       bank_limit=settings['bots.bank_limit']).start()
+        publish_session_events(_default_pool, get_event_bus(), source='process-pool')
+        get_live_stats().watch('process-pool', _default_pool.stats)
+    return _default_pool
+
+
+def shutdown_process_pool():
+    """Stop the application-wide pool if it was ever started."""
+    global _default_pool
+    if _default_pool is not None:
+        _default_pool.stop()
+        _default_pool = None
@@ -0,0 +1,151 @@
+"""Coalescing event bus between background work and the UI.
+
+Bots, workers and jobs publish from any thread; nothing is delivered until
+someone calls flush(), which the UI does at most once per frame (see
+ui.workers.event_pump). Between flushes, keyed events replace the pending
+event with the same (topic, key) - a session's progress only matters in its
+latest state - while keyless events queue up in order. Subscribers get one
+list per topic per flush instead of one call per event.
+"""
+import threading
+from collections import deque
+from weakref import WeakMethod
+
+# Well-known topics
+SESSION_PROGRESS = 'session.progress'      # SessionProgress, keyed by session id
+SESSION_FINISHED = 'session.finished'      # SessionResult
+BOT_STATS = 'bots.stats'                   # EngineStats.as_dict() + source, keyed by source
+LOG_APPENDED = 'logs.appended'             # latest log seq, keyed by ring
+NEWS_UPDATED = 'news.updated'              # NewsDiff, keyed by feed URL
+SETTINGS_CHANGED = 'settings.changed'      # (key, value), keyed by setting key
+NOTIFY_STATS = 'notify.stats'              # NotificationDispatcher.stats(), keyed by provider
+
+
+class _StrongRef:
+    # Same call signature as a weakref, for plain functions
+    def __init__(self, target):
+        self.target = target
+
+    def __call__(self):
+        return self.target
+
+
+class EventStats:
+    def __init__(self):
+        self.published = 0
+        self.merged = 0
+        self.dropped = 0
+        self.delivered = 0
+        self.flushes = 0
+
+    def as_dict(self):
+        return {'published': self.published, 'merged': self.merged, 'dropped': self.dropped,
+                'delivered': self.delivered, 'flushes': self.flushes}
+
+
+class EventBus:
+    # Pending keyed events, and pending keyless events, kept between flushes
+    MAX_PENDING = 100000
+
+    def __init__(self, max_pending=None):
+        self.max_pending = max_pending or self.MAX_PENDING
+        self.stats = EventStats()
+        self._lock = threading.Lock()
+        self._latest = {}                                   # (topic, key) -> payload
+        self._queue = deque()                               # (topic, payload)
+        self._subscribers = {}                              # topic -> [callback ref]
+        self._wakeup = None
+
+    def set_wakeup(self, callback):
+        """`callback()` runs (on the publishing thread) when the bus goes from
+        empty to pending, so a flush can be scheduled."""
+        self._wakeup = callback
+
+    def subscribe(self, topic, callback):
+        """Call `callback(payloads)` with each flushed batch of `topic`; '*' gets
+        every topic as `callback(topic, payloads)`.
+
+        Bound methods are held weakly, like ApplicantStore listeners, so a
+        torn-down page does not stay subscribed.
+        """
+        ref = WeakMethod(callback) if hasattr(callback, '__self__') else _StrongRef(callback)
+        self._subscribers.setdefault(topic, []).append(ref)
+
+    def unsubscribe(self, topic, callback):
+        refs = self._subscribers.get(topic)
+        if refs:
+            refs[:] = [ref for ref in refs if ref() not in (None, callback)]
+
+    def _deliver(self, topic, *args):
+        refs = self._subscribers.get(topic)
+        if not refs:
+            return
+        for ref in tuple(refs):
+            callback = ref()
+            if callback is None:
+                refs.remove(ref)
+            else:
+                callback(*args)
+
+    def publish(self, topic, payload, key=None):
+        with self._lock:
+            self.stats.published += 1
+            was_empty = not self._latest and not self._queue
+            if key is not None:
+                slot = (topic, key)
+                if slot in self._latest:
+                    self.stats.merged += 1
+                elif len(self._latest) >= self.max_pending:
+                    self.stats.dropped += 1
+                    return
+                self._latest[slot] = payload
+            else:
+                if len(self._queue) >= self.max_pending:
+                    # The oldest keyless event goes first
+                    self._queue.popleft()
+                    self.stats.dropped += 1
+                self._queue.append((topic, payload))
+        if was_empty and self._wakeup is not None:
+            self._wakeup()
+
+    def pending(self):
+        return len(self._latest) + len(self._queue)
+
+    def flush(self):
+        """Deliver everything pending; returns the number of events delivered.
+
+        Must be called from the thread subscribers expect (the GUI thread).
+        """
+        with self._lock:
+            if not self._latest and not self._queue:
+                return 0
+            latest, self._latest = self._latest, {}
+            queue, self._queue = self._queue, deque()
+
+        batches = {}
+        for (topic, _), payload in latest.items():
+            batches.setdefault(topic, []).append(payload)
+        for topic, payload in queue:
+            batches.setdefault(topic, []).append(payload)
+
+        delivered = len(latest) + len(queue)
+        self.stats.delivered += delivered
+        self.stats.flushes += 1
+        for topic, payloads in batches.items():
+            self._deliver(topic, payloads)
+            self._deliver('*', topic, payloads)
+        return delivered
+
+
+_default_bus = None
+_default_bus_lock = threading.Lock()
+
+
+def get_event_bus():
+    """The application-wide event bus."""
+    global _default_bus
+    if _default_bus is None:
+        with _default_bus_lock:
+            if _default_bus is None:
+                _default_bus = EventBus()
+    return _default_bus
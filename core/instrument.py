@@ -0,0 +1,285 @@
+"""Named timers, counters and histograms for hot paths in the UI and bots.
+
+    from core import instrument
+
+    @instrument.timed('ui.change_page')
+    def change_page(...): ...
+
+    with instrument.timer('bots.dequeue'):
+        ...
+    instrument.count('bots.sessions')
+
+Everything is off unless enable() was called (or YARA_INSTRUMENT=1 is set).
+While off, a timed function costs one flag check on top of the call,
+timer() returns a shared do-nothing context manager and count() returns at
+once, so instrumentation can stay in code that runs thousands of times a
+second.
+
+Durations go into log-scale histograms (about 19% wide buckets, so
+percentiles are within that of the truth) plus a short list of the most
+recent operations, from which the slowest are reported. Periodic readings
+such as frame intervals go through sample() instead, which feeds the
+histogram only, so they don't push real operations out of that list.
+Gauges hold the latest value of something (widget count, the last loop
+latency). snapshot() gathers
+it all into one dict; the performance overlay
+(ui.components.perf_overlay) shows it and JsonlExporter appends it to a
+file every few seconds.
+"""
+import asyncio
+import functools
+import heapq
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+
+# Bucket i covers [BASE ** i, BASE ** (i + 1)) microseconds
+BUCKET_BASE = 2 ** 0.25
+_LOG_BASE = math.log(BUCKET_BASE)
+
+RECENT_OPERATIONS = 512
+
+_enabled = False
+
+
+class Histogram:
+    __slots__ = ('count', 'total', 'min', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.buckets = {}
+
+    def record(self, ms):
+        self.count += 1
+        self.total += ms
+        if ms < self.min:
+            self.min = ms
+        if ms > self.max:
+            self.max = ms
+        index = int(math.log(ms * 1000.0) / _LOG_BASE) if ms > 0.001 else 0
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def percentile(self, fraction):
+        if not self.count:
+            return 0.0
+        wanted = fraction * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= wanted:
+                # Bucket midpoint (geometric), clamped to what was observed
+                value = BUCKET_BASE ** (index + 0.5) / 1000.0
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def as_dict(self):
+        return {'count': self.count, 'mean': self.total / self.count if self.count else 0.0,
+                'min': self.min if self.count else 0.0, 'max': self.max,
+                'p50': self.percentile(0.5), 'p90': self.percentile(0.9),
+                'p99': self.percentile(0.99)}
+
+
+class Instruments:
+    def __init__(self):
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self.recent = deque(maxlen=RECENT_OPERATIONS)    # (ms, name, time.time())
+        self._lock = threading.Lock()
+
+    def record(self, name, ms, recent=True):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(name, Histogram())
+        histogram.record(ms)
+        if recent:
+            self.recent.append((ms, name, time.time()))
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def gauge(self, name, value):
+        self.gauges[name] = value
+
+    def slowest(self, limit=10):
+        return heapq.nlargest(limit, list(self.recent))
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.histograms.clear()
+            self.recent.clear()
+
+    def snapshot(self, slowest=10):
+        with self._lock:
+            histograms = list(self.histograms.items())
+        return {
+            'time': time.time(),
+            'counters': dict(self.counters),
+            'gauges': dict(self.gauges),
+            'timers': {name: histogram.as_dict() for name, histogram in sorted(histograms)},
+            'slowest': [{'name': name, 'ms': ms, 'time': at} for ms, name, at in self.slowest(slowest)],
+        }
+
+
+instruments = Instruments()
+
+
+def enable(on=True):
+    global _enabled
+    _enabled = on
+
+
+def enabled():
+    return _enabled
+
+
+def count(name, amount=1):
+    if _enabled:
+        instruments.count(name, amount)
+
+
+def gauge(name, value):
+    if _enabled:
+        instruments.gauge(name, value)
+
+
+def record(name, ms):
+    """Add a duration measured elsewhere (e.g. a session's elapsed time)."""
+    if _enabled:
+        instruments.record(name, ms)
+
+
+def sample(name, ms):
+    """Add a periodic reading to the `name` histogram only."""
+    if _enabled:
+        instruments.record(name, ms, recent=False)
+
+
+class _Timer:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        instruments.record(self.name, (time.perf_counter() - self.start) * 1000.0)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(name):
+    """Context manager timing its block as `name` (a no-op while disabled)."""
+    return _Timer(name) if _enabled else _NULL_TIMER
+
+
+def timed(name):
+    """Decorator timing every call as `name`."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                instruments.record(name, (time.perf_counter() - start) * 1000.0)
+        return wrapper
+    return decorate
+
+
+async def watch_loop_latency(name, interval=0.25):
+    """Sample how late the running asyncio loop wakes a sleeper, forever."""
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        if _enabled:
+            late = max(0.0, loop.time() - started - interval) * 1000.0
+            instruments.record(name, late, recent=False)
+            instruments.gauge(name, late)
+
+
+class JsonlExporter:
+    """Appends a snapshot line to `path` every `interval` seconds from a thread."""
+
+    DEFAULT_INTERVAL = 5.0
+
+    def __init__(self, path, interval=None, source=instruments):
+        self.path = path
+        self.interval = interval or self.DEFAULT_INTERVAL
+        self.source = source
+        self.thread = None
+        self._stop = threading.Event()
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name='metrics-export', daemon=True)
+            self.thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.write()
+
+    def write(self):
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(self.source.snapshot(), ensure_ascii=False) + '\n')
+        except OSError:
+            pass
+
+    def stop(self):
+        self._stop.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+            # The last partial interval is worth keeping too
+            self.write()
+
+
+_exporter = None
+
+
+def configure_from_env(environ=None):
+    """YARA_INSTRUMENT=1 turns instruments on; YARA_METRICS_FILE=<path> also
+    starts a JSONL exporter writing there."""
+    global _exporter
+    environ = os.environ if environ is None else environ
+    path = environ.get('YARA_METRICS_FILE')
+    if environ.get('YARA_INSTRUMENT') not in (None, '', '0') or path:
+        enable()
+    if path and _exporter is None:
+        _exporter = JsonlExporter(path).start()
+
+
+def stop_exporter():
+    global _exporter
+    if _exporter is not None:
+        _exporter.stop()
+        _exporter = None
@@ -0,0 +1,183 @@
+"""Fixed-capacity in-memory log for the live console page.
+
+Records go into a ring of parallel arrays, so memory stays flat no matter
+how long the app runs; once full, each new record overwrites the oldest.
+Level, bot and bank each keep an index of record sequence numbers per value,
+so a filtered view is built from the matching index instead of a scan over
+the whole ring.
+
+Sequence numbers (`seq`) grow forever; a record is still available while
+seq >= first_seq.
+"""
+import heapq
+import logging
+import threading
+from array import array
+from collections import deque
+
+from core.events import LOG_APPENDED, get_event_bus
+
+# Logger all app modules log under
+LOGGER_NAME = 'yara'
+
+INDEXED_FIELDS = ('level', 'bot', 'bank')
+
+
+class LogRing:
+    DEFAULT_CAPACITY = 100000
+
+    def __init__(self, capacity=None):
+        self.capacity = capacity or self.DEFAULT_CAPACITY
+        self.next_seq = 0
+        self.times = array('d', bytes(8 * self.capacity))
+        self.levels = array('B', bytes(self.capacity))
+        self.bots = array('H', bytes(2 * self.capacity))
+        self.banks = array('H', bytes(2 * self.capacity))
+        self.messages = [None] * self.capacity
+
+        # Bot and bank names are stored as codes; code 0 is "none"
+        self.names = {'bot': [''], 'bank': ['']}
+        self.codes = {'bot': {'': 0}, 'bank': {'': 0}}
+        self.index = {field: {} for field in INDEXED_FIELDS}     # field -> value -> deque of seqs
+        self._trim_every = max(1, self.capacity // 8)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self.next_seq - self.first_seq
+
+    @property
+    def first_seq(self):
+        return max(0, self.next_seq - self.capacity)
+
+    def _code(self, field, name):
+        codes = self.codes[field]
+        code = codes.get(name)
+        if code is None:
+            code = codes[name] = len(self.names[field])
+            self.names[field].append(name)
+        return code
+
+    def append(self, created, level, message, bot='', bank=''):
+        with self._lock:
+            seq = self.next_seq
+            position = seq % self.capacity
+            bot_code = self._code('bot', bot or '')
+            bank_code = self._code('bank', bank or '')
+            self.times[position] = created
+            self.levels[position] = level
+            self.bots[position] = bot_code
+            self.banks[position] = bank_code
+            self.messages[position] = message
+
+            index = self.index
+            index['level'].setdefault(level, deque()).append(seq)
+            index['bot'].setdefault(bot_code, deque()).append(seq)
+            index['bank'].setdefault(bank_code, deque()).append(seq)
+            self.next_seq = seq + 1
+            if self.next_seq % self._trim_every == 0:
+                self._trim_indexes()
+            return seq
+
+    def _trim_indexes(self):
+        # Overwritten records leave the indexes in bulk, keeping them bounded
+        # by capacity plus one trim interval
+        first = self.first_seq
+        for values in self.index.values():
+            for seqs in values.values():
+                while seqs and seqs[0] < first:
+                    seqs.popleft()
+
+    def record(self, seq):
+        """Return (created, level, bot, bank, message), or None once overwritten."""
+        if not self.first_seq <= seq < self.next_seq:
+            return None
+        position = seq % self.capacity
+        return (self.times[position], self.levels[position],
+                self.names['bot'][self.bots[position]], self.names['bank'][self.banks[position]],
+                self.messages[position])
+
+    def value_names(self, field):
+        """Bot or bank names seen so far (without the empty name)."""
+        return self.names[field][1:]
+
+    def compile_filter(self, min_level=None, bot=None, bank=None):
+        """Turn names into the code form `matches` and `select` work on."""
+        return (min_level,
+                None if bot is None else self.codes['bot'].get(bot, -1),
+                None if bank is None else self.codes['bank'].get(bank, -1))
+
+    def matches(self, seq, compiled):
+        min_level, bot_code, bank_code = compiled
+        position = seq % self.capacity
+        return ((min_level is None or self.levels[position] >= min_level)
+                and (bot_code is None or self.bots[position] == bot_code)
+                and (bank_code is None or self.banks[position] == bank_code))
+
+    def select(self, compiled, since=None):
+        """Sequence numbers matching `compiled` (from compile_filter), oldest first."""
+        min_level, bot_code, bank_code = compiled
+        with self._lock:
+            first = max(self.first_seq, since or 0)
+            end = self.next_seq
+            candidates = None
+            # Start from the most selective single-value index
+            for field, code in (('bot', bot_code), ('bank', bank_code)):
+                if code is not None:
+                    seqs = self.index[field].get(code, ())
+                    if candidates is None or len(seqs) < len(candidates):
+                        candidates = seqs
+            if candidates is None and min_level is not None:
+                levels = [seqs for level, seqs in self.index['level'].items() if level >= min_level]
+                candidates = list(heapq.merge(*levels))
+            if candidates is None:
+                return list(range(first, end))
+            return [seq for seq in candidates
+                    if first <= seq < end and self.matches(seq, compiled)]
+
+
+class RingLogHandler(logging.Handler):
+    """Feeds log records into a LogRing and announces them on the event bus.
+
+    Bot and bank come from `extra={'bot': ..., 'bank': ...}` on the record.
+    The bus event is keyed, so any burst of lines costs one UI update.
+    """
+
+    def __init__(self, ring, bus=None, level=logging.NOTSET):
+        super().__init__(level)
+        self.ring = ring
+        self.bus = bus
+
+    def emit(self, record):
+        try:
+            message = record.getMessage()
+            if record.exc_info:
+                message += '\n' + logging.Formatter().formatException(record.exc_info)
+            seq = self.ring.append(record.created, record.levelno, message,
+                                   getattr(record, 'bot', ''), getattr(record, 'bank', ''))
+        except Exception:
+            self.handleError(record)
+            return
+        if self.bus is not None:
+            self.bus.publish(LOG_APPENDED, seq, key=id(self.ring))
+
+
+_default_ring = None
+
+
+def get_log_ring():
+    global _default_ring
+    if _default_ring is None:
+        _default_ring = LogRing()
+    return _default_ring
+
+
+def install_log_handler(level=logging.INFO):
+    """Route the app's logs into the shared ring (idempotent)."""
+    logger = logging.getLogger(LOGGER_NAME)
+    for handler in logger.handlers:
+        if isinstance(handler, RingLogHandler):
+            return handler
+    handler = RingLogHandler(get_log_ring(), get_event_bus())
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    return handler
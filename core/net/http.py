@@ -0,0 +1,134 @@
+"""Minimal HTTP/1.1 framing over asyncio streams.
+
+Bank portals only need plain request/response exchanges, so this covers
+Content-Length and chunked bodies and keep-alive semantics, nothing more.
+"""
+import asyncio
+import json
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+Response = namedtuple('Response', 'status reason headers body')
+
+MAX_HEADER_LINES = 100
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+class HttpError(Exception):
+    pass
+
+
+def split_url(url):
+    """Return (scheme, host, port, target) for an http(s) URL."""
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https'):
+        raise HttpError(f"unsupported URL scheme: {url}")
+    port = parts.port or (443 if parts.scheme == 'https' else 80)
+    target = parts.path or '/'
+    if parts.query:
+        target += '?' + parts.query
+    return parts.scheme, parts.hostname, port, target
+
+
+def host_header(scheme, host, port):
+    """Host header value: `host`, plus the port unless it is the scheme's default."""
+    if ':' in host:
+        host = f"[{host}]"     # IPv6 literal
+    return host if DEFAULT_PORTS.get(scheme) == port else f"{host}:{port}"
+
+
+def encode_request(method, host, target, headers=None, body=b''):
+    """Request bytes; `host` is the Host header value (see host_header())."""
+    if isinstance(body, (dict, list)):
+        body = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        headers = dict(headers or {}, **{'Content-Type': 'application/json'})
+    elif isinstance(body, str):
+        body = body.encode('utf-8')
+    lines = [f"{method} {target} HTTP/1.1", f"Host: {host}"]
+    for name, value in (headers or {}).items():
+        lines.append(f"{name}: {value}")
+    if body or method in ('POST', 'PUT', 'PATCH'):
+        lines.append(f"Content-Length: {len(body)}")
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body
+
+
+async def read_headers(reader):
+    headers = []
+    for _ in range(MAX_HEADER_LINES):
+        line = await reader.readline()
+        if not line:
+            raise HttpError("connection closed while reading headers")
+        if line in (b'\r\n', b'\n'):
+            return headers
+        name, _, value = line.decode('latin-1').partition(':')
+        headers.append((name.strip().lower(), value.strip()))
+    raise HttpError("too many header lines")
+
+
+async def read_body(reader, headers, method='GET', status=200):
+    header_map = dict(headers)
+    if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+        return b''
+    if header_map.get('transfer-encoding', '').lower() == 'chunked':
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            if size == 0:
+                await reader.readline()
+                return b''.join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+    if 'content-length' in header_map:
+        return await reader.readexactly(int(header_map['content-length']))
+    # No framing: body runs until the server closes the connection
+    return await reader.read()
+
+
+async def read_response(reader, method='GET'):
+    status_line = await reader.readline()
+    if not status_line:
+        raise HttpError("connection closed before response")
+    parts = status_line.decode('latin-1').rstrip('\r\n').split(' ', 2)
+    if len(parts) < 2 or not parts[0].startswith('HTTP/'):
+        raise HttpError(f"malformed status line: {status_line!r}")
+    status = int(parts[1])
+    reason = parts[2] if len(parts) > 2 else ''
+    headers = await read_headers(reader)
+    body = await read_body(reader, headers, method, status)
+    return Response(status, reason, headers, body)
+
+
+def keeps_alive(response):
+    """Whether the connection may be reused after `response`."""
+    for name, value in response.headers:
+        if name == 'connection':
+            return value.lower() != 'close'
+    return True
+
+
+def header(response, name, default=None):
+    name = name.lower()
+    for key, value in response.headers:
+        if key == name:
+            return value
+    return default
+
+
+def json_body(response):
+    return json.loads(response.body.decode('utf-8')) if response.body else None
+
+
+async def fetch(url, method='GET', headers=None, body=b'', ssl=None, timeout=None):
+    """One-shot request on a fresh connection that is closed afterwards."""
+    scheme, host, port, target = split_url(url)
+    if scheme == 'https' and ssl is None:
+        ssl = True
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(host, port, ssl=ssl if scheme == 'https' else None), timeout)
+    try:
+        headers = dict(headers or {}, Connection='close')
+        writer.write(encode_request(method, host_header(scheme, host, port), target, headers, body))
+        await writer.drain()
+        return await asyncio.wait_for(read_response(reader, method), timeout)
+    finally:
+        writer.close()
@@ -0,0 +1,298 @@
+"""Shared keep-alive HTTP transport for the bank-portal bots.
+
+Every bot session goes through one Transport. It keeps a connection pool per
+(scheme, host, port) with a concurrency cap, reuses TLS sessions across
+connections to the same host and leaves cookies to per-applicant CookieJars,
+so connection ownership never leaks state between applicants.
+
+A Transport belongs to the event loop that first uses it (the bot engine's).
+"""
+import asyncio
+import ssl
+import time
+from collections import deque
+from http.cookies import SimpleCookie
+
+from core.net.http import (encode_request, host_header, read_response, keeps_alive, split_url,
+                           HttpError)
+
+# Safe to send twice (RFC 9110 9.2.2)
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE', 'TRACE'})
+
+
+class CookieJar:
+    """Cookies of one applicant, keyed by host. Never shared between sessions."""
+
+    def __init__(self):
+        self._cookies = {}
+
+    def header(self, host):
+        cookies = self._cookies.get(host)
+        if not cookies:
+            return None
+        return '; '.join(f"{name}={value}" for name, value in cookies.items())
+
+    def update(self, host, response):
+        for name, value in response.headers:
+            if name == 'set-cookie':
+                parsed = SimpleCookie()
+                parsed.load(value)
+                jar = self._cookies.setdefault(host, {})
+                for key, morsel in parsed.items():
+                    if morsel['max-age'] == '0':
+                        jar.pop(key, None)
+                    else:
+                        jar[key] = morsel.value
+
+    def clear(self):
+        self._cookies.clear()
+
+
+class TLSSessionContext(ssl.SSLContext):
+    """Client SSLContext that resumes the last TLS session per server name.
+
+    asyncio creates its SSLObject through wrap_bio without a session argument,
+    so the cached session is injected here.
+    """
+
+    def __new__(cls, *args, **kwargs):
+        return super().__new__(cls, ssl.PROTOCOL_TLS_CLIENT)
+
+    def __init__(self, cafile=None):
+        super().__init__()
+        self.sessions = {}
+        if cafile:
+            self.load_verify_locations(cafile)
+        else:
+            self.load_default_certs()
+
+    def wrap_bio(self, incoming, outgoing, server_side=False, server_hostname=None, session=None):
+        if session is None and not server_side:
+            session = self.sessions.get(server_hostname)
+        return super().wrap_bio(incoming, outgoing, server_side, server_hostname, session)
+
+    def remember(self, server_hostname, ssl_object):
+        """Cache the connection's session; returns whether it was resumed."""
+        if ssl_object is None:
+            return False
+        session = ssl_object.session
+        if session is not None:
+            self.sessions[server_hostname] = session
+        return ssl_object.session_reused
+
+
+class _Connection:
+    __slots__ = ('reader', 'writer', 'created', 'last_used', 'requests')
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.created = self.last_used = time.monotonic()
+        self.requests = 0
+
+    def usable(self, idle_timeout):
+        return (not self.reader.at_eof() and not self.writer.is_closing()
+                and time.monotonic() - self.last_used < idle_timeout)
+
+    def close(self):
+        self.writer.close()
+
+
+class HostPool:
+    def __init__(self, scheme, host, port, limit, ssl_context, idle_timeout, connect_timeout):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.limit = limit
+        self.ssl_context = ssl_context if scheme == 'https' else None
+        self.idle_timeout = idle_timeout
+        self.connect_timeout = connect_timeout
+
+        self.idle = deque()
+        self.slots = asyncio.Semaphore(limit)
+        self.in_use = 0
+        self.waiting = 0
+        self.opened = 0
+        self.reused = 0
+        self.closed = 0
+        self.tls_resumed = 0
+        self.requests = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    async def acquire(self):
+        start = time.monotonic()
+        self.waiting += 1
+        try:
+            await self.slots.acquire()
+        finally:
+            self.waiting -= 1
+        wait = time.monotonic() - start
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+
+        try:
+            while self.idle:
+                connection = self.idle.pop()   # most recently used first
+                if connection.usable(self.idle_timeout):
+                    self.reused += 1
+                    self.in_use += 1
+                    return connection, True
+                self._discard(connection)
+
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port, ssl=self.ssl_context,
+                                        server_hostname=self.host if self.ssl_context else None),
+                self.connect_timeout)
+            if self.ssl_context is not None:
+                self.tls_resumed += self.ssl_context.remember(self.host, writer.get_extra_info('ssl_object'))
+            self.opened += 1
+            self.in_use += 1
+            return _Connection(reader, writer), False
+        except BaseException:
+            self.slots.release()
+            raise
+
+    def release(self, connection, reusable):
+        self.in_use -= 1
+        connection.last_used = time.monotonic()
+        if self.ssl_context is not None:
+            # TLS 1.3 tickets arrive after the handshake; pick up the latest one
+            self.ssl_context.remember(self.host, connection.writer.get_extra_info('ssl_object'))
+        if reusable and not connection.writer.is_closing():
+            self.idle.append(connection)
+        else:
+            self._discard(connection)
+        self.slots.release()
+
+    def _discard(self, connection):
+        self.closed += 1
+        connection.close()
+
+    def close(self):
+        while self.idle:
+            self._discard(self.idle.pop())
+
+    def stats(self):
+        acquired = self.opened + self.reused
+        return {
+            'in_use': self.in_use,
+            'idle': len(self.idle),
+            'waiting': self.waiting,
+            'limit': self.limit,
+            'opened': self.opened,
+            'reused': self.reused,
+            'closed': self.closed,
+            'tls_resumed': self.tls_resumed,
+            'requests': self.requests,
+            'wait_ms_avg': self.wait_total * 1000.0 / acquired if acquired else 0.0,
+            'wait_ms_max': self.wait_max * 1000.0,
+        }
+
+
+class Transport:
+    DEFAULT_HOST_LIMIT = 32
+    IDLE_TIMEOUT = 30.0
+    CONNECT_TIMEOUT = 10.0
+
+    def __init__(self, host_limit=None, idle_timeout=None, ssl_context=None):
+        self.host_limit = host_limit or self.DEFAULT_HOST_LIMIT
+        self.host_limits = {}
+        self.idle_timeout = idle_timeout or self.IDLE_TIMEOUT
+        self.ssl_context = ssl_context
+        self.pools = {}
+
+    def set_host_limit(self, host, limit):
+        """Concurrency cap for `host`; applies to pools created afterwards."""
+        self.host_limits[host] = limit
+
+    def pool_for(self, scheme, host, port):
+        key = (scheme, host, port)
+        pool = self.pools.get(key)
+        if pool is None:
+            if scheme == 'https' and self.ssl_context is None:
+                self.ssl_context = TLSSessionContext()
+            pool = self.pools[key] = HostPool(
+                scheme, host, port, self.host_limits.get(host, self.host_limit),
+                self.ssl_context, self.idle_timeout, self.CONNECT_TIMEOUT)
+        return pool
+
+    async def request(self, method, url, headers=None, body=b'', jar=None, timeout=None):
+        scheme, host, port, target = split_url(url)
+        pool = self.pool_for(scheme, host, port)
+        headers = dict(headers or {})
+        if jar is not None:
+            cookie = jar.header(host)
+            if cookie:
+                headers['Cookie'] = cookie
+        payload = encode_request(method, host_header(scheme, host, port), target, headers, body)
+
+        response = await asyncio.wait_for(self._exchange(pool, method, payload), timeout)
+        if jar is not None:
+            jar.update(host, response)
+        return response
+
+    async def _exchange(self, pool, method, payload):
+        # A pooled connection may have been closed by the server while idle;
+        # that shows up as EOF before any response and is retried once. Once
+        # the request is written, only idempotent methods are retried: the
+        # bank may already have acted on a POST whose response was lost.
+        for attempt in (0, 1):
+            connection, reused = await pool.acquire()
+            reusable = False
+            written = False
+            try:
+                if connection.reader.at_eof() or connection.writer.is_closing():
+                    raise ConnectionResetError("connection closed while idle")
+                written = True
+                connection.writer.write(payload)
+                await connection.writer.drain()
+                response = await read_response(connection.reader, method)
+            except (ConnectionError, HttpError, asyncio.IncompleteReadError):
+                if reused and attempt == 0 and (not written or method in IDEMPOTENT_METHODS):
+                    continue
+                raise
+            else:
+                connection.requests += 1
+                pool.requests += 1
+                reusable = keeps_alive(response)
+                return response
+            finally:
+                pool.release(connection, reusable)
+
+    def stats(self):
+        """Per-host pool statistics, safe to read from another thread."""
+        return {f"{scheme}://{host}:{port}": pool.stats()
+                for (scheme, host, port), pool in dict(self.pools).items()}
+
+    def close(self):
+        for pool in self.pools.values():
+            pool.close()
+
+
+_default_transport = None
+
+
+def get_transport():
+    """The transport shared by all bots (lives on the bot engine loop)."""
+    global _default_transport
+    if _default_transport is None:
+        from core.settings import get_settings
+        settings = get_settings()
+        _default_transport = Transport(settings['net.host_limit'])
+        settings.add_listener(_follow_host_limit)
+    return _default_transport
+
+
+def _follow_host_limit(changes):
+    # Pools already open keep their limit; new hosts get the new one
+    if 'net.host_limit' in changes and _default_transport is not None:
+        _default_transport.host_limit = changes['net.host_limit']
+
+
+def close_transport():
+    """Close the shared transport's idle connections; call on its loop."""
+    global _default_transport
+    if _default_transport is not None:
+        _default_transport.close()
+        _default_transport = None
@@ -0,0 +1,175 @@
+"""Announcements feed behind the news page.
+
+The last good copy of the feed lives on disk, so the page renders from it
+at startup without waiting on the network. A background task refreshes it
+on a jittered schedule with conditional requests (If-None-Match /
+If-Modified-Since): while nothing changed, the server answers 304 and no
+body crosses the wire. When something did change, only the difference is
+published on the event bus.
+
+The feed is JSON, either a list of items or {"items": [...]}, where each
+item has an "id" and optionally "title", "body" and "published".
+"""
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+import zlib
+from collections import namedtuple
+
+from core.events import NEWS_UPDATED, get_event_bus
+from core.net.http import HttpError, header
+from core.paths import cache_dir
+
+# `items` is the whole feed in display order; the rest are item ids
+NewsDiff = namedtuple('NewsDiff', 'items added changed removed')
+
+ITEM_FIELDS = ('id', 'title', 'body', 'published')
+
+log = logging.getLogger('yara.news')
+
+
+def parse_feed(body):
+    data = json.loads(body)
+    if isinstance(data, dict):
+        data = data.get('items', [])
+    items = []
+    for raw in data:
+        if not isinstance(raw, dict) or raw.get('id') is None:
+            continue
+        items.append({field: str(raw.get(field) or '') for field in ITEM_FIELDS})
+    return tuple(items)
+
+
+def diff_items(old, new):
+    old_by_id = {item['id']: item for item in old}
+    new_ids = {item['id'] for item in new}
+    added = [item['id'] for item in new if item['id'] not in old_by_id]
+    changed = [item['id'] for item in new
+               if item['id'] in old_by_id and old_by_id[item['id']] != item]
+    removed = [item_id for item_id in old_by_id if item_id not in new_ids]
+    order_changed = [item['id'] for item in old if item['id'] in new_ids] != \
+        [item['id'] for item in new if item['id'] in old_by_id]
+    if not (added or changed or removed or order_changed):
+        return None
+    return NewsDiff(new, added, changed, removed)
+
+
+class NewsFeed:
+    """One feed URL with its validators and on-disk copy.
+
+    `items` is replaced, never mutated, so the GUI thread can read it while
+    the refresh task runs on the engine loop.
+    """
+
+    DEFAULT_INTERVAL = 300.0
+    DEFAULT_JITTER = 0.2
+    TIMEOUT = 15.0
+
+    def __init__(self, url, cache_path=None):
+        self.url = url
+        self.cache_path = cache_path or os.path.join(
+            cache_dir('news'), f"{zlib.crc32(url.encode('utf-8')):08x}.json")
+        self.items = ()
+        self.etag = None
+        self.last_modified = None
+        self.fetched_at = None
+        self.stats = {'requests': 0, 'not_modified': 0, 'updated': 0, 'unchanged': 0, 'errors': 0}
+        self.load_cache()
+
+    def load_cache(self):
+        try:
+            with open(self.cache_path, encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if cached.get('url') != self.url:
+            return False
+        self.items = tuple(cached.get('items', ()))
+        self.etag = cached.get('etag')
+        self.last_modified = cached.get('last_modified')
+        self.fetched_at = cached.get('fetched_at')
+        return True
+
+    def save_cache(self):
+        payload = {'url': self.url, 'etag': self.etag, 'last_modified': self.last_modified,
+                   'fetched_at': self.fetched_at, 'items': list(self.items)}
+        try:
+            tmp_path = self.cache_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            # Only costs a full download on the next launch
+            pass
+
+    async def refresh(self, transport=None):
+        """Fetch the feed if it changed; returns a NewsDiff or None."""
+        if transport is None:
+            from core.net.transport import get_transport
+            transport = get_transport()
+        headers = {'Accept': 'application/json'}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+
+        self.stats['requests'] += 1
+        response = await transport.request('GET', self.url, headers, timeout=self.TIMEOUT)
+        self.fetched_at = time.time()
+        if response.status == 304:
+            self.stats['not_modified'] += 1
+            return None
+        if response.status != 200:
+            raise HttpError(f"GET {self.url}: HTTP {response.status}")
+
+        items = parse_feed(response.body)
+        self.etag = header(response, 'etag')
+        self.last_modified = header(response, 'last-modified')
+        diff = diff_items(self.items, items)
+        self.items = items
+        self.save_cache()
+        self.stats['updated' if diff else 'unchanged'] += 1
+        return diff
+
+    async def run(self, bus, interval=None, jitter=None):
+        """Refresh forever, publishing changes on `bus`."""
+        interval = interval or self.DEFAULT_INTERVAL
+        jitter = self.DEFAULT_JITTER if jitter is None else jitter
+        while True:
+            try:
+                diff = await self.refresh()
+                if diff is not None:
+                    bus.publish(NEWS_UPDATED, diff, key=self.url)
+            except (HttpError, OSError, ValueError, asyncio.TimeoutError) as e:
+                self.stats['errors'] += 1
+                log.warning("news refresh failed: %s", e)
+            # Jitter keeps a room full of workstations from polling in lockstep
+            await asyncio.sleep(interval * random.uniform(1.0 - jitter, 1.0 + jitter))
+
+
+_default_feed = None
+
+
+def get_news_feed():
+    """The configured feed (news.url setting), or None when there is none."""
+    global _default_feed
+    if _default_feed is None:
+        from core.settings import get_settings
+        url = get_settings()['news.url']
+        if url:
+            _default_feed = NewsFeed(url)
+    return _default_feed
+
+
+def start_news_refresh():
+    """Start refreshing the configured feed on the bot engine loop."""
+    feed = get_news_feed()
+    if feed is None:
+        return None
+    from core.bots.engine import get_engine
+    from core.settings import get_settings
+    interval = get_settings()['news.interval']
+    return get_engine().run_coroutine(feed.run(get_event_bus(), interval))
@@ -0,0 +1,343 @@
+"""Applicant notifications (SMS-style) sent in batches through providers.
+
+Messages go into a durable outbox first: a JobQueue in data_dir()/outbox.db
+where a job's `bot` is the provider name, its `bank` the recipient and its
+payload the text and dedup key. So pending messages survive restarts and
+failed sends retry with backoff, exactly like bot jobs (core.bots.jobs).
+
+The dispatcher runs on the bot engine loop with one pump per provider. A
+pump leases up to `provider.max_batch` messages and sends them in a single
+API call, with several calls in flight at once. The number in flight
+adapts: it grows by one after a quick batch and halves when a batch is slow,
+fails or the provider answers "busy" (HTTP 429/503, honouring Retry-After).
+A slow provider therefore gets fewer concurrent calls rather than a pile of
+timeouts, and the backlog waits on disk.
+
+notify() drops a message whose dedup key (by default provider, recipient and
+text) was already accepted within `dedup_window` seconds; the window is
+seeded from the outbox on start, so a restart doesn't re-send a blast.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from core.bots.jobs import JobQueue
+from core.events import NOTIFY_STATS, get_event_bus
+from core.net.http import HttpError, header, json_body
+from core.paths import data_dir
+
+# The provider configured through notify.url
+SMS = 'sms'
+
+log = logging.getLogger('yara.notify')
+
+
+class ProviderBusy(Exception):
+    """The provider asked us to slow down; nothing in the batch was sent."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class Provider:
+    """A message gateway. Subclasses implement send_batch().
+
+    `max_batch` is how many messages one API call may carry, `max_inflight`
+    the most concurrent calls the dispatcher will make, and a batch taking
+    longer than `target_latency` seconds counts as a sign of overload.
+    """
+
+    name = 'provider'
+    max_batch = 100
+    max_inflight = 8
+    target_latency = 2.0
+    timeout = 30.0
+
+    async def send_batch(self, messages):
+        """Send [(message_id, recipient, text)]; return one error string (or
+        None for success) per message, in order. Raise ProviderBusy or an
+        I/O error when the whole call failed."""
+        raise NotImplementedError
+
+
+class HttpProvider(Provider):
+    """JSON-over-HTTP gateway (see core.testing.sms_provider for the protocol).
+
+    POST {"messages": [{"id", "to", "text"}]} answers
+    {"results": [{"id", "ok", "error"}]}.
+    """
+
+    def __init__(self, name, url, max_batch=None, transport=None):
+        self.name = name
+        self.url = url
+        self.max_batch = max_batch or self.max_batch
+        self.transport = transport
+
+    async def send_batch(self, messages):
+        if self.transport is None:
+            from core.net.transport import get_transport
+            self.transport = get_transport()
+        body = {'messages': [{'id': message_id, 'to': recipient, 'text': text}
+                             for message_id, recipient, text in messages]}
+        response = await self.transport.request('POST', self.url, body=body, timeout=self.timeout)
+        if response.status in (429, 503):
+            retry_after = header(response, 'retry-after')
+            raise ProviderBusy(f"HTTP {response.status}",
+                               float(retry_after) if retry_after else None)
+        if response.status != 200:
+            raise HttpError(f"POST {self.url}: HTTP {response.status}")
+        try:
+            body = json_body(response)
+        except ValueError as e:
+            raise HttpError(f"POST {self.url}: invalid JSON: {e}") from e
+        if not isinstance(body, dict):
+            # An empty or truncated answer says nothing about the messages; retry them
+            raise HttpError(f"POST {self.url}: no results in response")
+        results = {str(result.get('id')): result for result in body.get('results') or ()
+                   if isinstance(result, dict)}
+        errors = []
+        for message_id, _, _ in messages:
+            result = results.get(str(message_id))
+            if result is None:
+                errors.append("missing from provider response")
+            else:
+                errors.append(None if result.get('ok') else str(result.get('error') or 'rejected'))
+        return errors
+
+
+class _Window:
+    """Additive-increase, multiplicative-decrease cap on calls in flight."""
+
+    def __init__(self, maximum):
+        self.maximum = maximum
+        self.limit = 1.0
+        self.inflight = 0
+        self.paused_until = 0.0
+
+    def grow(self):
+        self.limit = min(self.maximum, self.limit + 1.0)
+
+    def shrink(self):
+        self.limit = max(1.0, self.limit / 2.0)
+
+    def has_room(self):
+        return self.inflight < int(self.limit) and time.monotonic() >= self.paused_until
+
+
+class NotificationDispatcher:
+    DEFAULT_DEDUP_WINDOW = 600.0
+    POLL_INTERVAL = 1.0
+
+    def __init__(self, outbox, providers, dedup_window=None, bus=None):
+        self.outbox = outbox
+        self.providers = {provider.name: provider for provider in providers}
+        self.dedup_window = dedup_window or self.DEFAULT_DEDUP_WINDOW
+        self.bus = bus
+        self.windows = {name: _Window(provider.max_inflight) for name, provider in self.providers.items()}
+        self.counters = {name: {'sent': 0, 'failed': 0, 'batches': 0, 'busy': 0}
+                         for name in self.providers}
+        self.deduplicated = 0
+        self.started_at = time.monotonic()
+
+        self._seen = OrderedDict()         # dedup key -> accepted at (time.time())
+        self._seen_lock = threading.Lock()
+        self._wakeups = {}                 # provider name -> asyncio.Event, loop thread only
+        self.loop = None
+        self._seed_dedup()
+        outbox.add_listener(self._on_enqueued)
+
+    # Producers (any thread)
+
+    def _seed_dedup(self):
+        for job in self.outbox.recent(time.time() - self.dedup_window):
+            self._seen[job.payload['key']] = job.payload.get('at', 0.0)
+
+    @staticmethod
+    def dedup_key(provider, recipient, text):
+        return f"{provider}:{recipient}:{zlib.crc32(text.encode('utf-8')):08x}"
+
+    def notify(self, provider, recipient, text, key=None):
+        """Queue one message; returns its id, or None if it was a duplicate."""
+        ids = self.notify_many([(provider, recipient, text, key)])
+        return ids[0] if ids else None
+
+    def notify_many(self, messages):
+        """Queue (provider, recipient, text, key) messages in one commit.
+
+        `key` may be None for the default dedup key. Returns the ids of the
+        messages accepted; duplicates within the window are dropped. Raises
+        KeyError for an unknown provider before queueing anything, and keys
+        are only remembered once their messages are committed, so a failed
+        call can simply be retried.
+        """
+        for provider, _, _, _ in messages:
+            if provider not in self.providers:
+                raise KeyError(f"unknown notification provider: {provider}")
+        now = time.time()
+        horizon = now - self.dedup_window
+        accepted = {}
+        # Held until the commit, so concurrent calls can't both accept a key
+        with self._seen_lock:
+            # Oldest first, so expired keys come off the front
+            while self._seen and next(iter(self._seen.values())) < horizon:
+                self._seen.popitem(last=False)
+            for provider, recipient, text, key in messages:
+                key = key or self.dedup_key(provider, recipient, text)
+                if key in self._seen or key in accepted:
+                    self.deduplicated += 1
+                    continue
+                accepted[key] = (provider, str(recipient), {'text': text, 'key': key, 'at': now})
+            ids = self.outbox.enqueue_many(list(accepted.values()))
+            self._seen.update(dict.fromkeys(accepted, now))
+        return ids
+
+    def _on_enqueued(self):
+        # Outbox writer thread
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._wake_all)
+
+    def _wake_all(self):
+        for event in self._wakeups.values():
+            event.set()
+
+    # Pumps (engine loop)
+
+    async def run(self):
+        """Send queued messages forever, one pump per provider."""
+        self.loop = asyncio.get_running_loop()
+        try:
+            await asyncio.gather(*(self._pump(provider) for provider in self.providers.values()))
+        finally:
+            # Enqueues after the loop is gone must not reach it
+            self.loop = None
+
+    async def _pump(self, provider):
+        window = self.windows[provider.name]
+        wakeup = self._wakeups[provider.name] = asyncio.Event()
+        while True:
+            wakeup.clear()
+            if not window.has_room():
+                delay = max(0.0, window.paused_until - time.monotonic())
+                await self._wait(wakeup, delay or self.POLL_INTERVAL)
+                continue
+            # SQLite off the loop thread; the lease outlives the provider timeout
+            jobs = await self.loop.run_in_executor(
+                None, self.outbox.dequeue, provider.max_batch, provider.timeout * 2, provider.name)
+            if not jobs:
+                await self._wait(wakeup, self.POLL_INTERVAL)
+                continue
+            window.inflight += 1
+            self.loop.create_task(self._send(provider, window, jobs, wakeup))
+
+    @staticmethod
+    async def _wait(event, timeout):
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _send(self, provider, window, jobs, wakeup):
+        counters = self.counters[provider.name]
+        started = time.monotonic()
+        try:
+            errors = await asyncio.wait_for(
+                provider.send_batch([(job.id, job.bank, job.payload['text']) for job in jobs]),
+                provider.timeout)
+        except ProviderBusy as e:
+            counters['busy'] += 1
+            window.shrink()
+            window.paused_until = time.monotonic() + (e.retry_after or 1.0)
+            # Not the messages' fault: back in the queue without an attempt
+            for job in jobs:
+                self.outbox.release(job)
+        except (HttpError, OSError, ValueError, asyncio.TimeoutError) as e:
+            window.shrink()
+            log.warning("%s: batch of %d failed: %s", provider.name, len(jobs), e)
+            for job in jobs:
+                self.outbox.fail(job, f"{type(e).__name__}: {e}")
+        else:
+            counters['batches'] += 1
+            if time.monotonic() - started > provider.target_latency:
+                window.shrink()
+            else:
+                window.grow()
+            for job, error in zip(jobs, errors):
+                if error is None:
+                    self.outbox.complete(job)
+                    counters['sent'] += 1
+                else:
+                    # Rejected by the provider (bad number etc.); retrying won't help
+                    self.outbox.fail(job, error, retry=False)
+                    counters['failed'] += 1
+        finally:
+            window.inflight -= 1
+            wakeup.set()
+        if self.bus is not None:
+            self.bus.publish(NOTIFY_STATS, self.stats(provider.name), key=provider.name)
+
+    def stats(self, provider):
+        window = self.windows[provider]
+        elapsed = time.monotonic() - self.started_at
+        return dict(self.counters[provider], provider=provider, inflight=window.inflight,
+                    limit=int(window.limit), deduplicated=self.deduplicated,
+                    sent_per_sec=self.counters[provider]['sent'] / elapsed if elapsed > 0 else 0.0)
+
+
+def applicant_messages(store, loan_type, make_text, key=None, provider=SMS):
+    """(provider, recipient, text, key) for every `loan_type` applicant with a phone.
+
+    `make_text(applicant)` gets the row as a dict; `key(row, applicant)`, if
+    given, makes the dedup key (e.g. to send each status change once).
+    """
+    rows = store.view(filters={'loan_type': {loan_type}})
+    for row in (range(len(store)) if rows is None else rows):
+        applicant = store.row(row)
+        if applicant['phone']:
+            yield (provider, applicant['phone'], make_text(applicant),
+                   key(row, applicant) if key is not None else None)
+
+
+_default_dispatcher = None
+_default_outbox = None
+
+
+def outbox_path():
+    return os.path.join(data_dir(), 'outbox.db')
+
+
+def get_dispatcher():
+    """The application dispatcher, or None when no provider is configured
+    (notify.url). Starts sending on the bot engine loop on first use."""
+    global _default_dispatcher, _default_outbox
+    if _default_dispatcher is None:
+        from core.settings import get_settings
+        settings = get_settings()
+        if not settings['notify.url']:
+            return None
+        _default_outbox = JobQueue(outbox_path())
+        provider = HttpProvider(SMS, settings['notify.url'], settings['notify.batch'])
+        _default_dispatcher = NotificationDispatcher(
+            _default_outbox, [provider], settings['notify.dedup_window'], get_event_bus())
+        from core.bots.engine import get_engine
+        get_engine().run_coroutine(_default_dispatcher.run())
+    return _default_dispatcher
+
+
+def resume_notifications():
+    """Start sending if a previous run left messages in the outbox."""
+    if _default_dispatcher is None and os.path.exists(outbox_path()):
+        get_dispatcher()
+
+
+def close_notifications():
+    """Close the outbox; call after the engine (and so the pumps) stopped."""
+    global _default_dispatcher, _default_outbox
+    _default_dispatcher = None
+    if _default_outbox is not None:
+        _default_outbox.close()
+        _default_outbox = None
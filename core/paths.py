@@ -0,0 +1,22 @@
+import os
+
+
+def _base_dir(env_var, xdg_var, fallback):
+    base = os.environ.get(env_var)
+    if not base:
+        base = os.path.join(os.environ.get(xdg_var) or os.path.expanduser(fallback), 'yara')
+    return base
+
+
+def cache_dir(*parts):
+    """Directory for rebuildable caches (compiled styles, icons, feeds)."""
+    path = os.path.join(_base_dir('YARA_CACHE_DIR', 'XDG_CACHE_HOME', '~/.cache'), *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def data_dir(*parts):
+    """Directory for state that must survive restarts (databases, outboxes)."""
+    path = os.path.join(_base_dir('YARA_DATA_DIR', 'XDG_DATA_HOME', '~/.local/share'), *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
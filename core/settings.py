@@ -0,0 +1,281 @@
+"""Application settings: typed values in memory, written behind to SQLite.
+
+Every known setting is declared in SCHEMA with its type and default. The
+store loads the database once; after that get() is a dict lookup and never
+touches disk, so bots can read limits and timeouts on hot paths. set()
+updates memory at once and queues the write; a writer thread commits queued
+writes in one transaction once they stop arriving for FLUSH_DELAY seconds
+(at most MAX_DELAY after the first). The database runs in WAL mode with
+full sync, so a crash loses at most the last unflushed changes, never the
+file.
+
+Listeners and the event bus only hear about keys whose value actually
+changed. A schema entry can name an environment variable that overrides the
+stored value for the session without being written back.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from core.events import SETTINGS_CHANGED, get_event_bus
+from core.paths import data_dir
+
+# `key` ending in '.*' declares a family, e.g. bots.bank_limit.<bank>
+Setting = namedtuple('Setting', 'key type default label env')
+
+SCHEMA = (
+    Setting('bots.bank_limit', int, 64, "جلسه هم‌زمان برای هر بانک", None),
+    Setting('bots.bank_limit.*', int, None, "جلسه هم‌زمان برای این بانک", None),
+    Setting('bots.timeout', float, 120.0, "مهلت هر جلسه (ثانیه)", None),
+    Setting('bots.max_attempts', int, 5, "تعداد تلاش برای هر ثبت‌نام", None),
+    Setting('bots.processes', int, 0, "تعداد پردازه‌های ربات (۰ = اجرا درون برنامه)", 'YARA_BOT_PROCESSES'),
+    Setting('bots.recycle_after', int, 500, "جایگزینی پردازه پس از این تعداد جلسه", 'YARA_BOT_RECYCLE_AFTER'),
+    Setting('net.host_limit', int, 32, "اتصال هم‌زمان به هر میزبان", None),
+    Setting('news.url', str, '', "نشانی منبع اخبار", 'YARA_NEWS_URL'),
+    Setting('news.interval', float, 300.0, "فاصله بروزرسانی اخبار (ثانیه)", 'YARA_NEWS_INTERVAL'),
+    Setting('notify.url', str, '', "نشانی سرویس پیامک", 'YARA_NOTIFY_URL'),
+    Setting('notify.batch', int, 100, "تعداد پیام در هر درخواست", None),
+    Setting('notify.dedup_window', float, 600.0, "بازه حذف پیام تکراری (ثانیه)", None),
+    Setting('ui.stall_ms', float, 50.0, "آستانه ثبت توقف رابط (میلی‌ثانیه، ۰ = خاموش)", 'YARA_STALL_MS'),
+)
+
+# Marks a queued write that deletes the row (back to the default)
+_RESET = object()
+
+log = logging.getLogger('yara.settings')
+
+
+def _coerce(setting, value):
+    if setting is None or value is None:
+        return value
+    return setting.type(value)
+
+
+class SettingsStore:
+    FLUSH_DELAY = 0.5
+    MAX_DELAY = 2.0
+    RETRY_DELAY = 5.0
+
+    def __init__(self, path=None, schema=SCHEMA, bus=None, environ=None):
+        self.path = path or os.path.join(data_dir(), 'settings.db')
+        self.schema = {setting.key: setting for setting in schema}
+        self.bus = bus
+        self.values = {key: setting.default for key, setting in self.schema.items()
+                       if not key.endswith('.*')}
+        self.overridden = set()
+        self.listeners = []
+        self.stats = {'sets': 0, 'changed': 0, 'flushes': 0, 'rows_written': 0}
+
+        self._pending = {}                 # key -> value or _RESET, guarded by _lock
+        self._generation = 0               # bumped whenever _pending grows
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._closed = False
+        self._connection = self._connect()
+        self._load(os.environ if environ is None else environ)
+        self._writer = threading.Thread(target=self._write_loop, name='settings-writer', daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        # Opened here, used only by the writer thread afterwards
+        connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=FULL')
+        connection.execute('CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value)')
+        return connection
+
+    def _load(self, environ):
+        for key, value in self._connection.execute('SELECT key, value FROM settings'):
+            try:
+                self.values[key] = _coerce(self.setting(key), value)
+            except (TypeError, ValueError):
+                log.warning("ignoring stored setting %s=%r", key, value)
+        for key, setting in self.schema.items():
+            if setting.env and environ.get(setting.env):
+                try:
+                    self.values[key] = _coerce(setting, environ[setting.env])
+                except (TypeError, ValueError):
+                    log.warning("ignoring %s=%r: not a valid %s", setting.env, environ[setting.env],
+                                setting.type.__name__)
+                    continue
+                self.overridden.add(key)
+
+    def setting(self, key):
+        """Schema entry for `key` (or its family), None for unknown keys."""
+        setting = self.schema.get(key)
+        if setting is None and '.' in key:
+            setting = self.schema.get(key.rsplit('.', 1)[0] + '.*')
+        return setting
+
+    # Reads: memory only
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def __getitem__(self, key):
+        return self.values[key]
+
+    def items(self, prefix=''):
+        return {key: value for key, value in self.values.items() if key.startswith(prefix)}
+
+    # Writes: memory now, disk later
+
+    def add_listener(self, callback):
+        """Call `callback(changes)` with a {key: value} dict after each change.
+
+        Runs on the thread that made the change, so it must be quick.
+        """
+        self.listeners.append(callback)
+
+    def set(self, key, value):
+        return bool(self.update({key: value}))
+
+    def update(self, values):
+        """Set several keys at once; returns {key: value} for those that changed.
+
+        Raises TypeError or ValueError, changing nothing, if any value doesn't
+        fit its setting's type.
+        """
+        values = {key: _coerce(self.setting(key), value) for key, value in values.items()}
+        changes = {}
+        with self._lock:
+            for key, value in values.items():
+                self.stats['sets'] += 1
+                if key in self.values and self.values[key] == value:
+                    continue
+                self.values[key] = value
+                self._pending[key] = value
+                changes[key] = value
+            if changes:
+                self._generation += 1
+                self._wake.notify()
+        self._announce(changes)
+        return changes
+
+    def reset(self, *keys):
+        """Return `keys` (all keys when none are given) to their defaults."""
+        changes = {}
+        with self._lock:
+            for key in keys or list(self.values):
+                setting = self.setting(key)
+                default = setting.default if setting is not None else None
+                if key not in self.values:
+                    continue
+                if setting is not None and setting.key == key:
+                    if self.values[key] != default:
+                        changes[key] = self.values[key] = default
+                else:
+                    # Family members and unknown keys disappear entirely
+                    del self.values[key]
+                    changes[key] = default
+                self._pending[key] = _RESET
+            if changes:
+                self._generation += 1
+                self._wake.notify()
+        self._announce(changes)
+        return changes
+
+    def _announce(self, changes):
+        if not changes:
+            return
+        self.stats['changed'] += len(changes)
+        for callback in self.listeners:
+            callback(changes)
+        if self.bus is not None:
+            for key, value in changes.items():
+                self.bus.publish(SETTINGS_CHANGED, (key, value), key=key)
+
+    # Writer thread
+
+    def _write_loop(self):
+        while True:
+            with self._lock:
+                while not self._pending and not self._closed:
+                    self._wake.wait()
+                if self._closed and not self._pending:
+                    return
+                # Debounce: wait for writes to stop, but not past MAX_DELAY
+                now = time.monotonic()
+                deadline = now + self.MAX_DELAY
+                quiet_at = now + self.FLUSH_DELAY
+                while not self._closed:
+                    timeout = min(quiet_at, deadline) - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    generation = self._generation
+                    self._wake.wait(timeout)
+                    if self._generation != generation:
+                        quiet_at = time.monotonic() + self.FLUSH_DELAY
+                pending, self._pending = self._pending, {}
+            if self._write(pending):
+                continue
+            with self._lock:
+                if self._closed:
+                    # close() makes the last attempt
+                    return
+                retry_at = time.monotonic() + self.RETRY_DELAY
+                while not self._closed and time.monotonic() < retry_at:
+                    self._wake.wait(retry_at - time.monotonic())
+
+    def _write(self, pending):
+        """Commit `pending`; on failure put it back in the queue and return False."""
+        if not pending:
+            return True
+        deleted = [(key,) for key, value in pending.items() if value is _RESET]
+        written = [(key, value) for key, value in pending.items() if value is not _RESET]
+        # One transaction per batch; flush() may race the writer thread
+        with self._write_lock:
+            try:
+                with self._connection:
+                    self._connection.execute('BEGIN')
+                    self._connection.executemany('DELETE FROM settings WHERE key = ?', deleted)
+                    self._connection.executemany(
+                        'INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)', written)
+            except sqlite3.Error as e:
+                log.error("writing settings failed, will retry: %s", e)
+                with self._lock:
+                    # Changes queued since are newer and win
+                    for key, value in pending.items():
+                        self._pending.setdefault(key, value)
+                return False
+            self.stats['flushes'] += 1
+            self.stats['rows_written'] += len(pending)
+        return True
+
+    def flush(self):
+        """Write queued changes now, on the calling thread; False if that failed
+        (the changes stay queued)."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return self._write(pending)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._wake.notify()
+        self._writer.join()
+        self.flush()
+        self._connection.close()
+
+
+_default_settings = None
+
+
+def get_settings():
+    """The application settings, loaded on first use."""
+    global _default_settings
+    if _default_settings is None:
+        _default_settings = SettingsStore(bus=get_event_bus())
+    return _default_settings
+
+
+def close_settings():
+    """Flush and close the application settings if they were ever loaded."""
+    global _default_settings
+    if _default_settings is not None:
+        _default_settings.close()
+        _default_settings = None
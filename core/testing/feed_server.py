@@ -0,0 +1,121 @@
+"""Local stand-in for the announcements feed endpoint.
+
+    python -m core.testing.feed_server --port 8801 --items 20
+
+Serves the feed as JSON at any path with ETag and Last-Modified validators
+and answers conditional requests with 304, counting both kinds of response
+so client polling behaviour can be checked. set_items() swaps the content.
+"""
+import argparse
+import asyncio
+import json
+import time
+import zlib
+from email.utils import formatdate, parsedate_to_datetime
+
+from core.net.http import read_headers, HttpError
+from core.testing.mock_bank import ServerThread
+
+
+def sample_items(count):
+    return [{'id': str(i), 'title': f"اطلاعیه شماره {i}",
+             'body': f"متن اطلاعیه شماره {i} درباره زمان‌بندی ثبت‌نام وام.",
+             'published': formatdate(1_700_000_000 + i * 3600, usegmt=True)}
+            for i in range(count, 0, -1)]
+
+
+class MockFeedServer:
+    def __init__(self, host='127.0.0.1', port=0, items=None, latency=0.0):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.server = None
+        self.full_responses = 0
+        self.not_modified = 0
+        self.set_items(sample_items(10) if items is None else items)
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}/news.json"
+
+    def set_items(self, items):
+        self.body = json.dumps({'items': list(items)}, ensure_ascii=False).encode('utf-8')
+        self.etag = f'"{zlib.crc32(self.body):08x}"'
+        self.modified_at = int(time.time())
+        self.last_modified = formatdate(self.modified_at, usegmt=True)
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    def is_fresh(self, headers):
+        if 'if-none-match' in headers:
+            return self.etag in [tag.strip() for tag in headers['if-none-match'].split(',')]
+        if 'if-modified-since' in headers:
+            try:
+                since = parsedate_to_datetime(headers['if-modified-since']).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return self.modified_at <= since
+        return False
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = dict(await read_headers(reader))
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+
+                validators = [f"ETag: {self.etag}", f"Last-Modified: {self.last_modified}"]
+                if self.is_fresh(headers):
+                    self.not_modified += 1
+                    lines = ["HTTP/1.1 304 Not Modified", *validators]
+                    body = b''
+                else:
+                    self.full_responses += 1
+                    lines = ["HTTP/1.1 200 OK", "Content-Type: application/json", *validators,
+                             f"Content-Length: {len(self.body)}"]
+                    body = self.body
+                writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+                await writer.drain()
+        except (ConnectionError, HttpError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+class MockFeedThread(ServerThread):
+    def __init__(self, **kwargs):
+        super().__init__(MockFeedServer(**kwargs), 'mock-feed')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in announcements feed")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8801)
+    parser.add_argument('--items', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    async def serve():
+        server = await MockFeedServer(args.host, args.port, sample_items(args.items)).start()
+        print(f"mock feed at {server.url}")
+        await server.server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+"""Local stand-in for a bank registration portal.
+
+    python -m core.testing.mock_bank --port 8800 --latency 0.05
+
+Speaks just enough HTTP/1.1 (keep-alive included) for the loan bots:
+
+    POST /login       {"national_id": ...}  -> sets a session cookie
+    POST /register    {"loan_type": ...}    -> {"tracking_code": ...}
+    GET  /health                            -> {"ok": true}
+
+`latency` delays every response and `fail_rate` turns that share of
+registrations into 503s, so engine and transport behaviour under a slow or
+flaky bank can be measured without touching a real portal.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import threading
+from http.cookies import SimpleCookie
+
+from core.net.http import read_headers, read_body, HttpError
+
+REASONS = {200: 'OK', 400: 'Bad Request', 401: 'Unauthorized', 404: 'Not Found',
+           503: 'Service Unavailable'}
+
+
+class MockBankServer:
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, fail_rate=0.0, seed=None,
+                 max_requests_per_connection=None):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.max_requests_per_connection = max_requests_per_connection
+        self.random = random.Random(seed)
+        self.server = None
+
+        self.sessions = {}
+        self._tokens = itertools.count(1)
+        self.connections = 0
+        self.open_connections = 0
+        self.requests = 0
+        self.registrations = 0
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def handle_connection(self, reader, writer):
+        self.connections += 1
+        self.open_connections += 1
+        served = 0
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = await read_headers(reader)
+                # Unlike a response, a request without framing headers has no body
+                framed = any(name in ('content-length', 'transfer-encoding') for name, _ in headers)
+                body = await read_body(reader, headers, method) if framed else b''
+                served += 1
+                self.requests += 1
+
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                status, payload, extra_headers = self.route(method, target, dict(headers), body)
+
+                close = (dict(headers).get('connection', '').lower() == 'close'
+                         or (self.max_requests_per_connection is not None
+                             and served >= self.max_requests_per_connection))
+                writer.write(self.encode_response(status, payload, extra_headers, close))
+                await writer.drain()
+                if close:
+                    break
+        except (ConnectionError, HttpError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.open_connections -= 1
+            writer.close()
+
+    def route(self, method, target, headers, body):
+        path = target.split('?', 1)[0]
+        try:
+            data = json.loads(body) if body else {}
+        except ValueError:
+            return 400, {'error': 'invalid json'}, {}
+
+        if method == 'GET' and path == '/health':
+            return 200, {'ok': True}, {}
+
+        if method == 'POST' and path == '/login':
+            if not data.get('national_id'):
+                return 400, {'error': 'national_id required'}, {}
+            token = f"s{next(self._tokens)}"
+            self.sessions[token] = data['national_id']
+            return 200, {'token': token}, {'Set-Cookie': f"session={token}; Path=/; HttpOnly"}
+
+        if method == 'POST' and path == '/register':
+            cookie = SimpleCookie(headers.get('cookie', ''))
+            token = cookie['session'].value if 'session' in cookie else None
+            if token not in self.sessions:
+                return 401, {'error': 'not logged in'}, {}
+            if self.fail_rate and self.random.random() < self.fail_rate:
+                return 503, {'error': 'try again later'}, {}
+            self.registrations += 1
+            return 200, {'tracking_code': f"TRK{self.registrations:08d}",
+                         'national_id': self.sessions[token]}, {}
+
+        return 404, {'error': 'not found'}, {}
+
+    def encode_response(self, status, payload, extra_headers, close):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+                 "Content-Type: application/json",
+                 f"Content-Length: {len(body)}",
+                 f"Connection: {'close' if close else 'keep-alive'}"]
+        lines.extend(f"{name}: {value}" for name, value in extra_headers.items())
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body
+
+
+class ServerThread:
+    """Runs a stand-in server (anything with async start/stop) on its own
+    event loop thread, as a context manager (for benchmarks)."""
+
+    def __init__(self, server, name='mock-server'):
+        self.loop = asyncio.new_event_loop()
+        self.server = server
+        self.thread = threading.Thread(target=self.loop.run_forever, name=name, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self.server.start(), self.loop).result()
+        return self.server
+
+    def __exit__(self, *exc_info):
+        asyncio.run_coroutine_threadsafe(self.server.stop(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+class MockBankThread(ServerThread):
+    def __init__(self, **kwargs):
+        super().__init__(MockBankServer(**kwargs), 'mock-bank')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in bank portal")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8800)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds per response")
+    parser.add_argument('--fail-rate', type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    async def serve():
+        server = await MockBankServer(args.host, args.port, args.latency, args.fail_rate).start()
+        print(f"mock bank listening on {server.base_url}")
+        await server.server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
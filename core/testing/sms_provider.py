@@ -0,0 +1,143 @@
+"""Local stand-in for an SMS gateway with a batch send API.
+
+    python -m core.testing.sms_provider --port 8802 --latency 0.05 --capacity 4
+
+    POST /send  {"messages": [{"id", "to", "text"}]}
+             -> {"results": [{"id", "ok", "error"}]}
+
+Batches above `max_batch` are rejected with 400. More than `capacity`
+requests at once get 429 with Retry-After, and each request takes `latency`
+plus `per_message` seconds per message, so dispatcher batching and
+backpressure can be measured without a real gateway. Recipients not made of
+digits are rejected per message. Every delivered message is kept in `sent`.
+"""
+import argparse
+import asyncio
+import json
+
+from core.net.http import read_headers, read_body, HttpError
+from core.testing import mock_bank
+from core.testing.mock_bank import ServerThread
+
+REASONS = {**mock_bank.REASONS, 429: 'Too Many Requests'}
+
+
+class MockSmsServer:
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, per_message=0.0, capacity=None,
+                 max_batch=500, retry_after=0.1):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.per_message = per_message
+        self.capacity = capacity
+        self.max_batch = max_batch
+        self.retry_after = retry_after
+        self.server = None
+
+        self.sent = []                 # (id, recipient, text)
+        self.requests = 0
+        self.busy = 0
+        self.active = 0
+        self.max_active = 0
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}/send"
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = await read_headers(reader)
+                body = await read_body(reader, headers, method)
+                self.requests += 1
+                status, payload, extra_headers = await self.route(method, target.split('?', 1)[0], body)
+                writer.write(self.encode_response(status, payload, extra_headers))
+                await writer.drain()
+        except (ConnectionError, HttpError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def route(self, method, path, body):
+        if method != 'POST' or path != '/send':
+            return 404, {'error': 'not found'}, {}
+        try:
+            messages = json.loads(body).get('messages', [])
+        except (ValueError, AttributeError):
+            return 400, {'error': 'invalid json'}, {}
+        if len(messages) > self.max_batch:
+            return 400, {'error': f'at most {self.max_batch} messages per request'}, {}
+        if self.capacity is not None and self.active >= self.capacity:
+            self.busy += 1
+            return 429, {'error': 'slow down'}, {'Retry-After': str(self.retry_after)}
+
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            delay = self.latency + self.per_message * len(messages)
+            if delay:
+                await asyncio.sleep(delay)
+        finally:
+            self.active -= 1
+        results = []
+        for message in messages:
+            recipient = str(message.get('to', ''))
+            if recipient.isdigit():
+                self.sent.append((message.get('id'), recipient, message.get('text')))
+                results.append({'id': message.get('id'), 'ok': True})
+            else:
+                results.append({'id': message.get('id'), 'ok': False, 'error': 'invalid recipient'})
+        return 200, {'results': results}, {}
+
+    def encode_response(self, status, payload, extra_headers):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+                 "Content-Type: application/json",
+                 f"Content-Length: {len(body)}"]
+        lines.extend(f"{name}: {value}" for name, value in extra_headers.items())
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body
+
+
+class MockSmsThread(ServerThread):
+    def __init__(self, **kwargs):
+        super().__init__(MockSmsServer(**kwargs), 'mock-sms')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in SMS gateway")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8802)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds per request")
+    parser.add_argument('--per-message', type=float, default=0.0, help="extra seconds per message")
+    parser.add_argument('--capacity', type=int, default=None, help="concurrent requests before 429")
+    args = parser.parse_args(argv)
+
+    async def serve():
+        server = await MockSmsServer(args.host, args.port, args.latency, args.per_message,
+                                     args.capacity).start()
+        print(f"mock SMS gateway at {server.url}")
+        await server.server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
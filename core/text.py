@@ -0,0 +1,58 @@
+"""Persian text normalization shared by imports and search."""
+
+# Arabic code points that intake systems and keyboards substitute for the
+# Persian letters, plus Persian and Arabic-Indic digits
+_PERSIAN_DIGITS = '۰۱۲۳۴۵۶۷۸۹'
+_ARABIC_DIGITS = '٠١٢٣٤٥٦٧٨٩'
+
+_DIGIT_TABLE = str.maketrans(_PERSIAN_DIGITS + _ARABIC_DIGITS, '0123456789' * 2)
+
+_TEXT_TABLE = str.maketrans({
+    'ي': 'ی',     # ARABIC LETTER YEH
+    'ى': 'ی',     # ARABIC LETTER ALEF MAKSURA
+    'ك': 'ک',     # ARABIC LETTER KAF
+    'ۀ': 'ه',     # HEH WITH YEH ABOVE
+    'ة': 'ه',     # TEH MARBUTA
+    'ؤ': 'و',
+    'إ': 'ا',
+    'أ': 'ا',
+    '\u064b': None, '\u064c': None, '\u064d': None,   # tanwin
+    '\u064e': None, '\u064f': None, '\u0650': None,   # short vowels
+    '\u0651': None, '\u0652': None,                   # shadda, sukun
+    '\u0640': None,                                   # tatweel
+    '\u200e': None, '\u200f': None,                   # direction marks
+    '\u00a0': ' ',                                    # no-break space
+    **{ord(d): str(i) for digits in (_PERSIAN_DIGITS, _ARABIC_DIGITS) for i, d in enumerate(digits)},
+})
+
+
+def normalize_digits(text):
+    """Replace Persian and Arabic-Indic digits with ASCII digits."""
+    return text.translate(_DIGIT_TABLE)
+
+
+def digits_only(text):
+    """ASCII digits of `text`, with every other character dropped."""
+    return ''.join(ch for ch in normalize_digits(text) if '0' <= ch <= '9')
+
+
+def normalize_text(text):
+    """Canonical form of a Persian name or label.
+
+    Arabic yeh/kaf become Persian ی/ک, diacritics and tatweel are dropped,
+    digits become ASCII and runs of whitespace collapse to one space.
+    The zero-width non-joiner is kept since it is part of Persian spelling.
+    """
+    return ' '.join(text.translate(_TEXT_TABLE).split())
+
+
+def normalize_phone(text):
+    """Mobile number as 11 digits starting with 09 where recognisable."""
+    digits = digits_only(text)
+    if digits.startswith('0098'):
+        digits = '0' + digits[4:]
+    elif digits.startswith('98') and len(digits) == 12:
+        digits = '0' + digits[2:]
+    elif digits.startswith('9') and len(digits) == 10:
+        digits = '0' + digits
+    return digits
@@ -0,0 +1,189 @@
+"""Detects stalls of the GUI thread and records what it was doing.
+
+The GUI thread calls beat() from a timer every BEAT_MS or so. A watchdog
+thread checks the last beat a few times per threshold; once the GUI thread
+has been silent for longer than `threshold_ms` it takes the GUI thread's
+Python stack (sys._current_frames) right then. When beats resume, the stall
+is appended to a JSONL report in data_dir() with its duration, the route
+shown at the time and the stack:
+
+    {"time", "duration_ms", "route", "signature", "stack": [[file, line, function, code]]}
+
+The report rolls over to report.1 once it passes MAX_BYTES, so two files
+bound its size. summarize_stalls() groups the records by signature, a hash
+of the stack's files and functions (not line numbers, so one slow function
+counts as one problem wherever in it the sample landed).
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+import zlib
+from collections import Counter
+
+from core import instrument
+from core.paths import data_dir
+
+log = logging.getLogger('yara.watchdog')
+
+# Innermost frames kept per stall; the event loop's outer frames add nothing
+MAX_FRAMES = 40
+
+
+def stack_signature(stack):
+    text = '\n'.join(f"{filename}:{function}" for filename, _, function, _ in stack)
+    return f"{zlib.crc32(text.encode('utf-8')):08x}"
+
+
+class StallWatchdog:
+    BEAT_MS = 20
+    MAX_BYTES = 512 * 1024
+
+    def __init__(self, path, threshold_ms=50.0, thread_id=None, max_bytes=None):
+        self.path = path
+        self.threshold_ms = threshold_ms
+        # The thread to watch is the one creating the watchdog unless told otherwise
+        self.thread_id = thread_id or threading.get_ident()
+        self.max_bytes = max_bytes or self.MAX_BYTES
+        self.route = None
+        self.last_beat = time.monotonic()
+        self.stalls = 0
+        self.thread = None
+        self._stop = threading.Event()
+
+    def beat(self):
+        self.last_beat = time.monotonic()
+
+    def set_route(self, route):
+        self.route = route
+
+    def start(self):
+        if self.thread is None:
+            self.beat()
+            self.thread = threading.Thread(target=self._run, name='stall-watchdog', daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def _run(self):
+        pending = None     # (last beat, route, stack) of the stall in progress
+        while not self._stop.wait(min(max(self.BEAT_MS, self.threshold_ms) / 4000.0, 1.0)):
+            last_beat = self.last_beat
+            silent_ms = (time.monotonic() - last_beat) * 1000.0
+            if pending is not None and pending[0] != last_beat:
+                # Beats resumed: the stall lasted until the first new one
+                self._record(pending, (last_beat - pending[0]) * 1000.0 - self.BEAT_MS)
+                pending = None
+            if pending is None and silent_ms > self.BEAT_MS + self.threshold_ms:
+                stack = self._capture()
+                if stack is not None:
+                    pending = (last_beat, self.route, stack)
+        # A stall still in progress at stop() is the event loop having exited
+
+    def _capture(self):
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return None
+        stack = traceback.extract_stack(frame)[-MAX_FRAMES:]
+        return [(entry.filename, entry.lineno, entry.name, entry.line or '') for entry in stack]
+
+    def _record(self, pending, duration_ms):
+        _, route, stack = pending
+        self.stalls += 1
+        instrument.count('ui.stalls')
+        instrument.record('ui.stall', duration_ms)
+        record = {'time': time.time(), 'duration_ms': round(duration_ms, 1), 'route': route,
+                  'signature': stack_signature(stack), 'stack': stack}
+        try:
+            if os.path.exists(self.path) and os.path.getsize(self.path) > self.max_bytes:
+                os.replace(self.path, self.path + '.1')
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        except OSError as e:
+            log.warning("could not write stall report: %s", e)
+
+
+def read_stalls(path):
+    """Every stall in the report at `path` (and its rolled-over part), oldest first."""
+    records = []
+    for part in (path + '.1', path):
+        try:
+            with open(part, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        # A line cut short by a crash
+                        continue
+        except OSError:
+            continue
+    return records
+
+
+def summarize_stalls(records):
+    """One dict per stack signature, the most total stall time first.
+
+    Each carries count, total_ms, max_ms, last (time), routes (a Counter)
+    and the stack of its longest stall.
+    """
+    groups = {}
+    for record in records:
+        group = groups.get(record['signature'])
+        if group is None:
+            group = groups[record['signature']] = {
+                'signature': record['signature'], 'count': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                'last': 0.0, 'routes': Counter(), 'stack': record['stack']}
+        duration = record['duration_ms']
+        group['count'] += 1
+        group['total_ms'] += duration
+        group['last'] = max(group['last'], record['time'])
+        group['routes'][record['route']] += 1
+        if duration >= group['max_ms']:
+            group['max_ms'] = duration
+            group['stack'] = record['stack']
+    return sorted(groups.values(), key=lambda group: group['total_ms'], reverse=True)
+
+
+_default_watchdog = None
+
+
+def report_path():
+    return os.path.join(data_dir(), 'stalls.jsonl')
+
+
+def start_watchdog():
+    """Watch the calling (GUI) thread, per the ui.stall_ms setting.
+
+    Returns the watchdog, or None when the setting is 0. The caller has to
+    call beat() every StallWatchdog.BEAT_MS from that thread's event loop.
+    """
+    global _default_watchdog
+    if _default_watchdog is None:
+        from core.settings import get_settings
+        settings = get_settings()
+        if not settings['ui.stall_ms']:
+            return None
+        _default_watchdog = StallWatchdog(report_path(), settings['ui.stall_ms']).start()
+
+        def on_changed(changes):
+            # Turning it off takes a restart; 0 just stops new reports
+            if 'ui.stall_ms' in changes and _default_watchdog is not None:
+                _default_watchdog.threshold_ms = changes['ui.stall_ms'] or float('inf')
+
+        settings.add_listener(on_changed)
+    return _default_watchdog
+
+
+def stop_watchdog():
+    global _default_watchdog
+    if _default_watchdog is not None:
+        _default_watchdog.stop()
+        _default_watchdog = None
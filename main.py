@@ -1,35 +1,17 @@
 import sys
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QPushButton, QLabel, QScrollArea, 
-                             QFrame, QSizePolicy, QStackedWidget)
-from PyQt5.QtCore import Qt, QSize, QPropertyAnimation, QEasingCurve, QRect
-from PyQt5.QtGui import QFont, QColor, QPalette, QLinearGradient, QPainter, QBrush
-from PyQt5.QtSvg import QSvgWidget
+                             QFrame, QStackedWidget)
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QFont
 
-class RoundedButton(QPushButton):
-    def __init__(self, icon=None, text="", parent=None):
-        super().__init__(text, parent)
-        self.setCursor(Qt.PointingHandCursor)
-        self.setStyleSheet("""
-            QPushButton {
-                background-color: #2A2A3D;
-                color: #E0E0E0;
-                border: none;
-                border-radius: 8px;
-                padding: 10px;
-                text-align: right;
-            }
-            QPushButton:hover {
-                background-color: #3A3A4D;
-            }
-            QPushButton:pressed {
-                background-color: #1d4ed8;
-            }
-        """)
-        
-        if icon:
-            # For simplicity, using text as icon. In real app, use QIcon with SVG
-            self.setIcon(icon)
+from ui.components.menu_item import MenuItem, ITEM_STYLE, SUBMENU_STYLE
+from ui.routes import ROUTES, DEFAULT_ROUTE
+
+class RoundedButton(MenuItem):
+    # Painted in one widget instead of a styled QPushButton; see ui.components.menu_item
+    def __init__(self, icon=None, text="", parent=None, style=ITEM_STYLE):
+        super().__init__(text, icon, style=style, parent=parent)
 
 class Sidebar(QWidget):
     def __init__(self, parent=None):
@@ -125,15 +107,13 @@ class Sidebar(QWidget):
         submenu_layout.setContentsMargins(15, 8, 15, 8)
         submenu_layout.setSpacing(3)
         
-        marriage_loan_btn = RoundedButton(text="ربات وام ازدواج")
+        marriage_loan_btn = RoundedButton(text="ربات وام ازدواج", style=SUBMENU_STYLE)
         marriage_loan_btn.setProperty('page', 'marriage-loan')
-        marriage_loan_btn.setStyleSheet(marriage_loan_btn.styleSheet() + "font-size: 13px;")
         submenu_layout.addWidget(marriage_loan_btn)
         self.menu_items.append(marriage_loan_btn)
         
-        child_loan_btn = RoundedButton(text="ربات وام فرزند")
+        child_loan_btn = RoundedButton(text="ربات وام فرزند", style=SUBMENU_STYLE)
         child_loan_btn.setProperty('page', 'child-loan')
-        child_loan_btn.setStyleSheet(child_loan_btn.styleSheet() + "font-size: 13px;")
         submenu_layout.addWidget(child_loan_btn)
         self.menu_items.append(child_loan_btn)
         
@@ -306,10 +286,10 @@ class MainWindow(QMainWindow):
             self.sidebar.toggle_btn.setText("←")
     
     def change_page(self, page_name):
-        # Change the page content based on page_name
-        # This would update the stacked widget in main_content
-        # and update the top menu
-        pass
+        # Only the home content exists in this prototype, so the route
+        # table is used for the top menu title
+        route = ROUTES.get(page_name, ROUTES[DEFAULT_ROUTE])
+        self.top_menu.title.setText(route.title)
     
     def resizeEvent(self, event):
         # Reposition toggle button when window is resized
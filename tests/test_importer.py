@@ -0,0 +1,31 @@
+"""Applicant file parsing: bad records are counted and skipped, not fatal."""
+from core.applicants.importer import read_applicant_batches
+
+
+def read_all(path):
+    batches = list(read_applicant_batches(str(path), batch_size=2))
+    national_ids = [value for batch, *_ in batches for value in batch['national_id']]
+    _, rows, failed, _, _ = batches[-1]
+    return national_ids, rows, failed
+
+
+def test_malformed_json_lines_are_counted_as_failed(tmp_path):
+    path = tmp_path / 'applicants.jsonl'
+    path.write_text('\n'.join([
+        '{"national_id": "0011111111", "first_name": "علی"}',
+        '{"national_id": "00222',                       # cut off mid-line
+        '["not", "an", "object"]',
+        '{"national_id": "0033333333", "first_name": "سارا"}',
+        '{"national_id": "0044444444"}',
+    ]), encoding='utf-8')
+    national_ids, rows, failed = read_all(path)
+    assert len(national_ids) == rows == 3
+    assert failed == 2
+
+
+def test_overlong_identifier_is_counted_as_failed(tmp_path):
+    path = tmp_path / 'applicants.csv'
+    path.write_text('national_id,first_name\n0011111111,علی\n' + '9' * 40 + ',رضا\n', encoding='utf-8')
+    national_ids, rows, failed = read_all(path)
+    assert rows == 1
+    assert failed == 1
@@ -0,0 +1,92 @@
+"""Job queue and runner, with a stand-in runtime instead of a bot engine."""
+import itertools
+import threading
+
+import pytest
+
+from core.bots.engine import SessionResult, SUCCEEDED, FAILED
+from core.bots.jobs import JobQueue, JobRunner
+
+
+class Session:
+    def __init__(self, job):
+        self.job = job
+        self.session_id = None
+
+
+class InstantRuntime:
+    """Finishes every session inside submit_many, on the submitting thread,
+    the way ProcessBotPool's done callbacks can."""
+
+    def __init__(self, state=SUCCEEDED):
+        self.state = state
+        self.callbacks = []
+        self.ids = itertools.count(1)
+
+    def add_result_callback(self, callback):
+        self.callbacks.append(callback)
+
+    def submit_many(self, sessions):
+        ids = []
+        for session in sessions:
+            session.session_id = next(self.ids)
+            ids.append(session.session_id)
+            outcome = SessionResult(session.session_id, session.job.bot, session.job.bank, self.state,
+                                    {'ok': True}, 'declined', 0.0, None)
+            for callback in self.callbacks:
+                callback(outcome)
+        return ids
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(str(tmp_path / 'jobs.db'))
+    yield queue
+    queue.close()
+
+
+def submit_in_thread(runner, jobs):
+    thread = threading.Thread(target=runner._submit, args=(jobs,), daemon=True)
+    thread.start()
+    thread.join(5.0)
+    return not thread.is_alive()
+
+
+def test_results_reported_during_submit_are_acknowledged(queue):
+    queue.enqueue_many([('bot', 'bank', {'n': n}) for n in range(5)])
+    runner = JobRunner(queue, InstantRuntime(), Session)
+    assert submit_in_thread(runner, queue.dequeue(5)), "submit deadlocked on its own results"
+    assert runner.running == {}
+    assert queue.counts() == {'done': 5}
+
+
+def test_failures_reported_during_submit_are_retried(queue):
+    queue.enqueue_many([('bot', 'bank', {'n': n}) for n in range(3)])
+    runner = JobRunner(queue, InstantRuntime(FAILED), Session)
+    assert submit_in_thread(runner, queue.dequeue(3))
+    assert queue.stats['retried'] == 3
+    assert queue.counts() == {'queued': 3}
+
+
+def test_unknown_results_are_ignored(queue):
+    runner = JobRunner(queue, InstantRuntime(), Session)
+    runner.on_result(SessionResult(99, 'bot', 'bank', SUCCEEDED, None, None, 0.0, None))
+    assert runner.running == {}
+    assert runner._early == {}
+
+
+def test_pending_sees_queued_and_leased_jobs(queue):
+    assert not queue.pending()
+    (job_id,) = queue.enqueue_many([('bot', 'bank', {})])
+    assert queue.pending()
+    (job,) = queue.dequeue()
+    assert queue.pending()
+    queue.complete(job)
+    assert not queue.pending()
+
+
+def test_pending_uses_the_state_index(queue):
+    plan = queue._connection.execute(
+        "EXPLAIN QUERY PLAN SELECT EXISTS(SELECT 1 FROM jobs WHERE state IN ('queued', 'leased'))"
+    ).fetchall()
+    assert any('USING' in row[-1] and 'INDEX' in row[-1] for row in plan)
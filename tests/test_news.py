@@ -0,0 +1,86 @@
+"""NewsFeed conditional requests and disk cache against the bundled feed server."""
+import asyncio
+import json
+
+from core.net.transport import Transport
+from core.news import NewsFeed
+from core.testing.feed_server import MockFeedThread, sample_items
+
+
+def refresh(feed, *more):
+    async def scenario():
+        transport = Transport()
+        try:
+            results = []
+            for each in (feed,) + more:
+                results.append(await each.refresh(transport))
+            return results
+        finally:
+            transport.close()
+
+    return asyncio.run(scenario())
+
+
+def test_unchanged_feed_is_answered_with_304(tmp_path):
+    with MockFeedThread(items=sample_items(3)) as server:
+        feed = NewsFeed(server.url, str(tmp_path / 'feed.json'))
+        first, second = refresh(feed, feed)
+    assert [item['id'] for item in first.items] == ['3', '2', '1']
+    assert first.added == ['3', '2', '1']
+    assert second is None
+    assert server.full_responses == 1
+    assert server.not_modified == 1
+    assert feed.stats['not_modified'] == 1
+
+
+def test_changed_feed_returns_only_the_difference(tmp_path):
+    with MockFeedThread(items=sample_items(3)) as server:
+        feed = NewsFeed(server.url, str(tmp_path / 'feed.json'))
+        refresh(feed)
+        items = sample_items(4)
+        items[1] = dict(items[1], title="عنوان تازه")    # id 3
+        del items[-1]                                    # id 1
+        server.set_items(items)
+        (diff,) = refresh(feed)
+    assert diff.added == ['4']
+    assert diff.changed == ['3']
+    assert diff.removed == ['1']
+    assert server.full_responses == 2
+
+
+def test_cache_is_written_and_reused_across_launches(tmp_path):
+    cache_path = str(tmp_path / 'feed.json')
+    with MockFeedThread(items=sample_items(2)) as server:
+        refresh(NewsFeed(server.url, cache_path))
+        with open(cache_path, encoding='utf-8') as f:
+            cached = json.load(f)
+        assert cached['url'] == server.url
+        assert cached['etag'] == server.etag
+        assert [item['id'] for item in cached['items']] == ['2', '1']
+
+        # A later launch renders from disk and revalidates instead of downloading
+        feed = NewsFeed(server.url, cache_path)
+        assert [item['id'] for item in feed.items] == ['2', '1']
+        (diff,) = refresh(feed)
+    assert diff is None
+    assert server.full_responses == 1
+    assert server.not_modified == 1
+
+
+def test_last_modified_alone_revalidates(tmp_path):
+    with MockFeedThread(items=sample_items(2)) as server:
+        feed = NewsFeed(server.url, str(tmp_path / 'feed.json'))
+        refresh(feed)
+        feed.etag = None
+        (diff,) = refresh(feed)
+    assert diff is None
+    assert server.not_modified == 1
+
+
+def test_cache_for_another_url_is_ignored(tmp_path):
+    cache_path = str(tmp_path / 'feed.json')
+    with MockFeedThread(items=sample_items(2)) as server:
+        refresh(NewsFeed(server.url, cache_path))
+        feed = NewsFeed(server.url + '?other', cache_path)
+    assert feed.items == ()
+    assert feed.etag is None
@@ -0,0 +1,226 @@
+"""Notification dispatcher against the bundled SMS gateway (core.testing.sms_provider)."""
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from core.bots.jobs import JobQueue
+from core.net.transport import Transport
+from core.notifications import SMS, HttpProvider, NotificationDispatcher, _Window
+from core.testing.mock_bank import ServerThread
+from core.testing.sms_provider import MockSmsServer, MockSmsThread
+
+
+class FlakySmsServer(MockSmsServer):
+    """Answers its first requests with the given statuses, then behaves.
+
+    A 200 among them comes with a `null` body instead of results.
+    """
+
+    def __init__(self, statuses, **kwargs):
+        super().__init__(**kwargs)
+        self.statuses = list(statuses)
+
+    async def route(self, method, path, body):
+        if self.statuses:
+            status = self.statuses.pop(0)
+            headers = {'Retry-After': str(self.retry_after)} if status in (429, 503) else {}
+            return status, None if status == 200 else {'error': 'unavailable'}, headers
+        return await super().route(method, path, body)
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    queue = JobQueue(str(tmp_path / 'outbox.db'))
+    queue.BACKOFF_BASE = 0.01
+    yield queue
+    queue.close()
+
+
+def make_dispatcher(outbox, url, **provider_options):
+    provider = HttpProvider(SMS, url)
+    for name, value in provider_options.items():
+        setattr(provider, name, value)
+    dispatcher = NotificationDispatcher(outbox, [provider])
+    dispatcher.POLL_INTERVAL = 0.02
+    return dispatcher
+
+
+def dispatch(dispatcher, until, timeout=10.0):
+    """Run the dispatcher's pumps until `until()` holds; returns the provider's stats."""
+    async def scenario():
+        provider = dispatcher.providers[SMS]
+        provider.transport = Transport()
+        task = asyncio.get_running_loop().create_task(dispatcher.run())
+        deadline = time.monotonic() + timeout
+        while not until() and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        provider.transport.close()
+        return dispatcher.stats(SMS)
+
+    return asyncio.run(scenario())
+
+
+def sent(dispatcher, count):
+    """Until condition: `count` messages sent and acknowledged by the dispatcher
+    (the gateway records them before its answer is read)."""
+    return lambda: dispatcher.counters[SMS]['sent'] == count
+
+
+def messages(n, text="وام شما تأیید شد"):
+    return [(SMS, f"0912000{i:04d}", text, None) for i in range(n)]
+
+
+def test_queued_messages_go_out_in_one_request(outbox):
+    with MockSmsThread() as gateway:
+        dispatcher = make_dispatcher(outbox, gateway.url)
+        assert len(dispatcher.notify_many(messages(50))) == 50
+        stats = dispatch(dispatcher, sent(dispatcher, 50))
+    assert gateway.requests == 1
+    assert stats['batches'] == 1
+    assert stats['sent'] == 50
+
+
+def test_batches_respect_the_provider_limit(outbox):
+    with MockSmsThread() as gateway:
+        dispatcher = make_dispatcher(outbox, gateway.url, max_batch=20)
+        dispatcher.notify_many(messages(50))
+        dispatch(dispatcher, sent(dispatcher, 50))
+    assert gateway.requests == 3
+    assert sorted(recipient for _, recipient, _ in gateway.sent) == [m[1] for m in messages(50)]
+
+
+def test_duplicates_are_dropped_within_the_window(outbox):
+    dispatcher = make_dispatcher(outbox, 'http://127.0.0.1:9/send')
+    assert dispatcher.notify(SMS, '09120000001', "سلام") is not None
+    assert dispatcher.notify(SMS, '09120000001', "سلام") is None
+    assert dispatcher.notify(SMS, '09120000002', "سلام") is not None
+    # An explicit key dedups messages whose text differs
+    assert dispatcher.notify(SMS, '09120000001', "نسخه اول", key='status:7') is not None
+    assert dispatcher.notify(SMS, '09120000001', "نسخه دوم", key='status:7') is None
+    assert dispatcher.deduplicated == 2
+
+    # A restarted dispatcher seeds the window from the outbox
+    restarted = make_dispatcher(outbox, 'http://127.0.0.1:9/send')
+    assert restarted.notify(SMS, '09120000001', "سلام") is None
+    assert restarted.notify_many([(SMS, '09120000002', "سلام", None),
+                                  (SMS, '09120000003', "سلام", None)]) != []
+    assert restarted.deduplicated == 2
+
+
+def test_expired_keys_are_accepted_again(outbox):
+    dispatcher = make_dispatcher(outbox, 'http://127.0.0.1:9/send')
+    dispatcher.dedup_window = 0.05
+    assert dispatcher.notify(SMS, '09120000001', "سلام") is not None
+    time.sleep(0.1)
+    assert dispatcher.notify(SMS, '09120000001', "سلام") is not None
+
+
+def test_keys_are_remembered_only_once_queued(outbox):
+    dispatcher = make_dispatcher(outbox, 'http://127.0.0.1:9/send')
+    with pytest.raises(KeyError):
+        dispatcher.notify_many([(SMS, '09120000001', "سلام", None), ('fax', '021', "سلام", None)])
+    assert dispatcher.notify(SMS, '09120000001', "سلام") is not None
+
+    enqueue_many = outbox.enqueue_many
+
+    def failing(jobs, wait=True):
+        raise sqlite3.OperationalError("database is locked")
+
+    outbox.enqueue_many = failing
+    with pytest.raises(sqlite3.OperationalError):
+        dispatcher.notify(SMS, '09120000002', "سلام")
+    outbox.enqueue_many = enqueue_many
+    assert dispatcher.notify(SMS, '09120000002', "سلام") is not None
+    assert dispatcher.deduplicated == 0
+
+
+def test_duplicates_within_one_call_are_dropped(outbox):
+    dispatcher = make_dispatcher(outbox, 'http://127.0.0.1:9/send')
+    assert len(dispatcher.notify_many(messages(3) + messages(3))) == 3
+    assert dispatcher.deduplicated == 3
+
+
+def test_empty_response_is_retried(outbox):
+    with ServerThread(FlakySmsServer([200]), 'flaky-sms') as gateway:
+        dispatcher = make_dispatcher(outbox, gateway.url)
+        dispatcher.notify_many(messages(4))
+        stats = dispatch(dispatcher, sent(dispatcher, 4))
+    assert stats['sent'] == 4
+    assert outbox.stats['retried'] == 4
+
+
+def test_server_errors_are_retried_with_backoff(outbox):
+    with ServerThread(FlakySmsServer([500, 500]), 'flaky-sms') as gateway:
+        dispatcher = make_dispatcher(outbox, gateway.url)
+        dispatcher.notify_many(messages(10))
+        stats = dispatch(dispatcher, sent(dispatcher, 10))
+    assert gateway.statuses == []
+    assert stats['sent'] == 10
+    # Each failed call counts an attempt against every message in it; the
+    # jittered backoff may split the retries over several calls
+    assert outbox.stats['retried'] == 20
+    assert outbox.counts() == {'done': 10}
+
+
+@pytest.mark.parametrize('status', [429, 503])
+def test_busy_provider_pauses_without_spending_attempts(outbox, status):
+    with ServerThread(FlakySmsServer([status], retry_after=0.2), 'flaky-sms') as gateway:
+        dispatcher = make_dispatcher(outbox, gateway.url)
+        dispatcher.notify_many(messages(5))
+        started = time.monotonic()
+        stats = dispatch(dispatcher, sent(dispatcher, 5))
+        elapsed = time.monotonic() - started
+    assert stats['busy'] == 1
+    assert stats['sent'] == 5
+    assert gateway.requests == 2
+    assert elapsed >= 0.2                   # waited out Retry-After
+    assert outbox.stats['retried'] == 0
+
+
+def test_window_grows_additively_and_halves():
+    window = _Window(maximum=8)
+    assert window.limit == 1.0
+    for _ in range(10):
+        window.grow()
+    assert window.limit == 8.0              # capped at max_inflight
+    window.shrink()
+    assert window.limit == 4.0
+    for _ in range(5):
+        window.shrink()
+    assert window.limit == 1.0              # never below one call
+
+
+def test_quick_batches_open_the_window(outbox):
+    with MockSmsThread(latency=0.01) as gateway:
+        dispatcher = make_dispatcher(outbox, gateway.url, max_batch=1)
+        dispatcher.notify_many(messages(40))
+        stats = dispatch(dispatcher, sent(dispatcher, 40))
+    assert stats['limit'] > 1
+    assert gateway.max_active > 1
+
+
+def test_slow_batches_keep_the_window_closed(outbox):
+    with MockSmsThread(latency=0.01) as gateway:
+        dispatcher = make_dispatcher(outbox, gateway.url, max_batch=1, target_latency=0.0)
+        dispatcher.notify_many(messages(10))
+        stats = dispatch(dispatcher, sent(dispatcher, 10))
+    assert stats['limit'] == 1
+    assert gateway.max_active == 1
+
+
+def test_busy_answer_halves_an_open_window(outbox):
+    with ServerThread(FlakySmsServer([], latency=0.01, retry_after=0.05), 'flaky-sms') as gateway:
+        dispatcher = make_dispatcher(outbox, gateway.url, max_batch=1)
+        dispatcher.notify_many(messages(20))
+        dispatch(dispatcher, sent(dispatcher, 20))
+        opened = dispatcher.windows[SMS].limit
+        assert opened > 2
+
+        gateway.statuses = [429]
+        dispatcher.notify_many(messages(1, text="یادآوری"))
+        stats = dispatch(dispatcher, sent(dispatcher, 21))
+    assert stats['busy'] == 1
+    assert stats['limit'] < opened
@@ -0,0 +1,11 @@
+"""Worker pool behaviour that needs no worker processes."""
+from core.bots.process_pool import ProcessBotPool
+
+
+def test_empty_submit_returns_no_ids():
+    pool = ProcessBotPool(processes=1, slots=4).start()
+    try:
+        assert pool.submit_many([]) == []
+        assert pool.stats.submitted == 0
+    finally:
+        pool.stop()
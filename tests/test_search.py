@@ -0,0 +1,54 @@
+"""Search index results against a plain scan of the store."""
+import random
+
+import pytest
+
+from core.applicants.search import ApplicantSearchIndex
+from core.applicants.store import ApplicantStore
+from core.text import normalize_text
+
+QUERIES = ('نام12', 'نام12 نام34', 'نام4 نام4', 'نام1', 'نام3 نام33 نام1', 'نام12 نام', 'ناشناس')
+
+
+@pytest.fixture
+def indexed():
+    rng = random.Random(5)
+    store = ApplicantStore()
+    index = ApplicantSearchIndex(store)
+    store.add_index(index)
+    names = [f"نام{i}" for i in range(500)]
+    for _ in range(4):
+        store.append_columns({
+            'national_id': [rng.randrange(10 ** 10) for _ in range(2000)],
+            'first_name': [rng.choice(names) for _ in range(2000)],
+            'last_name': [rng.choice(names) for _ in range(2000)],
+        })
+    return store, index, rng
+
+
+def scan(store, query):
+    words = normalize_text(query).split()
+    columns = [store.column_index['first_name'], store.column_index['last_name']]
+    rows = []
+    for row in range(len(store)):
+        tokens = [token for column in columns for token in normalize_text(store.value(row, column)).split()]
+        if all(any(token.startswith(word) for token in tokens) for word in words):
+            rows.append(row)
+    return rows
+
+
+def test_name_queries_match_a_scan(indexed):
+    store, index, _ = indexed
+    for query in QUERIES:
+        assert list(index.search(query)) == scan(store, query), query
+
+
+def test_edited_names_match_a_scan(indexed):
+    store, index, rng = indexed
+    for _ in range(3):
+        store.update_many('first_name', {row: f"نام{rng.randrange(500)} نام12{rng.randrange(10)}"
+                                         for row in rng.sample(range(len(store)), 300)})
+        store.update_many('last_name', {row: f"نام{rng.randrange(500)}"
+                                        for row in rng.sample(range(len(store)), 300)})
+        for query in QUERIES:
+            assert list(index.search(query)) == scan(store, query), query
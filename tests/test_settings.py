@@ -0,0 +1,108 @@
+"""Settings store: validation, environment overrides and write-behind retries."""
+import sqlite3
+import time
+
+import pytest
+
+from core.settings import SettingsStore
+
+
+class BrokenConnection:
+    """Stands in for the store's connection while the disk is unwritable."""
+
+    def __init__(self):
+        self.attempts = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, sql, *args):
+        self.attempts += 1
+        raise sqlite3.OperationalError("disk I/O error")
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'settings.db')
+
+
+def open_store(path, environ=None):
+    return SettingsStore(path, environ=environ or {})
+
+
+def test_malformed_environment_override_is_ignored(path, caplog):
+    store = open_store(path, {'YARA_BOT_PROCESSES': 'abc', 'YARA_STALL_MS': '20'})
+    try:
+        assert store['bots.processes'] == 0
+        assert 'bots.processes' not in store.overridden
+        assert store['ui.stall_ms'] == 20.0
+        assert 'ui.stall_ms' in store.overridden
+    finally:
+        store.close()
+    assert 'YARA_BOT_PROCESSES' in caplog.text
+
+
+def test_update_applies_nothing_when_a_value_is_invalid(path):
+    store = open_store(path)
+    heard = []
+    store.add_listener(heard.append)
+    try:
+        with pytest.raises(ValueError):
+            store.update({'bots.timeout': 30, 'bots.bank_limit': 'many'})
+        assert store['bots.timeout'] == 120.0
+        assert store['bots.bank_limit'] == 64
+        assert heard == []
+        assert store.flush()
+        assert store.stats['rows_written'] == 0
+    finally:
+        store.close()
+
+
+def test_failed_write_keeps_changes_for_the_next_flush(path):
+    store = open_store(path)
+    connection = store._connection
+    try:
+        store._connection = broken = BrokenConnection()
+        store.set('bots.timeout', 30)
+        assert not store.flush()
+        assert broken.attempts == 1
+        # A newer value queued after the failure wins over the one put back
+        store._pending['bots.timeout'] = 45.0
+        store._write({'bots.timeout': 30.0, 'net.host_limit': 8})
+        assert store._pending == {'bots.timeout': 45.0, 'net.host_limit': 8}
+    finally:
+        store._connection = connection
+        store.close()
+
+    reopened = open_store(path)
+    try:
+        assert reopened['bots.timeout'] == 45.0
+        assert reopened['net.host_limit'] == 8
+    finally:
+        reopened.close()
+
+
+def test_writer_retries_after_a_failure(path):
+    store = open_store(path)
+    store.FLUSH_DELAY = store.MAX_DELAY = 0.01
+    store.RETRY_DELAY = 0.05
+    connection = store._connection
+    try:
+        store._connection = broken = BrokenConnection()
+        store.set('bots.max_attempts', 9)
+        deadline = time.monotonic() + 5.0
+        while broken.attempts < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert broken.attempts >= 2
+    finally:
+        store._connection = connection
+        store.close()
+
+    reopened = open_store(path)
+    try:
+        assert reopened['bots.max_attempts'] == 9
+    finally:
+        reopened.close()
@@ -0,0 +1,165 @@
+"""Transport behaviour against the bundled mock bank (core.testing.mock_bank)."""
+import asyncio
+
+import pytest
+
+from core.net.http import HttpError, host_header, json_body
+from core.net.transport import CookieJar, Transport
+from core.testing.mock_bank import MockBankThread
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def pool_stats(transport):
+    (stats,) = transport.stats().values()
+    return stats
+
+
+def test_sequential_requests_reuse_one_connection():
+    with MockBankThread() as bank:
+        async def scenario():
+            transport = Transport()
+            for _ in range(5):
+                response = await transport.request('GET', bank.base_url + '/health')
+                assert json_body(response) == {'ok': True}
+            stats = pool_stats(transport)
+            transport.close()
+            return stats
+
+        stats = run(scenario())
+    assert stats['opened'] == 1
+    assert stats['reused'] == 4
+    assert stats['requests'] == 5
+    assert bank.connections == 1
+
+
+def test_connections_per_host_are_capped():
+    with MockBankThread(latency=0.02) as bank:
+        async def scenario():
+            transport = Transport(host_limit=3)
+            await asyncio.gather(*(transport.request('GET', bank.base_url + '/health')
+                                   for _ in range(20)))
+            stats = pool_stats(transport)
+            transport.close()
+            return stats
+
+        stats = run(scenario())
+    assert stats['opened'] <= 3
+    assert stats['requests'] == 20
+    assert bank.connections <= 3
+
+
+def test_cookie_jars_keep_sessions_apart():
+    with MockBankThread() as bank:
+        async def scenario():
+            transport = Transport(host_limit=1)    # both sessions share one connection
+            first, second = CookieJar(), CookieJar()
+            await transport.request('POST', bank.base_url + '/login', body={'national_id': '0011111111'},
+                                    jar=first)
+            await transport.request('POST', bank.base_url + '/login', body={'national_id': '0022222222'},
+                                    jar=second)
+            results = [await transport.request('POST', bank.base_url + '/register', body={}, jar=jar)
+                       for jar in (first, second, None)]
+            transport.close()
+            return first, second, results
+
+        first, second, (registered_first, registered_second, anonymous) = run(scenario())
+    host = '127.0.0.1'
+    assert first.header(host) != second.header(host)
+    assert json_body(registered_first)['national_id'] == '0011111111'
+    assert json_body(registered_second)['national_id'] == '0022222222'
+    assert anonymous.status == 401
+
+
+class DroppingServer:
+    """Answers the first request on each connection and drops the connection
+    on the second without answering, like a server timing out an idle
+    keep-alive connection just as the client reuses it."""
+
+    def __init__(self):
+        self.requests = []
+        self.hosts = []
+        self.connections = 0
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, '127.0.0.1', 0)
+        self.url = f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+        return self
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        served = 0
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            while (line := await reader.readline()) not in (b'\r\n', b''):
+                name, _, value = line.decode('latin-1').partition(':')
+                if name.lower() == 'host':
+                    self.hosts.append(value.strip())
+            self.requests.append(request_line.split(b' ')[0].decode())
+            served += 1
+            if served > 1:
+                break
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\nConnection: keep-alive\r\n\r\nok")
+            await writer.drain()
+        writer.close()
+
+    def stop(self):
+        self.server.close()
+
+
+def test_idempotent_request_is_retried_on_a_dropped_connection():
+    async def scenario():
+        server = await DroppingServer().start()
+        transport = Transport()
+        await transport.request('GET', server.url + '/')
+        response = await transport.request('GET', server.url + '/')
+        transport.close()
+        server.stop()
+        return server, response
+
+    server, response = run(scenario())
+    assert response.body == b'ok'
+    assert server.requests == ['GET', 'GET', 'GET']
+    assert server.connections == 2
+
+
+def test_post_is_not_resent_once_written():
+    async def scenario():
+        server = await DroppingServer().start()
+        transport = Transport()
+        await transport.request('GET', server.url + '/')
+        try:
+            with pytest.raises((HttpError, ConnectionError, asyncio.IncompleteReadError)):
+                await transport.request('POST', server.url + '/register', body={'x': 1})
+        finally:
+            transport.close()
+            server.stop()
+        return server
+
+    server = run(scenario())
+    # The bank may have acted on it, so it went out exactly once
+    assert server.requests == ['GET', 'POST']
+    assert server.connections == 1
+
+
+def test_host_header_names_a_non_default_port():
+    assert host_header('http', 'bank.example', 80) == 'bank.example'
+    assert host_header('https', 'bank.example', 443) == 'bank.example'
+    assert host_header('http', 'bank.example', 8080) == 'bank.example:8080'
+    assert host_header('https', 'bank.example', 80) == 'bank.example:80'
+    assert host_header('http', '::1', 8800) == '[::1]:8800'
+
+    async def scenario():
+        server = await DroppingServer().start()
+        transport = Transport()
+        await transport.request('GET', server.url + '/')
+        transport.close()
+        server.stop()
+        return server
+
+    server = run(scenario())
+    assert server.hosts == [server.url.split('//', 1)[1]]
@@ -0,0 +1,85 @@
+import sys
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtGui import QFont
+from PyQt5.QtCore import QTimer
+
+from ui.main_window import MainWindow
+from core import instrument
+from core.bots.engine import shutdown_engine
+from core.logs import install_log_handler
+from core.news import start_news_refresh
+
+
+def resume_queues():
+    # Deferred imports: the durable queues (and sqlite3) stay off the startup path
+    from core.bots.jobs import resume_jobs
+    from core.notifications import resume_notifications
+    resume_jobs()
+    resume_notifications()
+
+
+def shutdown_background():
+    watchdog = sys.modules.get('core.watchdog')
+    if watchdog is not None:
+        # The event loop has stopped beating; winding down is not a stall
+        watchdog.stop_watchdog()
+    importer = sys.modules.get('ui.workers.applicant_import')
+    if importer is not None:
+        importer.stop_sort_warmer()
+    jobs = sys.modules.get('core.bots.jobs')
+    if jobs is not None:
+        # No new leases; jobs cancelled by the engine stopping go back to the queue
+        jobs.stop_job_runner()
+    shutdown_engine()
+    # The worker pool module is only imported in process mode (bots.processes > 0)
+    process_pool = sys.modules.get('core.bots.process_pool')
+    if process_pool is not None:
+        process_pool.shutdown_process_pool()
+    if jobs is not None:
+        jobs.close_job_queue()
+    notifications = sys.modules.get('core.notifications')
+    if notifications is not None:
+        notifications.close_notifications()
+    # Icons drawn this run are loaded from one image next time
+    icons = sys.modules.get('ui.icons')
+    if icons is not None:
+        icons.save_icon_cache()
+    # Last, so settings changed while bots wound down still reach disk
+    settings = sys.modules.get('core.settings')
+    if settings is not None:
+        settings.close_settings()
+    instrument.stop_exporter()
+
+
+def main(argv=None):
+    app = QApplication(sys.argv if argv is None else argv)
+    
+    # YARA_INSTRUMENT=1 / YARA_METRICS_FILE=metrics.jsonl; F12 shows the overlay
+    instrument.configure_from_env()
+    
+    # Set application font (using a default font that supports RTL)
+    font = QFont("Arial", 10)
+    font.setStyleStrategy(QFont.PreferAntialias)
+    app.setFont(font)
+    
+    # App logs feed the live console page
+    install_log_handler()
+    
+    # Bot sessions still running are cancelled before the loop thread exits,
+    # and queued settings writes are flushed
+    app.aboutToQuit.connect(shutdown_background)
+    
+    window = MainWindow()
+    window.show()
+    
+    # The news page renders from the disk copy; refreshing can wait for startup
+    QTimer.singleShot(1000, start_news_refresh)
+    # Registrations and messages left unfinished by a previous run (or a crash) resume
+    QTimer.singleShot(1500, resume_queues)
+    
+    return app.exec_()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtCore import Qt, QRectF, QTimer
+from PyQt5.QtGui import QPainter, QPalette, QColor, QAbstractTextDocumentLayout
+
+from ui.styles.colors import THEME
+
+
+class DocumentView(QWidget):
+    """Paints a run of tutorial sections, laying out only those in view.
+    
+    Meant to sit in a resizable QScrollArea. Sections outside the exposed
+    rectangle keep an estimated height and are never laid out; a section
+    gets its real height the first time it is painted.
+    """
+    
+    SECTION_SPACING = 24
+    # Keeps text clear of the scroll bar on the leading (right) edge
+    PADDING = 16
+    
+    def __init__(self, cache, parent=None):
+        super().__init__(parent)
+        self.cache = cache
+        self.source = None
+        self.indexes = ()
+        self.heights = []
+        self.exact = []
+        self.layout_width = 0
+        
+        self.text_color = QColor(THEME['dark_text'])
+        self.link_color = QColor(THEME['primary_light'])
+        
+        # Heights found while painting are applied after the paint finishes
+        self.height_timer = QTimer(self)
+        self.height_timer.setSingleShot(True)
+        self.height_timer.setInterval(0)
+        self.height_timer.timeout.connect(self.update_height)
+        
+    def set_sections(self, source, indexes):
+        self.source = source
+        self.indexes = tuple(indexes)
+        self.layout_width = self.text_width()
+        self.heights = [self.estimate_height(index) for index in self.indexes]
+        self.exact = [False] * len(self.indexes)
+        self.update_height()
+        self.update()
+        
+    def estimate_height(self, index):
+        metrics = self.fontMetrics()
+        chars_per_line = max(1, self.layout_width // max(1, metrics.averageCharWidth()))
+        text = self.source.sections[index].source
+        lines = sum(len(line) // chars_per_line + 1 for line in text.splitlines())
+        return int(lines * metrics.lineSpacing() * 1.2)
+        
+    def text_width(self):
+        return max(self.width() - 2 * self.PADDING, 1)
+        
+    def update_height(self):
+        total = sum(self.heights) + self.SECTION_SPACING * max(0, len(self.heights) - 1)
+        if self.minimumHeight() != total:
+            self.setMinimumHeight(total)
+            
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        width = self.text_width()
+        if self.source is None or width == self.layout_width:
+            return
+        # Text reflows at the new width; rescale heights until repainted
+        scale = self.layout_width / width
+        self.heights = [int(height * scale) for height in self.heights]
+        self.exact = [False] * len(self.indexes)
+        self.layout_width = width
+        self.update_height()
+        
+    def paintEvent(self, event):
+        if self.source is None:
+            return
+        painter = QPainter(self)
+        exposed = event.rect()
+        context = QAbstractTextDocumentLayout.PaintContext()
+        context.palette.setColor(QPalette.Text, self.text_color)
+        context.palette.setColor(QPalette.Link, self.link_color)
+        
+        top = 0
+        for position, index in enumerate(self.indexes):
+            height = self.heights[position]
+            if top > exposed.bottom():
+                break
+            if top + height >= exposed.top():
+                doc = self.cache.document(self.source, index, self.layout_width)
+                real_height = int(doc.size().height())
+                if not self.exact[position] or real_height != height:
+                    self.exact[position] = True
+                    self.heights[position] = height = real_height
+                    self.height_timer.start()
+                painter.save()
+                painter.translate(self.PADDING, top)
+                context.clip = QRectF(exposed.translated(-self.PADDING, -top))
+                doc.documentLayout().draw(painter, context)
+                painter.restore()
+            top += height + self.SECTION_SPACING
+            
+    def laid_out(self):
+        return sum(self.exact)
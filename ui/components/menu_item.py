@@ -0,0 +1,181 @@
+from collections import namedtuple
+
+from PyQt5.QtWidgets import QWidget, QSizePolicy
+from PyQt5.QtCore import Qt, QPointF, QRect, QRectF, QSize, pyqtSignal
+from PyQt5.QtGui import QColor, QFont, QFontMetrics, QPainter, QStaticText, QTextOption
+
+from ui.icons import get_icon_service
+from ui.styles.colors import THEME
+
+# Geometry in pixels; colors are THEME tokens
+MenuStyle = namedtuple(
+    'MenuStyle',
+    'height padding spacing radius icon_size font_px background hover pressed text pressed_text pressed_bold'
+)
+
+ITEM_STYLE = MenuStyle(38, 15, 10, 8, 18, 14, 'dark_secondary', 'dark_hover', 'dark_active',
+                       'dark_text', 'light_text', False)
+SUBMENU_STYLE = MenuStyle(32, 12, 8, 6, 16, 13, 'submenu_bg', 'dark_hover', 'primary_dark',
+                          'dark_text', 'light_text', True)
+
+# How far the content moves on hover, like the old padding-right rule
+HOVER_SHIFT = 3
+
+
+def theme_color(token):
+    value = THEME[token]
+    if value.startswith('rgba('):
+        # QColor has no rgba() parser; alpha here is 0-1 as in the stylesheet
+        red, green, blue, alpha = (part.strip() for part in value[5:-1].split(','))
+        return QColor(int(red), int(green), int(blue), round(float(alpha) * 255))
+    return QColor(value)
+
+
+class MenuItem(QWidget):
+    """A sidebar entry painted in one widget: background, icon and text.
+    
+    Stands in for a QPushButton with a layout and two labels, so an entry is
+    one QObject and one paint instead of four widgets, a layout pass and a
+    style polish each. The icon sits on the right with the text to its
+    left, as Persian reads. The text is laid out once per width (and weight)
+    and kept as a QStaticText. Emits clicked(bool) on release like a button,
+    and `page`, `text` and `icon` are kept as properties as before.
+    """
+    
+    clicked = pyqtSignal(bool)
+    
+    _palettes = {}
+    
+    def __init__(self, text, icon=None, page=None, style=ITEM_STYLE, parent=None):
+        super().__init__(parent)
+        self.text = text
+        self.icon = icon
+        self.menu_style = style
+        self.icons = get_icon_service()
+        self.text_visible = True
+        self.hovered = False
+        self.pressed = False
+        self._layouts = {}
+        
+        self.setProperty('page', page)
+        self.setProperty('text', text)
+        self.setProperty('icon', icon)
+        self.setAccessibleName(text)
+        self.setCursor(Qt.PointingHandCursor)
+        self.setFocusPolicy(Qt.StrongFocus)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.setFixedHeight(style.height)
+        
+        font = QFont(self.font())
+        font.setPixelSize(style.font_px)
+        self.setFont(font)
+    
+    def theme_colors(self):
+        colors = self._palettes.get(self.menu_style)
+        if colors is None:
+            colors = self._palettes[self.menu_style] = {
+                field: theme_color(getattr(self.menu_style, field))
+                for field in ('background', 'hover', 'pressed', 'text', 'pressed_text')
+            }
+        return colors
+    
+    def sizeHint(self):
+        style = self.menu_style
+        text_width = QFontMetrics(self.font()).horizontalAdvance(self.text) if self.text_visible else 0
+        return QSize(style.padding * 2 + style.icon_size + style.spacing + text_width, style.height)
+    
+    def set_text_visible(self, visible):
+        if self.text_visible != visible:
+            self.text_visible = visible
+            self.updateGeometry()
+            self.update()
+    
+    def set_text(self, text):
+        self.text = text
+        self.setProperty('text', text)
+        self.setAccessibleName(text)
+        self._layouts.clear()
+        self.updateGeometry()
+        self.update()
+    
+    def text_layout(self, width, bold):
+        # Elided and shaped once per available width; hover and press repaint from it
+        key = (width, bold)
+        static = self._layouts.get(key)
+        if static is None:
+            if len(self._layouts) > 8:
+                self._layouts.clear()
+            font = QFont(self.font())
+            font.setBold(bold)
+            elided = QFontMetrics(font).elidedText(self.text, Qt.ElideRight, width)
+            static = QStaticText(elided)
+            option = QTextOption(Qt.AlignRight | Qt.AlignVCenter)
+            option.setTextDirection(Qt.RightToLeft)
+            static.setTextOption(option)
+            static.setTextFormat(Qt.PlainText)
+            static.prepare(font=font)
+            self._layouts[key] = (static, font)
+        return self._layouts[key]
+    
+    def paintEvent(self, event):
+        style = self.menu_style
+        colors = self.theme_colors()
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        
+        if self.pressed:
+            background, text_color = colors['pressed'], colors['pressed_text']
+        elif self.hovered:
+            background, text_color = colors['hover'], colors['text']
+        else:
+            background, text_color = colors['background'], colors['text']
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(background)
+        painter.drawRoundedRect(QRectF(self.rect()), style.radius, style.radius)
+        
+        width, height = self.width(), self.height()
+        right = width - style.padding - (HOVER_SHIFT if self.hovered and not self.pressed else 0)
+        if self.icon:
+            size = style.icon_size
+            left = right - size if self.text_visible else (width - size) // 2
+            self.icons.paint(painter, QRect(left, (height - size) // 2, size, size), self.icon)
+            right = left - style.spacing
+        
+        if self.text_visible and self.text and right > style.padding:
+            static, font = self.text_layout(right - style.padding, self.pressed and style.pressed_bold)
+            text_size = static.size()
+            painter.setFont(font)
+            painter.setPen(text_color)
+            painter.drawStaticText(QPointF(right - text_size.width(), (height - text_size.height()) / 2), static)
+    
+    def enterEvent(self, event):
+        self.hovered = True
+        self.update()
+        super().enterEvent(event)
+    
+    def leaveEvent(self, event):
+        self.hovered = False
+        self.update()
+        super().leaveEvent(event)
+    
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self.pressed = True
+            self.update()
+        else:
+            super().mousePressEvent(event)
+    
+    def mouseReleaseEvent(self, event):
+        if event.button() != Qt.LeftButton or not self.pressed:
+            super().mouseReleaseEvent(event)
+            return
+        self.pressed = False
+        self.update()
+        if self.rect().contains(event.pos()):
+            self.clicked.emit(False)
+    
+    def keyPressEvent(self, event):
+        if event.key() in (Qt.Key_Space, Qt.Key_Return, Qt.Key_Enter) and not event.isAutoRepeat():
+            self.clicked.emit(False)
+        else:
+            super().keyPressEvent(event)
@@ -0,0 +1,127 @@
+from PyQt5.QtWidgets import QApplication, QLabel
+from PyQt5.QtCore import Qt, QObject, QTimer, QElapsedTimer
+
+from core import instrument
+
+
+class PerfProbe(QObject):
+    """Samples the GUI thread while instruments are enabled.
+    
+    A timer asks to run every frame; how far apart the ticks really land is
+    the frame time, and how late they are is the event loop latency. Once a
+    second the readings of the past second become gauges, together with the
+    live widget and QObject counts, so the overlay and the JSONL exporter
+    see the same numbers.
+    """
+    
+    FRAME_MS = 16
+    GAUGE_MS = 1000
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.clock = QElapsedTimer()
+        self.frames = 0
+        self.frame_total = 0
+        self.frame_max = 0
+        
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setTimerType(Qt.PreciseTimer)
+        self.frame_timer.timeout.connect(self.on_frame)
+        self.gauge_timer = QTimer(self)
+        self.gauge_timer.timeout.connect(self.update_gauges)
+    
+    def start(self):
+        if not self.frame_timer.isActive():
+            self.clock.start()
+            self.frame_timer.start(self.FRAME_MS)
+            self.gauge_timer.start(self.GAUGE_MS)
+    
+    def stop(self):
+        self.frame_timer.stop()
+        self.gauge_timer.stop()
+    
+    def on_frame(self):
+        interval = self.clock.restart()
+        self.frames += 1
+        self.frame_total += interval
+        self.frame_max = max(self.frame_max, interval)
+        instrument.sample('ui.frame', interval)
+        instrument.sample('ui.loop_latency', max(0, interval - self.FRAME_MS))
+    
+    def update_gauges(self):
+        if self.frames:
+            instrument.gauge('ui.frame_ms', self.frame_total / self.frames)
+            instrument.gauge('ui.frame_max_ms', self.frame_max)
+            instrument.gauge('ui.loop_latency', max(0, self.frame_max - self.FRAME_MS))
+        self.frames = self.frame_total = self.frame_max = 0
+        instrument.gauge('ui.widgets', len(QApplication.allWidgets()))
+        instrument.gauge('ui.qobjects', self.qobject_count())
+    
+    @staticmethod
+    def qobject_count():
+        # Objects reachable from the application and its windows; parentless
+        # helpers (timers, models) owned only from Python are not included
+        app = QApplication.instance()
+        count = 1 + len(app.findChildren(QObject))
+        for widget in app.topLevelWidgets():
+            count += 1 + len(widget.findChildren(QObject))
+        return count
+
+
+class PerfOverlay(QLabel):
+    """Frame time, loop latency, object counts and the slowest recent operations.
+    
+    Floats over the top-left corner of its parent and ignores the mouse.
+    Showing it turns instruments on; hiding it turns them off again unless
+    they were on before (YARA_INSTRUMENT).
+    """
+    
+    REFRESH_MS = 500
+    SLOWEST = 6
+    
+    def __init__(self, probe, parent):
+        super().__init__(parent)
+        self.setObjectName("perfOverlay")
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setLayoutDirection(Qt.LeftToRight)
+        self.setAlignment(Qt.AlignLeft | Qt.AlignTop)
+        self.setTextFormat(Qt.PlainText)
+        self.probe = probe
+        self.was_enabled = instrument.enabled()
+        
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.hide()
+    
+    def toggle(self):
+        if self.isVisible():
+            self.refresh_timer.stop()
+            self.hide()
+            if not self.was_enabled:
+                self.probe.stop()
+                instrument.enable(False)
+        else:
+            self.was_enabled = instrument.enabled()
+            instrument.enable()
+            self.probe.start()
+            self.refresh()
+            self.show()
+            self.raise_()
+            self.refresh_timer.start(self.REFRESH_MS)
+    
+    def refresh(self):
+        snapshot = instrument.instruments.snapshot(self.SLOWEST)
+        gauges = snapshot['gauges']
+        lines = [
+            f"frame      {gauges.get('ui.frame_ms', 0):6.1f} ms   max {gauges.get('ui.frame_max_ms', 0):6.1f} ms",
+            f"ui loop    {gauges.get('ui.loop_latency', 0):6.1f} ms late",
+        ]
+        if 'bots.loop_latency' in gauges:
+            lines.append(f"bot loop   {gauges['bots.loop_latency']:6.1f} ms late")
+        lines.append(f"widgets    {gauges.get('ui.widgets', 0):6,}   qobjects {gauges.get('ui.qobjects', 0):,}")
+        if snapshot['slowest']:
+            lines.append("slowest")
+            lines.extend(f"  {op['ms']:8.1f} ms  {op['name']}" for op in snapshot['slowest'])
+        self.setText("\n".join(lines))
+        self.adjustSize()
+        self.move(12, 12)
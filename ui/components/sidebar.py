@@ -1,20 +1,68 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-                             QLabel, QScrollArea, QFrame, QSizePolicy)
-from PyQt5.QtCore import Qt, QSize
-from PyQt5.QtGui import QFont
+                             QLabel, QScrollArea, QFrame)
+from PyQt5.QtCore import Qt, QPoint, QRect, QPropertyAnimation, QVariantAnimation, QEasingCurve
+from PyQt5.QtGui import QPainter
+
+from ui.components.menu_item import MenuItem, ITEM_STYLE, SUBMENU_STYLE
+from ui.routes import ROUTES, SIDEBAR_GROUPS
+from core import instrument
+
+QWIDGETSIZE_MAX = (1 << 24) - 1
+
+
+class SubmenuFrame(QFrame):
+    """Submenu container that paints a cached snapshot while it animates.
+    
+    During the height animation its children are hidden, so each frame only
+    costs one pixmap blit regardless of how many entries the submenu holds.
+    """
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("sidebarSubmenu")
+        self.snapshot = None
+        self.animating = False
+        self.is_open = True
+        
+    def set_children_visible(self, visible):
+        for child in self.findChildren(QWidget, options=Qt.FindDirectChildrenOnly):
+            child.setVisible(visible)
+        
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.animating and self.snapshot is not None:
+            QPainter(self).drawPixmap(0, 0, self.snapshot)
+
 
-from ..styles.colors import *
 
 class Sidebar(QWidget):
+    EXPANDED_WIDTH = 220
+    COLLAPSED_WIDTH = 80
+    ANIMATION_MS = 180
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
         self.is_collapsed = False
+        
+        # Every menu entry, including those inside submenus, so collapse and
+        # expand never have to walk layouts or search children
+        self.items = []
+        self.submenus = {}
+        
+        # Collapse animation: a pixmap of the expanded sidebar slides over
+        # the window while the real sidebar is laid out only once
+        self.expanded_snapshot = None
+        self.overlay = None
+        self.width_animation = None
+        self.submenu_animation = None
+        
         self.setup_ui()
         
     def setup_ui(self):
-        self.setFixedWidth(220)
-        self.setStyleSheet(f"background-color: {DARK_BG}; border-left: 1px solid {DARK_BORDER};")
+        self.setFixedWidth(self.EXPANDED_WIDTH)
+        self.setObjectName("sidebar")
+        self.setAttribute(Qt.WA_StyledBackground, True)
         
         # Main layout
         layout = QVBoxLayout(self)
@@ -24,24 +72,17 @@ class Sidebar(QWidget):
         # Sidebar header
         header = QWidget()
         header.setFixedHeight(60)
-        header.setStyleSheet(f"background-color: {DARK_BG}; border-bottom: 1px solid {DARK_BORDER};")
+        header.setObjectName("sidebarHeader")
+        header.setAttribute(Qt.WA_StyledBackground, True)
         header_layout = QHBoxLayout(header)
         header_layout.setContentsMargins(13, 0, 13, 0)
         
         self.logo = QLabel("Fanus")
-        self.logo.setStyleSheet("color: white; font-weight: bold; font-size: 16px;")
+        self.logo.setObjectName("sidebarLogo")
         
         self.profile = QLabel("U")
         self.profile.setFixedSize(36, 36)
-        self.profile.setStyleSheet(f"""
-            QLabel {{
-                background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1, stop: 0 {PRIMARY_COLOR}, stop: 1 {PRIMARY_LIGHT});
-                color: white;
-                font-weight: bold;
-                border-radius: 18px;
-                qproperty-alignment: AlignCenter;
-            }}
-        """)
+        self.profile.setObjectName("sidebarProfile")
         
         header_layout.addWidget(self.profile)
         header_layout.addWidget(self.logo)
@@ -51,27 +92,10 @@ class Sidebar(QWidget):
         scroll_area = QScrollArea()
         scroll_area.setWidgetResizable(True)
         scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        scroll_area.setStyleSheet(f"""
-            QScrollArea {{
-                border: none;
-                background-color: {DARK_BG};
-            }}
-            QScrollBar:vertical {{
-                border: none;
-                background: {DARK_BG};
-                width: 5px;
-                margin: 0px;
-            }}
-            QScrollBar::handle:vertical {{
-                background: {PRIMARY_COLOR};
-                border-radius: 2px;
-            }}
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
-                height: 0px;
-            }}
-        """)
+        scroll_area.setObjectName("sidebarScroll")
         
         self.menu_widget = QWidget()
+        self.menu_widget.setObjectName("sidebarMenu")
         self.menu_layout = QVBoxLayout(self.menu_widget)
         self.menu_layout.setContentsMargins(10, 13, 10, 13)
         self.menu_layout.setSpacing(4)
@@ -90,159 +114,123 @@ class Sidebar(QWidget):
         # Toggle button
         self.toggle_btn = QPushButton()
         self.toggle_btn.setFixedSize(28, 28)
-        self.toggle_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {DARK_BG};
-                border: 1px solid {DARK_BORDER};
-                border-radius: 14px;
-                color: {DARK_TEXT};
-            }}
-            QPushButton:hover {{
-                background-color: {DARK_HOVER};
-            }}
-        """)
+        self.toggle_btn.setObjectName("sidebarToggle")
         self.toggle_btn.setText("→")
         
         # Connect toggle button
         self.toggle_btn.clicked.connect(self.toggle_sidebar)
         
     def create_menu_items(self):
-        # Home
-        self.add_menu_item("صفحه اصلی", "home", "🏠")
-        
-        # Settings
-        self.add_menu_item("تنظیمات", "settings", "⚙️")
-        
-        # Robots menu with submenu
-        robots_item = self.add_menu_item("ربات ها", None, "🤖", has_submenu=True)
-        
-        # Submenu for robots
-        submenu_frame = QFrame()
-        submenu_frame.setStyleSheet(f"background-color: rgba(42, 42, 61, 0.7); border-radius: 6px; margin: 5px 0px;")
-        submenu_layout = QVBoxLayout(submenu_frame)
-        submenu_layout.setContentsMargins(15, 8, 15, 8)
-        submenu_layout.setSpacing(3)
-        
-        # Submenu items
-        self.add_submenu_item(submenu_layout, "ربات وام ازدواج", "marriage-loan", "❤️")
-        self.add_submenu_item(submenu_layout, "ربات وام فرزند", "child-loan", "👶")
-        
-        self.menu_layout.addWidget(submenu_frame)
-        
-        # News
-        self.add_menu_item("اخبار", "news", "📰")
-        
-        # Education
-        self.add_menu_item("آموزش ها", "education", "🎓")
-        
-        # Contact
-        self.add_menu_item("ارتباط با ما", "contact", "✉️")
+        # Entries come from the route table, in route order
+        group_layouts = {}
+        for route in ROUTES.values():
+            entry = route.sidebar
+            if entry is None:
+                continue
+            if entry.group is None:
+                self.add_menu_item(entry.text, route.route_id, entry.icon)
+                continue
+            
+            if entry.group not in group_layouts:
+                group_text, group_icon = SIDEBAR_GROUPS[entry.group]
+                header_btn = self.add_menu_item(group_text, None, group_icon, has_submenu=True)
+                
+                submenu_frame = SubmenuFrame()
+                submenu_layout = QVBoxLayout(submenu_frame)
+                submenu_layout.setContentsMargins(15, 8, 15, 8)
+                submenu_layout.setSpacing(3)
+                self.menu_layout.addWidget(submenu_frame)
+                self.submenus[header_btn] = submenu_frame
+                group_layouts[entry.group] = submenu_layout
+            
+            self.add_submenu_item(group_layouts[entry.group], entry.text, route.route_id, entry.icon)
     
     def add_menu_item(self, text, page, icon, has_submenu=False):
-        btn = QPushButton()
-        btn.setProperty('page', page)
-        btn.setProperty('has_submenu', has_submenu)
-        btn.setProperty('text', text)
-        btn.setProperty('icon', icon)
-        btn.setCursor(Qt.PointingHandCursor)
-        
-        # Create layout for icon and text
-        btn_layout = QHBoxLayout(btn)
-        btn_layout.setContentsMargins(15, 10, 15, 10)
-        btn_layout.setSpacing(10)
-        
-        icon_label = QLabel(icon)
-        icon_label.setStyleSheet(f"color: {DARK_TEXT}; font-size: 16px;")
-        
-        text_label = QLabel(text)
-        text_label.setStyleSheet(f"color: {DARK_TEXT}; font-size: 14px;")
-        text_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-        
-        btn_layout.addWidget(icon_label)
-        btn_layout.addWidget(text_label)
-        btn_layout.addStretch()
-        
-        # Set style with hover effects
-        btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {DARK_SECONDARY};
-                color: {DARK_TEXT};
-                border: none;
-                border-radius: 8px;
-                text-align: right;
-            }}
-            QPushButton:hover {{
-                background-color: {DARK_HOVER};
-                padding-right: 3px;
-            }}
-            QPushButton:pressed {{
-                background-color: {DARK_ACTIVE};
-                color: white;
-            }}
-        """)
+        item = MenuItem(text, icon, page, ITEM_STYLE)
+        item.setProperty('has_submenu', has_submenu)
         
         # Connect click event
         if page:
-            btn.clicked.connect(lambda: self.parent.change_page(page))
+            item.clicked.connect(lambda: self.parent.change_page(page))
         elif has_submenu:
-            btn.clicked.connect(self.toggle_submenu)
+            item.clicked.connect(lambda: self.toggle_submenu(item))
         
-        self.menu_layout.addWidget(btn)
-        return btn
+        self.menu_layout.addWidget(item)
+        self.add_item(item)
+        return item
     
     def add_submenu_item(self, layout, text, page, icon):
-        btn = QPushButton()
-        btn.setProperty('page', page)
-        btn.setProperty('text', text)
-        btn.setProperty('icon', icon)
-        btn.setCursor(Qt.PointingHandCursor)
-        
-        # Create layout for icon and text
-        btn_layout = QHBoxLayout(btn)
-        btn_layout.setContentsMargins(12, 8, 12, 8)
-        btn_layout.setSpacing(8)
-        
-        icon_label = QLabel(icon)
-        icon_label.setStyleSheet(f"color: {DARK_TEXT}; font-size: 14px;")
-        
-        text_label = QLabel(text)
-        text_label.setStyleSheet(f"color: {DARK_TEXT}; font-size: 13px;")
-        text_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-        
-        btn_layout.addWidget(icon_label)
-        btn_layout.addWidget(text_label)
-        btn_layout.addStretch()
-        
-        # Set style with hover effects
-        btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: rgba(42, 42, 61, 0.7);
-                color: {DARK_TEXT};
-                border: none;
-                border-radius: 6px;
-                text-align: right;
-            }}
-            QPushButton:hover {{
-                background-color: {DARK_HOVER};
-                padding-right: 3px;
-                opacity: 1;
-            }}
-            QPushButton:pressed {{
-                background-color: {PRIMARY_DARK};
-                color: white;
-                font-weight: bold;
-            }}
-        """)
+        item = MenuItem(text, icon, page, SUBMENU_STYLE)
+        item.clicked.connect(lambda: self.parent.change_page(page))
         
-        # Connect click event
-        btn.clicked.connect(lambda: self.parent.change_page(page))
-        
-        layout.addWidget(btn)
-        return btn
+        layout.addWidget(item)
+        self.add_item(item)
+        return item
+    
+    def add_item(self, item):
+        self.items.append(item)
+        if self.is_collapsed:
+            item.set_text_visible(False)
+        # The cached expanded image no longer matches the menu
+        self.expanded_snapshot = None
+    
+    def toggle_submenu(self, header_btn):
+        frame = self.submenus.get(header_btn)
+        if frame is None:
+            return
+        self.finish_submenu_animation()
+        # The cached expanded image shows the submenus as they were
+        self.expanded_snapshot = None
+        
+        if not self.isVisible() or not self.ANIMATION_MS:
+            frame.is_open = not frame.is_open
+            frame.setVisible(frame.is_open)
+            return
+        
+        if frame.is_open:
+            frame.snapshot = frame.grab()
+            start, end = frame.height(), 0
+        elif frame.snapshot is not None:
+            start, end = 0, frame.snapshot.height() // max(1, int(frame.snapshot.devicePixelRatio()))
+        else:
+            # Never shown open since the menu changed, so nothing to animate
+            frame.is_open = True
+            frame.show()
+            return
+        
+        frame.is_open = not frame.is_open
+        frame.animating = True
+        frame.set_children_visible(False)
+        frame.setFixedHeight(start)
+        frame.show()
+        
+        self.submenu_animation = QVariantAnimation(self)
+        self.submenu_animation.setDuration(self.ANIMATION_MS)
+        self.submenu_animation.setEasingCurve(QEasingCurve.OutCubic)
+        self.submenu_animation.setStartValue(start)
+        self.submenu_animation.setEndValue(end)
+        self.submenu_animation.valueChanged.connect(frame.setFixedHeight)
+        self.submenu_animation.finished.connect(lambda: self.end_submenu_animation(frame))
+        self.submenu_animation.start()
+    
+    def finish_submenu_animation(self):
+        animation = self.submenu_animation
+        if animation is not None and animation.state() == QVariantAnimation.Running:
+            animation.setCurrentTime(animation.duration())
+            animation.stop()
+            for frame in self.submenus.values():
+                if frame.animating:
+                    self.end_submenu_animation(frame)
     
-    def toggle_submenu(self):
-        # This would toggle the submenu visibility
-        pass
+    def end_submenu_animation(self, frame):
+        if not frame.animating:
+            return
+        frame.animating = False
+        frame.setMinimumHeight(0)
+        frame.setMaximumHeight(QWIDGETSIZE_MAX)
+        frame.set_children_visible(True)
+        frame.setVisible(frame.is_open)
+        self.submenu_animation = None
         
     def toggle_sidebar(self):
         if self.is_collapsed:
@@ -250,33 +238,93 @@ class Sidebar(QWidget):
         else:
             self.collapse()
     
+    @instrument.timed('ui.sidebar_collapse')
     def collapse(self):
-        self.setFixedWidth(80)
-        self.is_collapsed = True
-        self.toggle_btn.setText("←")
-        self.logo.hide()
-        
-        # Hide text in all buttons, show only icons
-        for i in range(self.menu_layout.count()):
-            item = self.menu_layout.itemAt(i)
-            if item.widget() and isinstance(item.widget(), QPushButton):
-                text_label = item.widget().findChild(QLabel, None)
-                if text_label and text_label.property('text'):
-                    text_label.hide()
+        self.finish_animation()
+        if self.is_collapsed:
+            return
+        
+        animate = self.isVisible() and self.ANIMATION_MS > 0
+        if animate:
+            self.expanded_snapshot = self.grab()
+            start = self.panel_rect(self.width())
+        
+        self.set_collapsed(True)
+        
+        if animate:
+            self.animate_panel(start, self.panel_rect(self.COLLAPSED_WIDTH), None)
     
+    @instrument.timed('ui.sidebar_expand')
     def expand(self):
-        self.setFixedWidth(220)
+        self.finish_animation()
+        if not self.is_collapsed:
+            return
+        
+        if not self.isVisible() or not self.ANIMATION_MS or self.expanded_snapshot is None:
+            self.set_collapsed(False)
+            return
+        
+        # The real sidebar stays collapsed underneath until the end, so the
+        # window is laid out once instead of on every animation frame
         self.is_collapsed = False
         self.toggle_btn.setText("→")
-        self.logo.show()
-        
-        # Show text in all buttons
-        for i in range(self.menu_layout.count()):
-            item = self.menu_layout.itemAt(i)
-            if item.widget() and isinstance(item.widget(), QPushButton):
-                text_label = item.widget().findChild(QLabel, None)
-                if text_label:
-                    text_label.show()
+        self.animate_panel(
+            self.panel_rect(self.COLLAPSED_WIDTH),
+            self.panel_rect(self.EXPANDED_WIDTH),
+            lambda: self.set_collapsed(False)
+        )
+    
+    def set_collapsed(self, collapsed):
+        self.is_collapsed = collapsed
+        self.toggle_btn.setText("←" if collapsed else "→")
+        self.logo.setVisible(not collapsed)
+        
+        # Hide text in all entries (submenus included), keep only icons
+        for item in self.items:
+            item.set_text_visible(not collapsed)
+        
+        self.setFixedWidth(self.COLLAPSED_WIDTH if collapsed else self.EXPANDED_WIDTH)
+    
+    def panel_rect(self, width):
+        # The sidebar is anchored to the right edge of the window
+        window = self.window()
+        top_left = self.mapTo(window, QPoint(0, 0))
+        right = top_left.x() + self.width()
+        return QRect(right - width, top_left.y(), width, self.height())
+    
+    def animate_panel(self, start, end, on_finished):
+        if self.overlay is None:
+            self.overlay = QLabel(self.window())
+            self.overlay.setAlignment(Qt.AlignRight | Qt.AlignTop)
+            self.overlay.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.overlay.setPixmap(self.expanded_snapshot)
+        self.overlay.setGeometry(start)
+        self.overlay.raise_()
+        self.toggle_btn.raise_()
+        self.overlay.show()
+        
+        self.width_animation = QPropertyAnimation(self.overlay, b"geometry", self)
+        self.width_animation.setDuration(self.ANIMATION_MS)
+        self.width_animation.setEasingCurve(QEasingCurve.OutCubic)
+        self.width_animation.setStartValue(start)
+        self.width_animation.setEndValue(end)
+        self.width_animation.finished.connect(lambda: self.end_animation(on_finished))
+        self.width_animation.start()
+    
+    def finish_animation(self):
+        animation = self.width_animation
+        if animation is not None and animation.state() == QPropertyAnimation.Running:
+            animation.setCurrentTime(animation.duration())
+            animation.stop()
+            animation.finished.emit()
+    
+    def end_animation(self, on_finished):
+        if self.width_animation is None:
+            return
+        self.width_animation = None
+        if on_finished is not None:
+            on_finished()
+        self.overlay.hide()
     
     def resizeEvent(self, event):
         # Position toggle button
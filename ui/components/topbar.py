@@ -1,15 +1,33 @@
 from PyQt5.QtWidgets import QWidget, QHBoxLayout, QLabel, QPushButton
-from PyQt5.QtCore import Qt
-from ui.styles.colors import *
+from PyQt5.QtCore import Qt, QSize, pyqtSignal
+
+from core import instrument
+from ui.icons import get_icon_service
+from ui.styles.colors import THEME
 
 class TopMenu(QWidget):
+    # Route id of a clicked menu item
+    item_clicked = pyqtSignal(str)
+    
+    # Hidden buttons kept around for reuse across page switches
+    MAX_SPARE_BUTTONS = 8
+    TITLE_ICON_SIZE = 20
+    ITEM_ICON_SIZE = 16
+    
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.icons = get_icon_service()
+        self.title_icon_name = None
+        self.buttons = []
+        self.bot_stats = {}
+        self.widgets_created = 0
+        self.widgets_destroyed = 0
         self.setup_ui()
         
     def setup_ui(self):
         self.setFixedHeight(60)
-        self.setStyleSheet(f"background-color: {DARK_SECONDARY}; border-bottom: 1px solid {DARK_BORDER};")
+        self.setObjectName("topMenu")
+        self.setAttribute(Qt.WA_StyledBackground, True)
         
         layout = QHBoxLayout(self)
         layout.setContentsMargins(20, 0, 20, 0)
@@ -21,11 +39,11 @@ class TopMenu(QWidget):
         title_layout.setSpacing(10)
         
         self.title_icon = QLabel()
-        self.title_icon.setFixedSize(20, 20)
-        self.title_icon.setStyleSheet("color: #3b82f6; font-size: 16px;")
+        self.title_icon.setFixedSize(self.TITLE_ICON_SIZE, self.TITLE_ICON_SIZE)
+        self.title_icon.setObjectName("topMenuIcon")
         
         self.title_text = QLabel("صفحه اصلی")
-        self.title_text.setStyleSheet(f"color: {DARK_TEXT}; font-size: 18px; font-weight: bold;")
+        self.title_text.setObjectName("topMenuTitle")
         
         title_layout.addWidget(self.title_icon)
         title_layout.addWidget(self.title_text)
@@ -34,6 +52,12 @@ class TopMenu(QWidget):
         layout.addWidget(self.title_widget)
         layout.addStretch()
         
+        # Live bot activity, fed by the event bus
+        self.status_label = QLabel()
+        self.status_label.setObjectName("topMenuStatus")
+        self.status_label.hide()
+        layout.addWidget(self.status_label)
+        
         # Menu items
         self.menu_items_widget = QWidget()
         self.menu_layout = QHBoxLayout(self.menu_items_widget)
@@ -42,47 +66,80 @@ class TopMenu(QWidget):
         
         layout.addWidget(self.menu_items_widget)
     
+    @instrument.timed('ui.update_menu')
     def update_menu(self, title, icon, items):
-        self.title_text.setText(title)
-        self.title_icon.setText(icon)
+        if self.title_text.text() != title:
+            self.title_text.setText(title)
+        if self.title_icon_name != icon:
+            self.title_icon_name = icon
+            self.title_icon.setPixmap(self.icons.pixmap(icon, self.TITLE_ICON_SIZE, THEME['primary_light']))
         
-        # Clear existing items
-        for i in reversed(range(self.menu_layout.count())): 
-            self.menu_layout.itemAt(i).widget().setParent(None)
+        # Reuse the buttons already in the layout and only touch what changed
+        for index, item in enumerate(items):
+            if index < len(self.buttons):
+                btn = self.buttons[index]
+            else:
+                btn = self.create_button()
+            self.apply_item(btn, item)
+            if btn.isHidden():
+                btn.show()
         
-        # Add new items
-        for item in items:
-            btn = QPushButton(item['text'])
+        # Park the rest in the pool, deleting anything beyond the spare limit
+        for btn in self.buttons[len(items):]:
+            btn.hide()
+        while len(self.buttons) > max(len(items), self.MAX_SPARE_BUTTONS):
+            btn = self.buttons.pop()
+            self.menu_layout.removeWidget(btn)
+            btn.deleteLater()
+            self.widgets_destroyed += 1
+    
+    def create_button(self):
+        btn = QPushButton()
+        btn.setCursor(Qt.PointingHandCursor)
+        btn.setObjectName("topMenuItem")
+        btn.setProperty('active', False)
+        btn.setIconSize(QSize(self.ITEM_ICON_SIZE, self.ITEM_ICON_SIZE))
+        btn.clicked.connect(lambda: self.on_button_clicked(btn))
+        self.menu_layout.addWidget(btn)
+        self.buttons.append(btn)
+        self.widgets_created += 1
+        return btn
+    
+    def apply_item(self, btn, item):
+        if btn.text() != item['text']:
+            btn.setText(item['text'])
+        if btn.property('icon') != item['icon']:
             btn.setProperty('icon', item['icon'])
-            btn.setCursor(Qt.PointingHandCursor)
-            
-            # Set style with hover effects
-            btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: rgba(42, 42, 61, 0.7);
-                    color: {DARK_TEXT};
-                    border: 1px solid {DARK_BORDER};
-                    border-radius: 6px;
-                    padding: 8px 15px;
-                    font-size: 14px;
-                }}
-                QPushButton:hover {{
-                    background-color: {DARK_HOVER};
-                }}
-                QPushButton:pressed {{
-                    background-color: {DARK_ACTIVE};
-                    color: white;
-                    border-color: {PRIMARY_COLOR};
-                }}
-            """)
-            
-            if item.get('active', False):
-                btn.setStyleSheet(btn.styleSheet() + f"""
-                    QPushButton {{
-                        background-color: {DARK_ACTIVE};
-                        color: white;
-                        border-color: {PRIMARY_COLOR};
-                    }}
-                """)
-            
-            self.menu_layout.addWidget(btn)
\ No newline at end of file
+            btn.setIcon(self.icons.icon(item['icon'], self.ITEM_ICON_SIZE))
+        btn.setProperty('route', item.get('route'))
+        
+        active = bool(item.get('active', False))
+        if btn.property('active') != active:
+            btn.setProperty('active', active)
+            # Dynamic property selectors need a re-polish to take effect
+            btn.style().unpolish(btn)
+            btn.style().polish(btn)
+    
+    def on_button_clicked(self, btn):
+        route = btn.property('route')
+        if route:
+            self.item_clicked.emit(route)
+    
+    def show_bot_stats(self, batch):
+        # Latest stats per bot runtime (in-process engine, worker pool)
+        for stats in batch:
+            self.bot_stats[stats['source']] = stats
+        running = sum(stats['running'] for stats in self.bot_stats.values())
+        queued = sum(stats['queued'] for stats in self.bot_stats.values())
+        text = f"🤖 {running:,} در حال اجرا · {queued:,} در صف" if running or queued else ""
+        if self.status_label.text() != text:
+            self.status_label.setText(text)
+            self.status_label.setVisible(bool(text))
+    
+    def widget_stats(self):
+        return {
+            'created': self.widgets_created,
+            'destroyed': self.widgets_destroyed,
+            'live': len(self.buttons),
+            'visible': sum(1 for btn in self.buttons if not btn.isHidden()),
+        }
@@ -0,0 +1,183 @@
+import os
+import zlib
+from collections import OrderedDict, namedtuple
+
+from PyQt5.QtCore import Qt, QUrl
+from PyQt5.QtGui import QImage, QTextBlockFormat, QTextCursor, QTextDocument, QTextOption
+
+# Tutorials shipped with the app, as <name>.md or <name>.html
+TUTORIALS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'content', 'tutorials')
+
+Section = namedtuple('Section', 'title source')
+
+
+class TutorialSource:
+    """A tutorial file parsed once into sections and pages.
+
+    Sections start at each second-level heading (`## ` or `<h2`); pages
+    are runs of whole sections of about PAGE_CHARS characters, so a long
+    tutorial never has to be laid out in one piece.
+    """
+
+    PAGE_CHARS = 4000
+
+    def __init__(self, path, text):
+        self.path = path
+        self.format = 'html' if path.endswith(('.html', '.htm')) else 'markdown'
+        payload = text.encode('utf-8')
+        # Same content hash as the style cache; zlib is loaded at startup anyway
+        self.digest = f"{zlib.crc32(payload):08x}{zlib.adler32(payload):08x}"
+        self.base_url = QUrl.fromLocalFile(os.path.dirname(path) + os.sep)
+        self.sections = self.split_sections(text)
+        self.pages = self.paginate(self.sections)
+
+    def split_sections(self, text):
+        marker = '<h2' if self.format == 'html' else '## '
+        sections = []
+        current = []
+        for line in text.splitlines(keepends=True):
+            if line.lstrip().startswith(marker) and current:
+                sections.append(''.join(current))
+                current = []
+            current.append(line)
+        if current:
+            sections.append(''.join(current))
+        return tuple(Section(self.heading(source), source) for source in sections if source.strip())
+
+    def heading(self, source):
+        first = source.strip().splitlines()[0]
+        if self.format == 'markdown':
+            return first.lstrip('#').strip()
+        doc = QTextDocument()
+        doc.setHtml(first)
+        return doc.toPlainText().strip()
+
+    def paginate(self, sections):
+        pages = []
+        page = []
+        size = 0
+        for index, section in enumerate(sections):
+            if page and size + len(section.source) > self.PAGE_CHARS:
+                pages.append(tuple(page))
+                page = []
+                size = 0
+            page.append(index)
+            size += len(section.source)
+        if page:
+            pages.append(tuple(page))
+        return tuple(pages)
+
+
+class TutorialDocument(QTextDocument):
+    """Right-to-left document for one section, sharing decoded images."""
+
+    def __init__(self, source, section, images, parent=None):
+        super().__init__(parent)
+        self.images = images
+        self.setBaseUrl(source.base_url)
+        option = QTextOption()
+        option.setTextDirection(Qt.RightToLeft)
+        option.setWrapMode(QTextOption.WrapAtWordBoundaryOrAnywhere)
+        self.setDefaultTextOption(option)
+        self.setDocumentMargin(0)
+        if source.format == 'html':
+            self.setHtml(section.source)
+        else:
+            self.setMarkdown(section.source)
+        # Imported blocks carry their own direction; Persian text reads right to left
+        block_format = QTextBlockFormat()
+        block_format.setLayoutDirection(Qt.RightToLeft)
+        cursor = QTextCursor(self)
+        cursor.select(QTextCursor.Document)
+        cursor.mergeBlockFormat(block_format)
+
+    def loadResource(self, resource_type, url):
+        if resource_type != QTextDocument.ImageResource or not url.isLocalFile():
+            return super().loadResource(resource_type, url)
+        # Every width gets its own document, but an image is decoded once
+        path = url.toLocalFile()
+        image = self.images.get(path)
+        if image is None:
+            image = self.images[path] = QImage(path)
+        return image
+
+
+class DocumentCache:
+    """Parsed tutorials plus laid-out section documents.
+
+    Files are re-read only when their size or mtime changes. Documents are
+    keyed by (content digest, section, width) and the least recently used
+    ones are dropped beyond `max_documents`; a revisit at the same width
+    paints straight from the cache without parsing or laying out text.
+    """
+
+    DEFAULT_MAX_DOCUMENTS = 96
+
+    def __init__(self, max_documents=None, directory=TUTORIALS_DIR):
+        self.max_documents = max_documents or self.DEFAULT_MAX_DOCUMENTS
+        self.directory = directory
+        self.sources = {}                   # path -> ((mtime, size), TutorialSource)
+        self.documents = OrderedDict()      # (digest, section, width) -> TutorialDocument
+        self.images = {}
+        self.stats = {'parsed': 0, 'layouts': 0, 'hits': 0, 'evicted': 0}
+
+    def find(self, name):
+        for extension in ('.md', '.html'):
+            path = os.path.join(self.directory, name + extension)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def source(self, name):
+        """The parsed tutorial `name`, or None when there is no such file."""
+        path = self.find(name)
+        if path is None:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self.sources.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        with open(path, encoding='utf-8') as f:
+            source = TutorialSource(path, f.read())
+        self.sources[path] = (key, source)
+        self.stats['parsed'] += 1
+        return source
+
+    def document(self, source, index, width):
+        """The section laid out at `width`, built on first request."""
+        key = (source.digest, index, width)
+        doc = self.documents.get(key)
+        if doc is not None:
+            self.documents.move_to_end(key)
+            self.stats['hits'] += 1
+            return doc
+
+        doc = TutorialDocument(source, source.sections[index], self.images)
+        doc.setTextWidth(width)
+        # size() runs the layout now rather than on first paint
+        doc.size()
+        self.documents[key] = doc
+        self.stats['layouts'] += 1
+        while len(self.documents) > self.max_documents:
+            self.documents.popitem(last=False)
+            self.stats['evicted'] += 1
+        return doc
+
+    def clear(self):
+        self.sources.clear()
+        self.documents.clear()
+        self.images.clear()
+
+
+_default_cache = None
+
+
+def get_document_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = DocumentCache()
+    return _default_cache
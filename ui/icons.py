@@ -0,0 +1,234 @@
+import math
+import os
+import zlib
+
+from PyQt5.QtCore import Qt, QRect, QRectF, QT_VERSION_STR
+from PyQt5.QtGui import QColor, QFont, QIcon, QImage, QPainter, QPixmap, QPixmapCache
+from PyQt5.QtWidgets import QApplication
+
+from core.paths import cache_dir
+from ui.styles.colors import THEME
+
+# Line icons shipped with the app, as <name>.svg drawn in white on 24x24
+ICONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'content', 'icons')
+
+# Used for a Font Awesome style name when its SVG can't be drawn (no QtSvg)
+FALLBACK_GLYPHS = {
+    'home': "🏠", 'cog': "⚙️", 'heart': "❤️", 'baby': "👶", 'users': "👥", 'bell': "🔔",
+    'graduation-cap': "🎓", 'newspaper': "📰", 'terminal': "📜", 'stethoscope': "🩺",
+    'envelope': "✉️", 'network-wired': "🔌", 'hourglass-half': "⏳",
+}
+
+
+def svg_name(name):
+    """'fas fa-cog' -> 'cog'; None for anything that isn't an icon class."""
+    if not name.startswith('fa'):
+        return None
+    return name.split()[-1][len('fa-'):]
+
+
+class IconAtlas:
+    """Every icon of one size and pixel ratio, drawn once into a grid image.
+
+    Cells are appended as icons are first asked for; the image grows by
+    whole rows. The image and the list of keys in it are written to the
+    cache directory, so later launches load one PNG instead of shaping
+    emoji and parsing SVG again.
+    """
+
+    COLUMNS = 16
+
+    def __init__(self, size, ratio, path=None):
+        self.size = size
+        self.ratio = ratio
+        self.cell = int(math.ceil(size * ratio))
+        self.path = path
+        self.keys = {}
+        self.image = QImage()
+        self.dirty = False
+        self._pixmap = None
+        if path is not None:
+            self.load()
+
+    def load(self):
+        try:
+            with open(self.path + '.idx', encoding='utf-8') as f:
+                keys = f.read().split('\n')[:-1]
+        except OSError:
+            return
+        image = QImage(self.path + '.png')
+        rows = (len(keys) + self.COLUMNS - 1) // self.COLUMNS
+        if image.isNull() or image.height() < rows * self.cell:
+            return
+        self.image = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+        self.keys = {key: index for index, key in enumerate(keys)}
+
+    def save(self):
+        if not self.dirty or self.path is None:
+            return
+        try:
+            tmp_path = self.path + '.tmp'
+            if self.image.save(tmp_path, 'PNG'):
+                os.replace(tmp_path, self.path + '.png')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(''.join(key + '\n' for key in self.keys))
+            os.replace(tmp_path, self.path + '.idx')
+            self.dirty = False
+        except OSError:
+            # A read-only cache only costs the drawing on the next launch
+            pass
+
+    def rect(self, index):
+        row, column = divmod(index, self.COLUMNS)
+        return QRect(column * self.cell, row * self.cell, self.cell, self.cell)
+
+    def find(self, key, draw):
+        """The cell holding `key`, calling draw(painter, rect) the first time."""
+        index = self.keys.get(key)
+        if index is not None:
+            return self.rect(index)
+        index = len(self.keys)
+        rows = index // self.COLUMNS + 1
+        if self.image.isNull() or self.image.height() < rows * self.cell:
+            image = QImage(self.COLUMNS * self.cell, rows * self.cell, QImage.Format_ARGB32_Premultiplied)
+            image.fill(Qt.transparent)
+            if not self.image.isNull():
+                painter = QPainter(image)
+                painter.drawImage(0, 0, self.image)
+                painter.end()
+            self.image = image
+        rect = self.rect(index)
+        painter = QPainter(self.image)
+        painter.setRenderHints(QPainter.Antialiasing | QPainter.TextAntialiasing | QPainter.SmoothPixmapTransform)
+        draw(painter, rect)
+        painter.end()
+        self.keys[key] = index
+        self.dirty = True
+        self._pixmap = None
+        return rect
+
+    def pixmap(self):
+        # The whole atlas as one pixmap, for painting cells straight from it
+        if self._pixmap is None:
+            self._pixmap = QPixmap.fromImage(self.image)
+        return self._pixmap
+
+
+class IconService:
+    """Emoji and SVG icons rasterized once per size, pixel ratio and color.
+
+    pixmap() and icon() are for widgets that take a QPixmap or QIcon; the
+    cut-out pixmaps live in QPixmapCache, so asking again is a hash lookup.
+    paint() draws straight from the atlas, for custom-painted widgets.
+    """
+
+    # Cached atlases from another Qt or another version of this scheme are ignored
+    CACHE_VERSION = 1
+
+    def __init__(self, directory=ICONS_DIR, cache_path=None):
+        self.directory = directory
+        self.cache_path = cache_path
+        self.atlases = {}
+        self.rasterized = 0
+        self._svg = None
+
+    def ratio(self):
+        app = QApplication.instance()
+        return app.devicePixelRatio() if app is not None else 1.0
+
+    def atlas(self, size, ratio):
+        atlas = self.atlases.get((size, ratio))
+        if atlas is None:
+            atlas = self.atlases[(size, ratio)] = IconAtlas(size, ratio, self.atlas_path(size, ratio))
+        return atlas
+
+    def atlas_path(self, size, ratio):
+        directory = self.cache_path or cache_dir('icons')
+        font = QApplication.font().family() if QApplication.instance() is not None else ''
+        try:
+            # Editing a shipped SVG invalidates the atlases drawn from it
+            changed = max((entry.stat().st_mtime for entry in os.scandir(self.directory)), default=0)
+        except OSError:
+            changed = 0
+        payload = f"{self.CACHE_VERSION}:{QT_VERSION_STR}:{font}:{self.directory}:{changed}".encode('utf-8')
+        return os.path.join(directory, f"atlas-{size}-{int(ratio * 100)}-{zlib.crc32(payload):08x}")
+
+    def cell(self, name, size, color=None, ratio=None):
+        """(atlas, source rect) for `name` drawn at `size` logical pixels."""
+        atlas = self.atlas(size, ratio or self.ratio())
+        color = color or THEME['dark_text']
+        return atlas, atlas.find(f"{name}\t{color}", lambda painter, rect: self.draw(painter, rect, name, color))
+
+    def pixmap(self, name, size, color=None):
+        ratio = self.ratio()
+        color = color or THEME['dark_text']
+        key = f"icon\t{name}\t{color}\t{size}\t{ratio}"
+        pixmap = QPixmapCache.find(key)
+        if pixmap is None:
+            atlas, rect = self.cell(name, size, color, ratio)
+            pixmap = QPixmap.fromImage(atlas.image.copy(rect))
+            pixmap.setDevicePixelRatio(ratio)
+            QPixmapCache.insert(key, pixmap)
+        return pixmap
+
+    def icon(self, name, size, color=None):
+        return QIcon(self.pixmap(name, size, color))
+
+    def paint(self, painter, rect, name, color=None):
+        """Draw `name` into `rect` (square, logical pixels) on a painter."""
+        ratio = painter.device().devicePixelRatioF()
+        atlas, source = self.cell(name, rect.height(), color, ratio)
+        painter.drawPixmap(QRectF(rect), atlas.pixmap(), QRectF(source))
+
+    def draw(self, painter, rect, name, color):
+        self.rasterized += 1
+        stem = svg_name(name)
+        if stem is not None:
+            path = os.path.join(self.directory, stem + '.svg')
+            if self.draw_svg(painter, rect, path, color):
+                return
+            name = FALLBACK_GLYPHS.get(stem, "•")
+        font = QFont(QApplication.font())
+        font.setPixelSize(max(1, int(rect.height() * 0.8)))
+        painter.setFont(font)
+        painter.setPen(QColor(color))
+        painter.drawText(rect, Qt.AlignCenter, name)
+
+    def draw_svg(self, painter, rect, path, color):
+        if self._svg is None:
+            try:
+                from PyQt5.QtSvg import QSvgRenderer
+                self._svg = QSvgRenderer
+            except ImportError:
+                # QtSvg is optional; the glyphs will do
+                self._svg = False
+        if not self._svg or not os.path.exists(path):
+            return False
+        renderer = self._svg(path)
+        if not renderer.isValid():
+            return False
+        renderer.render(painter, QRectF(rect))
+        # Recolor what was drawn, keeping its coverage
+        painter.setCompositionMode(QPainter.CompositionMode_SourceIn)
+        painter.fillRect(rect, QColor(color))
+        painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+        return True
+
+    def save(self):
+        for atlas in self.atlases.values():
+            atlas.save()
+
+
+_default_service = None
+
+
+def get_icon_service():
+    global _default_service
+    if _default_service is None:
+        _default_service = IconService()
+    return _default_service
+
+
+def save_icon_cache():
+    if _default_service is not None:
+        _default_service.save()
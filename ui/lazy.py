@@ -0,0 +1,43 @@
+import importlib
+
+
+class LazyFactory:
+    """Callable that imports `module_name.attr` the first time it is called.
+
+    Route tables hold these instead of page classes, so a page module (and
+    whatever it imports) is only loaded when that page is first built.
+    """
+
+    def __init__(self, module_name, attr, *args, **kwargs):
+        self.module_name = module_name
+        self.attr = attr
+        self.args = args
+        self.kwargs = kwargs
+        self._target = None
+
+    def resolve(self):
+        if self._target is None:
+            self._target = getattr(importlib.import_module(self.module_name), self.attr)
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*self.args, *args, **dict(self.kwargs, **kwargs))
+
+    def __repr__(self):
+        return f"LazyFactory({self.module_name}.{self.attr})"
+
+
+_optional_modules = {}
+
+
+def optional_module(name):
+    """Import an optional Qt module such as PyQt5.QtSvg on first use.
+
+    Returns None when the module is not installed so callers can fall back.
+    """
+    if name not in _optional_modules:
+        try:
+            _optional_modules[name] = importlib.import_module(name)
+        except ImportError:
+            _optional_modules[name] = None
+    return _optional_modules[name]
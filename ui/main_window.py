@@ -1,21 +1,31 @@
-from PyQt5.QtWidgets import (QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, 
-                             QStackedWidget)
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, 
+                             QStackedWidget, QShortcut)
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QKeySequence
 
 from ui.components.sidebar import Sidebar
 from ui.components.topbar import TopMenu
-from ui.pages.home_page import HomePage
-from ui.pages.base_page import BasePage
-from ui.styles.colors import *
+from ui.router import Router
+from ui.styles.compiler import apply_app_stylesheet
+from ui.workers.event_pump import EventPump
+from core import instrument
+from core.events import BOT_STATS, SESSION_FINISHED, get_event_bus
 
 class MainWindow(QMainWindow):
+    # Page memory budget; least recently used pages beyond it are torn down
+    MAX_LIVE_PAGES = 4
+    MAX_LIVE_WIDGETS = None
+    PERF_OVERLAY_KEY = "F12"
+    
     def __init__(self):
         super().__init__()
+        # One application-wide stylesheet instead of a sheet per widget
+        apply_app_stylesheet(QApplication.instance())
+        
         self.setWindowTitle("سایدبار Fanus")
         self.setGeometry(100, 100, 1200, 700)
         
-        # Set background color
-        self.setStyleSheet(f"background-color: #0F0F1A;")
+        self.setObjectName("mainWindow")
         
         # Central widget
         central_widget = QWidget()
@@ -34,6 +44,7 @@ class MainWindow(QMainWindow):
         
         # Top menu
         self.top_menu = TopMenu(self)
+        self.top_menu.item_clicked.connect(self.change_page)
         right_layout.addWidget(self.top_menu)
         
         # Main content
@@ -42,14 +53,7 @@ class MainWindow(QMainWindow):
         main_content_layout.setContentsMargins(0, 0, 0, 0)
         
         self.stacked_widget = QStackedWidget()
-        self.stacked_widget.setStyleSheet(f"""
-            QStackedWidget {{
-                background-color: {DARK_SECONDARY};
-                border-radius: 10px;
-                border: 1px solid {DARK_BORDER};
-                margin: 20px;
-            }}
-        """)
+        self.stacked_widget.setObjectName("pageStack")
         main_content_layout.addWidget(self.stacked_widget)
         
         right_layout.addWidget(self.main_content)
@@ -68,101 +72,83 @@ class MainWindow(QMainWindow):
         # Create pages
         self.create_pages()
         
-        # Set initial page
-        self.change_page('home')
-    
-    def create_pages(self):
-        # Home page
-        home_page = HomePage()
-        self.stacked_widget.addWidget(home_page)
-        
-        # Other pages
-        settings_page = BasePage("تنظیمات سیستم", "این بخش مربوط به تنظیمات کلی سیستم می‌باشد.")
-        self.stacked_widget.addWidget(settings_page)
+        # Bot and job events reach the UI in batches, at most once per frame
+        self.event_bus = get_event_bus()
+        self.event_pump = EventPump(self.event_bus, self)
+        self.event_bus.subscribe(BOT_STATS, self.top_menu.show_bot_stats)
+        self.event_bus.subscribe(SESSION_FINISHED, self.on_sessions_finished)
         
-        marriage_loan_page = BasePage("ربات وام ازدواج", "این بخش مربوط به مدیریت وام ازدواج می‌باشد.")
-        self.stacked_widget.addWidget(marriage_loan_page)
+        # Performance overlay; built on first use unless instruments are on
+        self.perf_probe = None
+        self.perf_overlay = None
+        QShortcut(QKeySequence(self.PERF_OVERLAY_KEY), self, self.toggle_perf_overlay)
+        if instrument.enabled():
+            self.ensure_perf_probe().start()
         
-        child_loan_page = BasePage("ربات وام فرزند", "این بخش مربوط به مدیریت وام فرزند می‌باشد.")
-        self.stacked_widget.addWidget(child_loan_page)
+        # Started once the event loop runs, so building the window isn't a stall
+        self.watchdog = None
+        QTimer.singleShot(0, self.start_watchdog)
         
-        news_page = BasePage("اخبار و اطلاعیه‌ها", "آخرین اخبار و اطلاعیه‌های سیستم در این بخش نمایش داده می‌شود.")
-        self.stacked_widget.addWidget(news_page)
+        # In process mode bot progress is polled from shared memory once per frame
+        self.pool_bridge = None
+        QTimer.singleShot(0, self.start_pool_bridge)
         
-        education_page = BasePage("آموزش‌های سیستم", "آموزش‌های مربوط به استفاده از سیستم در این بخش قرار دارد.")
-        self.stacked_widget.addWidget(education_page)
-        
-        contact_page = BasePage("ارتباط با ما", "راه‌های ارتباطی با پشتیبانی سیستم در این بخش قرار دارد.")
-        self.stacked_widget.addWidget(contact_page)
+        # Set initial page
+        self.change_page('home')
+    
+    def create_pages(self):
+        # Pages are built on first visit and prefetched when idle; see Router
+        self.router = Router(
+            self.stacked_widget,
+            max_pages=self.MAX_LIVE_PAGES,
+            max_widgets=self.MAX_LIVE_WIDGETS,
+            parent=self
+        )
+        self.pages = self.router.pages
     
+    @instrument.timed('ui.change_page')
     def change_page(self, page_name):
-        page_index = {
-            'home': 0,
-            'settings': 1,
-            'marriage-loan': 2,
-            'child-loan': 3,
-            'news': 4,
-            'education': 5,
-            'contact': 6
-        }.get(page_name, 0)
-        
-        self.stacked_widget.setCurrentIndex(page_index)
-        
-        # Update top menu based on page
-        menu_templates = {
-            'home': {
-                'title': 'صفحه اصلی',
-                'icon': 'fas fa-home',
-                'items': []
-            },
-            'settings': {
-                'title': 'تنظیمات سیستم',
-                'icon': 'fas fa-cog',
-                'items': []
-            },
-            'marriage-loan': {
-                'title': 'ربات وام ازدواج',
-                'icon': 'fas fa-heart',
-                'items': [
-                    {'icon': 'fas fa-cog', 'text': 'تنظیمات وام', 'active': True},
-                    {'icon': 'fas fa-graduation-cap', 'text': 'آموزش استفاده'},
-                    {'icon': 'fas fa-users', 'text': 'متقاضیان'},
-                    {'icon': 'fas fa-bell', 'text': 'اطلاع‌رسانی'}
-                ]
-            },
-            'child-loan': {
-                'title': 'ربات وام فرزند',
-                'icon': 'fas fa-baby',
-                'items': [
-                    {'icon': 'fas fa-cog', 'text': 'تنظیمات وام', 'active': True},
-                    {'icon': 'fas fa-graduation-cap', 'text': 'آموزش استفاده'},
-                    {'icon': 'fas fa-users', 'text': 'متقاضیان'},
-                    {'icon': 'fas fa-bell', 'text': 'اطلاع‌رسانی'}
-                ]
-            },
-            'news': {
-                'title': 'اخبار و اطلاعیه‌ها',
-                'icon': 'fas fa-newspaper',
-                'items': []
-            },
-            'education': {
-                'title': 'آموزش‌های سیستم',
-                'icon': 'fas fa-graduation-cap',
-                'items': [
-                    {'icon': 'fas fa-heart', 'text': 'آموزش وام ازدواج'},
-                    {'icon': 'fas fa-baby', 'text': 'آموزش وام فرزند', 'active': True},
-                    {'icon': 'fas fa-cog', 'text': 'آموزش تنظیمات'}
-                ]
-            },
-            'contact': {
-                'title': 'ارتباط با ما',
-                'icon': 'fas fa-envelope',
-                'items': []
-            }
-        }
-        
-        template = menu_templates.get(page_name, menu_templates['home'])
-        self.top_menu.update_menu(template['title'], template['icon'], template['items'])
+        if self.watchdog is not None:
+            # Set before navigating, so a stall building the page is blamed on it;
+            # unknown names fall back to the default route like navigate() does
+            self.watchdog.set_route(self.router.resolve(page_name).route_id)
+        route = self.router.navigate(page_name)
+        self.top_menu.update_menu(route.title, route.icon, route.items)
+    
+    def start_watchdog(self):
+        from core.watchdog import start_watchdog
+        self.watchdog = start_watchdog()
+        if self.watchdog is not None:
+            self.watchdog.set_route(self.router.current_route)
+            beat_timer = QTimer(self)
+            beat_timer.setTimerType(Qt.PreciseTimer)
+            beat_timer.timeout.connect(self.watchdog.beat)
+            beat_timer.start(self.watchdog.BEAT_MS)
+    
+    def start_pool_bridge(self):
+        from core.settings import get_settings
+        if get_settings()['bots.processes'] > 0:
+            from core.bots.process_pool import get_process_pool
+            from ui.workers.bot_bridge import PoolBridge
+            self.pool_bridge = PoolBridge(get_process_pool(), self)
+    
+    def ensure_perf_probe(self):
+        if self.perf_probe is None:
+            from ui.components.perf_overlay import PerfProbe
+            self.perf_probe = PerfProbe(self)
+        return self.perf_probe
+    
+    def toggle_perf_overlay(self):
+        if self.perf_overlay is None:
+            from ui.components.perf_overlay import PerfOverlay
+            self.perf_overlay = PerfOverlay(self.ensure_perf_probe(), self)
+        self.perf_overlay.toggle()
+    
+    def on_sessions_finished(self, results):
+        # Only reached once a bot has run, so the bot modules are loaded already
+        from core.applicants.store import get_store
+        from core.bots.loan_bot import record_results
+        record_results(get_store(), results)
     
     def resizeEvent(self, event):
         # Reposition toggle button when window is resized
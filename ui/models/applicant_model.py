@@ -0,0 +1,132 @@
+import time
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
+
+
+class ApplicantTableModel(QAbstractTableModel):
+    """Table model that reads cells straight out of an ApplicantStore.
+
+    The model never copies rows: it holds at most one array of row ids for
+    the current sort/filter/search and exposes it to the view in FETCH_SIZE
+    chunks through canFetchMore/fetchMore. Searches go through an
+    ApplicantSearchIndex and are re-run when the store changes, like sorts.
+    """
+
+    FETCH_SIZE = 2000
+    # Sorted/filtered views are rebuilt at most this often while data streams in
+    REFRESH_MS = 500
+
+    def __init__(self, store, filters=None, search_index=None, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.filters = dict(filters or {})
+        self.sort_column = None
+        self.descending = False
+        self.search_index = search_index
+        self.search_query = ''
+
+        self.rows = None        # array of store row ids, or None for store order
+        self.loaded = 0
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(self.REFRESH_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh()
+
+        store.add_listener(self.on_store_changed)
+
+    def release(self):
+        self.store.remove_listener(self.on_store_changed)
+
+    def total(self):
+        return len(self.store) if self.rows is None else len(self.rows)
+
+    def refresh(self):
+        self.refresh_timer.stop()
+        search_rows = None
+        if self.search_query and self.search_index is not None:
+            search_rows = self.search_index.search(self.search_query)
+        self.beginResetModel()
+        self.rows = self.store.view(self.sort_column, self.descending, self.filters, search_rows)
+        self.loaded = min(self.total(), max(self.loaded, self.FETCH_SIZE))
+        self.endResetModel()
+
+    def set_filter(self, name, allowed):
+        if allowed:
+            self.filters[name] = set(allowed)
+        else:
+            self.filters.pop(name, None)
+        self.refresh()
+
+    def set_search(self, query):
+        query = query.strip()
+        if query != self.search_query:
+            self.search_query = query
+            self.refresh()
+
+    # Qt model interface
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.store.columns)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.loaded < self.total()
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.FETCH_SIZE, self.total() - self.loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.loaded, self.loaded + count - 1)
+        self.loaded += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            row = index.row() if self.rows is None else self.rows[index.row()]
+            column = self.store.columns[index.column()]
+            value = self.store.value(row, index.column())
+            if column.name == 'registered_at' and value is not None:
+                return time.strftime('%Y-%m-%d %H:%M', time.localtime(value))
+            return value
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.store.columns[section].title
+        return section + 1
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        # Qt passes -1 to mean "unsorted"
+        self.sort_column = column if column >= 0 else None
+        self.descending = order == Qt.DescendingOrder
+        self.refresh()
+
+    def on_store_changed(self, kind, first, last):
+        if kind == 'updated':
+            if self.rows is None and first < self.loaded:
+                self.dataChanged.emit(self.index(first, 0), self.index(last, self.columnCount() - 1))
+            elif self.rows is not None and not self.refresh_timer.isActive():
+                # The edited row may have moved in or out of the view
+                self.refresh_timer.start()
+            return
+
+        if self.rows is None:
+            # Appended rows become reachable through fetchMore; make sure a
+            # view that had run out of rows gets a first chunk
+            if self.loaded < self.FETCH_SIZE:
+                self.fetchMore()
+            return
+        if not self.refresh_timer.isActive():
+            self.refresh_timer.start()
@@ -0,0 +1,101 @@
+import logging
+import time
+
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
+from PyQt5.QtGui import QColor
+
+from core.events import LOG_APPENDED
+
+LEVEL_COLORS = {
+    logging.DEBUG: QColor('#A0A0B0'),
+    logging.WARNING: QColor('#f59e0b'),
+    logging.ERROR: QColor('#ef4444'),
+    logging.CRITICAL: QColor('#ef4444'),
+}
+
+
+class LogListModel(QAbstractListModel):
+    """List model over a LogRing, holding only the sequence numbers in view.
+
+    New lines are matched against the filter one by one as they arrive and
+    overwritten lines are dropped from the front, so keeping up with the log
+    never rescans the ring; only a filter change does, through its indexes.
+    """
+
+    # The seq list is compacted once this many dropped entries pile up at its head
+    COMPACT_AT = 4096
+
+    def __init__(self, ring, bus, parent=None):
+        super().__init__(parent)
+        self.ring = ring
+        self.bus = bus
+        self.filter = ring.compile_filter()
+        self.seqs = []
+        self.head = 0           # entries of self.seqs already dropped
+        self.seen = 0           # next seq not yet looked at
+        self.reload()
+        bus.subscribe(LOG_APPENDED, self.on_appended)
+
+    def release(self):
+        self.bus.unsubscribe(LOG_APPENDED, self.on_appended)
+
+    def set_filter(self, min_level=None, bot=None, bank=None):
+        self.filter = self.ring.compile_filter(min_level, bot, bank)
+        self.reload()
+
+    def reload(self):
+        self.beginResetModel()
+        self.seen = self.ring.next_seq
+        self.seqs = self.ring.select(self.filter)
+        self.head = 0
+        self.endResetModel()
+
+    def on_appended(self, batch):
+        self.drop_overwritten()
+        end = self.ring.next_seq
+        start = max(self.seen, self.ring.first_seq)
+        self.seen = end
+        matches = self.ring.matches
+        compiled = self.filter
+        new = [seq for seq in range(start, end) if matches(seq, compiled)]
+        if new:
+            first = len(self.seqs) - self.head
+            self.beginInsertRows(QModelIndex(), first, first + len(new) - 1)
+            self.seqs.extend(new)
+            self.endInsertRows()
+
+    def drop_overwritten(self):
+        first_seq = self.ring.first_seq
+        count = 0
+        while self.head + count < len(self.seqs) and self.seqs[self.head + count] < first_seq:
+            count += 1
+        if not count:
+            return
+        self.beginRemoveRows(QModelIndex(), 0, count - 1)
+        self.head += count
+        if self.head >= self.COMPACT_AT:
+            del self.seqs[:self.head]
+            self.head = 0
+        self.endRemoveRows()
+
+    # Qt model interface
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.seqs) - self.head
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            record = self.ring.record(self.seqs[self.head + index.row()])
+            if record is None:
+                return None
+            created, level, bot, bank, message = record
+            source = '/'.join(name for name in (bot, bank) if name)
+            stamp = time.strftime('%H:%M:%S', time.localtime(created))
+            prefix = f"{stamp} {logging.getLevelName(level):<8}"
+            return f"{prefix} [{source}] {message}" if source else f"{prefix} {message}"
+        if role == Qt.ForegroundRole:
+            record = self.ring.record(self.seqs[self.head + index.row()])
+            return LEVEL_COLORS.get(record[1]) if record is not None else None
+        return None
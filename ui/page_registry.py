@@ -0,0 +1,102 @@
+from collections import OrderedDict
+
+from PyQt5.QtWidgets import QWidget
+
+from core import instrument
+
+
+class PageRegistry:
+    """Builds pages on their first visit and tears down least recently used ones.
+
+    Pages are registered as factories. A page is only constructed when it is
+    requested, and once the number of live pages (or the number of widgets they
+    own) exceeds the budget the least recently used page is removed from the
+    stacked widget and deleted. It is rebuilt from its factory on the next visit.
+    """
+
+    def __init__(self, stacked_widget, max_pages=None, max_widgets=None, pinned=()):
+        self.stacked_widget = stacked_widget
+        self.max_pages = max_pages
+        self.max_widgets = max_widgets
+        self.pinned = set(pinned)
+
+        self._factories = {}
+        self._live = OrderedDict()   # page_id -> page, oldest first
+        self._costs = {}             # page_id -> widget count at build time
+
+        self.built_count = 0
+        self.evicted_count = 0
+
+    def register(self, page_id, factory):
+        self._factories[page_id] = factory
+
+    def __contains__(self, page_id):
+        return page_id in self._factories
+
+    def is_built(self, page_id):
+        return page_id in self._live
+
+    def live_pages(self):
+        return list(self._live)
+
+    def widget_count(self):
+        return sum(self._costs.values())
+
+    def get(self, page_id):
+        page = self._live.get(page_id)
+        if page is None:
+            page = self._build(page_id)
+        else:
+            self._live.move_to_end(page_id)
+        self._enforce_budget(keep=page_id)
+        return page
+
+    def prefetch(self, page_id):
+        """Build a page ahead of time if that fits the budget without evicting."""
+        if page_id in self._live or page_id not in self._factories:
+            return False
+        if self.max_pages is not None and len(self._live) >= self.max_pages:
+            return False
+        self._build(page_id)
+        # Until it is visited a prefetched page is the first to go
+        self._live.move_to_end(page_id, last=False)
+        if self._over_budget():
+            self.evict(page_id)
+            return False
+        return True
+
+    def evict(self, page_id):
+        page = self._live.pop(page_id, None)
+        if page is None:
+            return False
+        self._costs.pop(page_id, None)
+        self.stacked_widget.removeWidget(page)
+        page.deleteLater()
+        self.evicted_count += 1
+        return True
+
+    def _build(self, page_id):
+        with instrument.timer('ui.page_build.' + page_id):
+            page = self._factories[page_id]()
+            self.stacked_widget.addWidget(page)
+        self._live[page_id] = page
+        self._costs[page_id] = len(page.findChildren(QWidget)) + 1
+        self.built_count += 1
+        return page
+
+    def _over_budget(self):
+        if self.max_pages is not None and len(self._live) > self.max_pages:
+            return True
+        if self.max_widgets is not None and self.widget_count() > self.max_widgets:
+            return True
+        return False
+
+    def _enforce_budget(self, keep):
+        current = self.stacked_widget.currentWidget()
+        for page_id in list(self._live):
+            if not self._over_budget():
+                break
+            page = self._live[page_id]
+            if page_id == keep or page_id in self.pinned or page is current:
+                continue
+            self.evict(page_id)
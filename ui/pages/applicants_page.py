@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+
+from PyQt5.QtWidgets import (QHBoxLayout, QComboBox, QTableView, QHeaderView, QAbstractItemView,
+                             QPushButton, QProgressBar, QLabel, QFileDialog, QLineEdit)
+from PyQt5.QtCore import Qt, QTimer
+from .base_page import BasePage
+from ui.models.applicant_model import ApplicantTableModel
+from ui.workers.applicant_import import get_importer
+from core.applicants.search import get_search_index
+from core.applicants.store import get_store
+
+class ApplicantsPage(BasePage):
+    """صفحه متقاضیان یک ربات وام"""
+    
+    ROW_HEIGHT = 32
+    # جستجو پس از این مکث در تایپ اجرا می‌شود
+    SEARCH_DELAY_MS = 200
+    
+    def __init__(self, page_id, title, loan_type, parent=None):
+        self.loan_type = loan_type
+        self.store = get_store()
+        self.importer = get_importer()
+        super().__init__(page_id, title, parent)
+        
+    def create_content(self):
+        """ایجاد جدول متقاضیان"""
+        # فیلتر بانک
+        filters_layout = QHBoxLayout()
+        self.bank_filter = QComboBox()
+        self.bank_filter.setObjectName("applicantsFilter")
+        self.reload_bank_filter()
+        self.bank_filter.currentIndexChanged.connect(self.on_bank_filter_changed)
+        filters_layout.addWidget(self.bank_filter)
+        
+        # جستجو در نام، کد ملی و شماره همراه
+        self.search_edit = QLineEdit()
+        self.search_edit.setObjectName("applicantsSearch")
+        self.search_edit.setPlaceholderText("جستجوی نام، کد ملی یا شماره همراه")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.on_search)
+        self.search_edit.textChanged.connect(self.search_timer.start)
+        filters_layout.addWidget(self.search_edit)
+        filters_layout.addStretch()
+        
+        # ورود فهرست متقاضیان
+        self.import_status = QLabel()
+        self.import_status.setObjectName("importStatus")
+        self.import_progress = QProgressBar()
+        self.import_progress.setObjectName("importProgress")
+        self.import_progress.setRange(0, 1000)
+        self.import_progress.setTextVisible(False)
+        self.import_progress.setFixedWidth(160)
+        self.import_button = QPushButton("ورود فهرست")
+        self.import_button.setObjectName("importButton")
+        self.import_button.setCursor(Qt.PointingHandCursor)
+        self.import_button.clicked.connect(self.on_import_clicked)
+        
+        filters_layout.addWidget(self.import_status)
+        filters_layout.addWidget(self.import_progress)
+        filters_layout.addWidget(self.import_button)
+        self.content_layout.addLayout(filters_layout)
+        
+        self.importer.started.connect(self.on_import_started)
+        self.importer.progress.connect(self.on_import_progress)
+        self.importer.finished.connect(self.on_import_finished)
+        self.importer.cancelled.connect(self.on_import_cancelled)
+        self.importer.failed.connect(self.on_import_failed)
+        self.update_import_controls()
+        
+        # مدل فقط شناسه ردیف‌ها را نگه می‌دارد و داده را مستقیم از ستون‌ها می‌خواند
+        self.model = ApplicantTableModel(self.store, {'loan_type': {self.loan_type}},
+                                         get_search_index(), self)
+        
+        self.table = QTableView()
+        self.table.setObjectName("applicantsTable")
+        self.table.setModel(self.model)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(-1, Qt.AscendingOrder)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setWordWrap(False)
+        
+        # ارتفاع ثابت ردیف‌ها تا نما برای محاسبه چیدمان همه ردیف‌ها را نپیماید
+        vertical_header = self.table.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.Fixed)
+        vertical_header.setDefaultSectionSize(self.ROW_HEIGHT)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        
+        self.content_layout.addWidget(self.table)
+        
+    def reload_bank_filter(self):
+        """بروزرسانی فهرست بانک‌ها"""
+        current = self.bank_filter.currentData()
+        self.bank_filter.blockSignals(True)
+        self.bank_filter.clear()
+        self.bank_filter.addItem("همه بانک‌ها", None)
+        for bank in self.store.distinct('bank'):
+            self.bank_filter.addItem(bank, bank)
+        index = self.bank_filter.findData(current)
+        self.bank_filter.setCurrentIndex(max(index, 0))
+        self.bank_filter.blockSignals(False)
+        
+    def on_bank_filter_changed(self):
+        bank = self.bank_filter.currentData()
+        self.model.set_filter('bank', {bank} if bank else None)
+        
+    def on_search(self):
+        self.model.set_search(self.search_edit.text())
+        
+    def on_import_clicked(self):
+        if self.importer.is_running():
+            self.importer.cancel()
+            return
+        path, _ = QFileDialog.getOpenFileName(
+            self, "ورود فهرست متقاضیان", os.path.expanduser("~"),
+            "فهرست متقاضیان (*.csv *.tsv *.tab *.txt *.jsonl *.ndjson)"
+        )
+        if not path:
+            return
+        self.importer.start(path, {'loan_type': self.loan_type})
+        
+    def on_import_started(self):
+        self.import_status.setText("در حال ورود...")
+        self.update_import_controls()
+        
+    def update_import_controls(self):
+        running = self.importer.is_running()
+        self.import_progress.setVisible(running)
+        self.import_button.setText("لغو ورود" if running else "ورود فهرست")
+        
+    def on_import_progress(self, rows, failed, bytes_read, total_bytes):
+        self.import_progress.setValue(bytes_read * 1000 // max(total_bytes, 1))
+        self.import_status.setText(f"{rows:,} ردیف" + self.failed_text(failed))
+        
+    def failed_text(self, failed):
+        return f" ({failed:,} ردیف نامعتبر)" if failed else ""
+        
+    def on_import_finished(self, rows, failed):
+        self.import_status.setText(f"{rows:,} ردیف وارد شد" + self.failed_text(failed))
+        self.update_import_controls()
+        self.reload_bank_filter()
+        
+    def on_import_cancelled(self, rows, failed):
+        self.import_status.setText(f"ورود لغو شد ({rows:,} ردیف)" + self.failed_text(failed))
+        self.update_import_controls()
+        self.reload_bank_filter()
+        
+    def on_import_failed(self, message):
+        self.import_status.setText(f"خطا در ورود فایل: {message}")
+        self.update_import_controls()
+        
+    def refresh_page(self):
+        """بروزرسانی فیلترها و جدول"""
+        self.reload_bank_filter()
+        self.model.refresh()
@@ -3,7 +3,6 @@
 
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QFrame, QLabel
 from PyQt5.QtCore import Qt, pyqtSignal
-from ..styles.colors import AppStyles
 
 class BasePage(QWidget):
     """کلاس پایه برای تمام صفحات"""
@@ -26,7 +25,6 @@ class BasePage(QWidget):
         # فریم محتوا
         self.content_frame = QFrame()
         self.content_frame.setObjectName("pageContent")
-        self.content_frame.setStyleSheet(AppStyles.get_page_content_style())
         
         self.content_layout = QVBoxLayout(self.content_frame)
         self.content_layout.setContentsMargins(0, 0, 0, 0)
@@ -34,7 +32,7 @@ class BasePage(QWidget):
         
         # عنوان صفحه
         self.title_label = QLabel(self.page_title)
-        self.title_label.setStyleSheet(AppStyles.get_page_title_style())
+        self.title_label.setObjectName("pageTitle")
         self.content_layout.addWidget(self.title_label)
         
         # ناحیه محتوای سفارشی
@@ -68,14 +66,7 @@ class SimpleContentPage(BasePage):
     def create_content(self):
         """ایجاد محتوای ساده"""
         content_label = QLabel(self.content_text)
-        content_label.setStyleSheet(f"""
-            QLabel {{
-                color: #E0E0E0;
-                font-size: 16px;
-                line-height: 1.6;
-                padding: 20px;
-            }}
-        """)
+        content_label.setObjectName("pageText")
         content_label.setWordWrap(True)
         self.content_layout.addWidget(content_label)
         self.content_layout.addStretch()
\ No newline at end of file
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from PyQt5.QtWidgets import QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QLabel
+from PyQt5.QtCore import Qt, QTimer
+from .base_page import BasePage
+from core.net.transport import get_transport
+
+class DiagnosticsPage(BasePage):
+    """صفحه عیب‌یابی اتصال به بانک‌ها"""
+    
+    REFRESH_MS = 1000
+    
+    # (کلید آمار، عنوان ستون)
+    POOL_COLUMNS = (
+        (None, "میزبان"),
+        ('in_use', "در حال استفاده"),
+        ('idle', "بیکار"),
+        ('waiting', "در انتظار"),
+        ('limit', "سقف"),
+        ('opened', "اتصال جدید"),
+        ('reused', "استفاده مجدد"),
+        ('tls_resumed', "ازسرگیری TLS"),
+        ('requests', "درخواست"),
+        ('wait_ms_avg', "انتظار میانگین (ms)"),
+        ('wait_ms_max', "انتظار بیشینه (ms)"),
+    )
+    
+    def __init__(self, page_id, title, parent=None):
+        self.transport = get_transport()
+        super().__init__(page_id, title, parent)
+        
+    def create_content(self):
+        """ایجاد جدول آمار اتصال‌ها"""
+        section_label = QLabel("اتصال‌های بانک")
+        section_label.setObjectName("diagnosticsSection")
+        self.content_layout.addWidget(section_label)
+        
+        self.pool_table = QTableWidget(0, len(self.POOL_COLUMNS))
+        self.pool_table.setObjectName("diagnosticsTable")
+        self.pool_table.setHorizontalHeaderLabels([title for _, title in self.POOL_COLUMNS])
+        self.pool_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.pool_table.verticalHeader().setVisible(False)
+        self.pool_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.pool_table.horizontalHeader().setStretchLastSection(True)
+        self.content_layout.addWidget(self.pool_table)
+        
+        # فقط وقتی صفحه دیده می‌شود بروزرسانی می‌شود
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(self.REFRESH_MS)
+        self.refresh_timer.timeout.connect(self.refresh_page)
+        
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh_page()
+        self.refresh_timer.start()
+        
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.refresh_timer.stop()
+        
+    def refresh_page(self):
+        """بروزرسانی آمار اتصال‌ها"""
+        stats = sorted(self.transport.stats().items())
+        self.pool_table.setRowCount(len(stats))
+        for row, (host, pool) in enumerate(stats):
+            for column, (key, _) in enumerate(self.POOL_COLUMNS):
+                value = host if key is None else pool[key]
+                text = f"{value:.1f}" if isinstance(value, float) else str(value)
+                item = self.pool_table.item(row, column)
+                if item is None:
+                    item = QTableWidgetItem()
+                    item.setTextAlignment(Qt.AlignCenter)
+                    self.pool_table.setItem(row, column, item)
+                item.setText(text)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from PyQt5.QtWidgets import QHBoxLayout, QPushButton, QLabel, QScrollArea
+from PyQt5.QtCore import Qt
+from .base_page import BasePage
+from ui.components.document_view import DocumentView
+from ui.documents import get_document_cache
+
+class EducationPage(BasePage):
+    """صفحه نمایش یک آموزش با صفحه‌بندی"""
+    
+    def __init__(self, page_id, title, tutorial, parent=None):
+        self.tutorial = tutorial
+        self.cache = get_document_cache()
+        self.source = None
+        self.page_index = 0
+        super().__init__(page_id, title, parent)
+        
+    def create_content(self):
+        """ایجاد نوار صفحه‌بندی و ناحیه متن"""
+        pager_layout = QHBoxLayout()
+        self.prev_button = QPushButton("→ صفحه قبل")
+        self.prev_button.setObjectName("pagerButton")
+        self.prev_button.setCursor(Qt.PointingHandCursor)
+        self.prev_button.clicked.connect(lambda: self.show_page_index(self.page_index - 1))
+        self.next_button = QPushButton("صفحه بعد ←")
+        self.next_button.setObjectName("pagerButton")
+        self.next_button.setCursor(Qt.PointingHandCursor)
+        self.next_button.clicked.connect(lambda: self.show_page_index(self.page_index + 1))
+        self.pager_label = QLabel()
+        self.pager_label.setObjectName("pagerLabel")
+        # ترتیب راست به چپ: صفحه بعد در سمت چپ
+        pager_layout.addWidget(self.next_button)
+        pager_layout.addStretch()
+        pager_layout.addWidget(self.pager_label)
+        pager_layout.addStretch()
+        pager_layout.addWidget(self.prev_button)
+        self.content_layout.addLayout(pager_layout)
+        
+        # متن فقط برای بخش‌هایی که دیده می‌شوند چیده می‌شود
+        self.document_view = DocumentView(self.cache)
+        self.scroll = QScrollArea()
+        self.scroll.setObjectName("educationScroll")
+        self.scroll.setWidgetResizable(True)
+        self.scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.scroll.setWidget(self.document_view)
+        # setWidget turns on background filling; the page background shows through
+        self.document_view.setAutoFillBackground(False)
+        self.content_layout.addWidget(self.scroll)
+        
+        self.missing_label = QLabel("این آموزش هنوز آماده نشده است.")
+        self.missing_label.setObjectName("pageText")
+        self.content_layout.addWidget(self.missing_label)
+        
+        self.load_source()
+        
+    def load_source(self):
+        """خواندن آموزش (فقط اگر فایل تغییر کرده باشد دوباره پردازش می‌شود)"""
+        source = self.cache.source(self.tutorial)
+        if source is not None and source is self.source:
+            return
+        self.source = source
+        self.scroll.setVisible(source is not None)
+        self.missing_label.setVisible(source is None)
+        if source is None:
+            self.update_pager()
+            return
+        self.show_page_index(min(self.page_index, len(source.pages) - 1))
+        
+    def show_page_index(self, page_index):
+        if self.source is None or not 0 <= page_index < len(self.source.pages):
+            return
+        self.page_index = page_index
+        self.document_view.set_sections(self.source, self.source.pages[page_index])
+        self.scroll.verticalScrollBar().setValue(0)
+        self.update_pager()
+        
+    def update_pager(self):
+        count = len(self.source.pages) if self.source is not None else 0
+        self.pager_label.setText(f"صفحه {self.page_index + 1} از {count}" if count else "")
+        self.prev_button.setEnabled(self.page_index > 0)
+        self.next_button.setEnabled(self.page_index < count - 1)
+        for widget in (self.prev_button, self.next_button, self.pager_label):
+            widget.setVisible(count > 1)
+            
+    def refresh_page(self):
+        """بروزرسانی آموزش در صورت تغییر فایل"""
+        self.load_source()
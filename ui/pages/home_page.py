@@ -2,31 +2,27 @@
 # -*- coding: utf-8 -*-
 
 from PyQt5.QtWidgets import QVBoxLayout, QHBoxLayout, QLabel, QFrame
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from .base_page import BasePage
-from ..styles.colors import AppColors
+from ui.icons import get_icon_service
+from core.bots.live_stats import get_live_stats
 
 class HomePage(BasePage):
     """صفحه اصلی برنامه"""
     
+    CARD_ICON_SIZE = 40
+    REFRESH_MS = 1000
+    
     def __init__(self, parent=None):
+        self.live_stats = get_live_stats()
+        self.stats_labels = {}
         super().__init__("home", "صفحه اصلی", parent)
         
     def create_content(self):
         """ایجاد محتوای صفحه اصلی"""
         # متن خوشامدگویی
         welcome_text = QLabel("به سامانه YARA خوش آمدید. از منوی سمت راست بخش مورد نظر خود را انتخاب کنید.")
-        welcome_text.setStyleSheet(f"""
-            QLabel {{
-                color: {AppColors.DARK_TEXT};
-                font-size: 16px;
-                line-height: 1.6;
-                padding: 20px;
-                background-color: rgba(59, 130, 246, 0.1);
-                border-radius: 8px;
-                border: 1px solid {AppColors.PRIMARY};
-            }}
-        """)
+        welcome_text.setObjectName("homeWelcome")
         welcome_text.setWordWrap(True)
         self.content_layout.addWidget(welcome_text)
         
@@ -35,6 +31,11 @@ class HomePage(BasePage):
         
         self.content_layout.addStretch()
         
+        # آمار زنده هر ثانیه و فقط وقتی صفحه دیده می‌شود بروزرسانی می‌شود
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(self.REFRESH_MS)
+        self.refresh_timer.timeout.connect(self.refresh_stats)
+        
     def create_info_cards(self):
         """ایجاد کارت‌های اطلاعاتی"""
         cards_layout = QHBoxLayout()
@@ -44,7 +45,8 @@ class HomePage(BasePage):
         marriage_card = self.create_info_card(
             "💍", 
             "ربات وام ازدواج", 
-            "اتوماسیون فرآیند ثبت نام وام ازدواج در بانک‌های مختلف"
+            "اتوماسیون فرآیند ثبت نام وام ازدواج در بانک‌های مختلف",
+            'marriage-loan'
         )
         cards_layout.addWidget(marriage_card)
         
@@ -52,7 +54,8 @@ class HomePage(BasePage):
         child_card = self.create_info_card(
             "👶",
             "ربات وام فرزند",
-            "اتوماسیون فرآیند ثبت نام وام فرزندآوری در بانک‌های مختلف"
+            "اتوماسیون فرآیند ثبت نام وام فرزندآوری در بانک‌های مختلف",
+            'child-loan'
         )
         cards_layout.addWidget(child_card)
         
@@ -66,62 +69,60 @@ class HomePage(BasePage):
         
         self.content_layout.addLayout(cards_layout)
         
-    def create_info_card(self, icon, title, description):
-        """ایجاد کارت اطلاعاتی"""
+    def create_info_card(self, icon, title, description, bot=None):
+        """ایجاد کارت اطلاعاتی؛ کارت ربات‌ها آمار زنده هم دارند"""
         card = QFrame()
-        card.setStyleSheet(f"""
-            QFrame {{
-                background-color: {AppColors.DARK_BG};
-                border: 1px solid {AppColors.DARK_BORDER};
-                border-radius: 12px;
-                padding: 20px;
-            }}
-            QFrame:hover {{
-                border-color: {AppColors.PRIMARY};
-                background-color: {AppColors.DARK_HOVER};
-            }}
-        """)
+        card.setObjectName("infoCard")
         
         layout = QVBoxLayout(card)
         layout.setAlignment(Qt.AlignCenter)
         layout.setSpacing(15)
         
         # آیکون
-        icon_label = QLabel(icon)
+        icon_label = QLabel()
         icon_label.setAlignment(Qt.AlignCenter)
-        icon_label.setStyleSheet("""
-            QLabel {
-                font-size: 36px;
-                margin-bottom: 10px;
-            }
-        """)
+        icon_label.setObjectName("infoCardIcon")
+        icon_label.setPixmap(get_icon_service().pixmap(icon, self.CARD_ICON_SIZE))
         
         # عنوان
         title_label = QLabel(title)
         title_label.setAlignment(Qt.AlignCenter)
-        title_label.setStyleSheet(f"""
-            QLabel {{
-                color: {AppColors.LIGHT_TEXT};
-                font-size: 18px;
-                font-weight: bold;
-                margin-bottom: 10px;
-            }}
-        """)
+        title_label.setObjectName("infoCardTitle")
         
         # توضیحات
         desc_label = QLabel(description)
         desc_label.setAlignment(Qt.AlignCenter)
         desc_label.setWordWrap(True)
-        desc_label.setStyleSheet(f"""
-            QLabel {{
-                color: {AppColors.MUTED_TEXT};
-                font-size: 14px;
-                line-height: 1.4;
-            }}
-        """)
+        desc_label.setObjectName("infoCardDesc")
         
         layout.addWidget(icon_label)
         layout.addWidget(title_label)
         layout.addWidget(desc_label)
         
-        return card
\ No newline at end of file
+        if bot is not None:
+            stats_label = QLabel()
+            stats_label.setAlignment(Qt.AlignCenter)
+            stats_label.setObjectName("infoCardStats")
+            layout.addWidget(stats_label)
+            self.stats_labels[bot] = stats_label
+        
+        return card
+        
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh_stats()
+        self.refresh_timer.start()
+        
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.refresh_timer.stop()
+        
+    def refresh_stats(self):
+        """نمایش آمار زنده ربات‌ها روی کارت‌ها"""
+        for bot, label in self.stats_labels.items():
+            stats = self.live_stats.snapshot(bot)
+            text = (f"در صف {stats.queued:,} · در حال اجرا {stats.running:,}\n"
+                    f"موفق {stats.succeeded:,} · ناموفق {stats.failed:,} · {stats.per_minute:,.0f} در دقیقه")
+            # متن تکراری دوباره چیده نمی‌شود
+            if label.text() != text:
+                label.setText(text)
\ No newline at end of file
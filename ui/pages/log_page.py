@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import logging
+
+from PyQt5.QtWidgets import QHBoxLayout, QComboBox, QListView, QAbstractItemView, QLabel
+from PyQt5.QtCore import Qt
+from .base_page import BasePage
+from ui.models.log_model import LogListModel
+from core.events import get_event_bus
+from core.logs import get_log_ring
+
+class LogConsolePage(BasePage):
+    """صفحه گزارش زنده ربات‌ها و موتور"""
+    
+    LEVELS = (
+        ("همه سطوح", None),
+        ("DEBUG", logging.DEBUG),
+        ("INFO", logging.INFO),
+        ("WARNING", logging.WARNING),
+        ("ERROR", logging.ERROR),
+    )
+    
+    def __init__(self, page_id, title, parent=None):
+        self.ring = get_log_ring()
+        super().__init__(page_id, title, parent)
+        
+    def create_content(self):
+        """ایجاد فیلترها و فهرست گزارش"""
+        filters_layout = QHBoxLayout()
+        
+        self.level_filter = QComboBox()
+        self.level_filter.setObjectName("applicantsFilter")
+        for text, level in self.LEVELS:
+            self.level_filter.addItem(text, level)
+        self.bot_filter = QComboBox()
+        self.bot_filter.setObjectName("applicantsFilter")
+        self.bank_filter = QComboBox()
+        self.bank_filter.setObjectName("applicantsFilter")
+        self.reload_name_filters()
+        
+        for combo in (self.level_filter, self.bot_filter, self.bank_filter):
+            combo.currentIndexChanged.connect(self.on_filter_changed)
+            filters_layout.addWidget(combo)
+        filters_layout.addStretch()
+        
+        self.count_label = QLabel()
+        self.count_label.setObjectName("importStatus")
+        filters_layout.addWidget(self.count_label)
+        self.content_layout.addLayout(filters_layout)
+        
+        # فقط شماره ردیف‌ها در مدل نگه داشته می‌شود و متن هنگام نمایش ساخته می‌شود
+        self.model = LogListModel(self.ring, get_event_bus(), self)
+        self.model.rowsInserted.connect(self.on_rows_inserted)
+        
+        self.list_view = QListView()
+        self.list_view.setObjectName("logList")
+        self.list_view.setModel(self.model)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setLayoutMode(QListView.Batched)
+        self.list_view.setBatchSize(500)
+        self.list_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.list_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.list_view.setLayoutDirection(Qt.LeftToRight)
+        self.content_layout.addWidget(self.list_view)
+        self.update_count()
+        
+    def reload_name_filters(self):
+        """بروزرسانی فهرست ربات‌ها و بانک‌ها"""
+        for combo, field, all_text in ((self.bot_filter, 'bot', "همه ربات‌ها"),
+                                       (self.bank_filter, 'bank', "همه بانک‌ها")):
+            names = self.ring.value_names(field)
+            if combo.count() == len(names) + 1:
+                continue
+            current = combo.currentData()
+            combo.blockSignals(True)
+            combo.clear()
+            combo.addItem(all_text, None)
+            for name in names:
+                combo.addItem(name, name)
+            combo.setCurrentIndex(max(combo.findData(current), 0))
+            combo.blockSignals(False)
+            
+    def on_filter_changed(self):
+        self.model.set_filter(self.level_filter.currentData(), self.bot_filter.currentData(),
+                              self.bank_filter.currentData())
+        self.update_count()
+        
+    def on_rows_inserted(self):
+        # دنبال کردن انتهای فهرست فقط وقتی کاربر در انتها است
+        scroll_bar = self.list_view.verticalScrollBar()
+        if scroll_bar.value() >= scroll_bar.maximum() - 1:
+            self.list_view.scrollToBottom()
+        if self.isVisible():
+            self.reload_name_filters()
+            self.update_count()
+            
+    def update_count(self):
+        self.count_label.setText(f"{self.model.rowCount():,} خط از {len(self.ring):,}")
+        
+    def refresh_page(self):
+        """بروزرسانی فیلترها"""
+        self.reload_name_filters()
+        self.update_count()
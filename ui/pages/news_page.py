@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+
+from PyQt5.QtWidgets import QFrame, QVBoxLayout, QLabel, QScrollArea, QWidget
+from PyQt5.QtCore import Qt
+from .base_page import BasePage
+from core.events import NEWS_UPDATED, get_event_bus
+from core.news import diff_items, get_news_feed
+
+class NewsCard(QFrame):
+    """کارت یک خبر"""
+    
+    def __init__(self, item, parent=None):
+        super().__init__(parent)
+        self.setObjectName("newsCard")
+        self.item = None
+        
+        layout = QVBoxLayout(self)
+        layout.setSpacing(6)
+        self.title_label = QLabel()
+        self.title_label.setObjectName("newsTitle")
+        self.title_label.setWordWrap(True)
+        self.date_label = QLabel()
+        self.date_label.setObjectName("newsDate")
+        self.body_label = QLabel()
+        self.body_label.setObjectName("newsBody")
+        self.body_label.setWordWrap(True)
+        layout.addWidget(self.title_label)
+        layout.addWidget(self.date_label)
+        layout.addWidget(self.body_label)
+        self.set_item(item)
+        
+    def set_item(self, item):
+        """بروزرسانی فقط متن‌هایی که تغییر کرده‌اند"""
+        if item == self.item:
+            return
+        self.item = item
+        for label, text in ((self.title_label, item['title']),
+                            (self.date_label, item['published']),
+                            (self.body_label, item['body'])):
+            if label.text() != text:
+                label.setText(text)
+            label.setVisible(bool(text))
+
+class NewsPage(BasePage):
+    """صفحه اخبار و اطلاعیه‌ها"""
+    
+    def __init__(self, page_id, title, parent=None):
+        self.feed = get_news_feed()
+        self.cards = {}
+        super().__init__(page_id, title, parent)
+        
+    def create_content(self):
+        """ایجاد فهرست اخبار از نسخه ذخیره‌شده روی دیسک"""
+        self.status_label = QLabel()
+        self.status_label.setObjectName("newsStatus")
+        self.content_layout.addWidget(self.status_label)
+        
+        self.items_widget = QWidget()
+        self.items_widget.setObjectName("newsItems")
+        self.items_layout = QVBoxLayout(self.items_widget)
+        self.items_layout.setContentsMargins(0, 0, 0, 0)
+        self.items_layout.setSpacing(12)
+        self.items_layout.addStretch()
+        
+        scroll = QScrollArea()
+        scroll.setObjectName("newsScroll")
+        scroll.setWidgetResizable(True)
+        scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        scroll.setWidget(self.items_widget)
+        self.content_layout.addWidget(scroll)
+        
+        if self.feed is not None:
+            self.show_items(self.feed.items)
+            get_event_bus().subscribe(NEWS_UPDATED, self.on_news_updated)
+        self.update_status()
+        
+    def show_items(self, items):
+        """اعمال تفاوت فهرست جدید با کارت‌های فعلی"""
+        shown = tuple(card.item for card in self.cards_in_order())
+        diff = diff_items(shown, items)
+        if diff is None:
+            return
+        for item_id in diff.removed:
+            card = self.cards.pop(item_id)
+            self.items_layout.removeWidget(card)
+            card.deleteLater()
+        for position, item in enumerate(items):
+            card = self.cards.get(item['id'])
+            if card is None:
+                card = self.cards[item['id']] = NewsCard(item)
+            else:
+                card.set_item(item)
+            # جابجایی فقط وقتی ترتیب تغییر کرده باشد
+            if self.items_layout.indexOf(card) != position:
+                self.items_layout.insertWidget(position, card)
+                
+    def cards_in_order(self):
+        # آخرین آیتم چیدمان فاصله‌انداز انتهای فهرست است
+        return [self.items_layout.itemAt(index).widget()
+                for index in range(self.items_layout.count() - 1)]
+                
+    def on_news_updated(self, batch):
+        # رویدادها روی هم ادغام می‌شوند؛ آخرین فهرست کامل کافی است
+        self.show_items(batch[-1].items)
+        self.update_status()
+        
+    def update_status(self):
+        if self.feed is None:
+            text = "منبع اخبار تنظیم نشده است."
+        elif not self.cards:
+            text = "خبری برای نمایش وجود ندارد."
+        elif self.feed.fetched_at:
+            text = "آخرین بروزرسانی: " + time.strftime('%Y/%m/%d %H:%M', time.localtime(self.feed.fetched_at))
+        else:
+            text = ""
+        self.status_label.setText(text)
+        self.status_label.setVisible(bool(text))
+        
+    def refresh_page(self):
+        """بروزرسانی اخبار از آخرین نسخه دریافت‌شده"""
+        if self.feed is not None:
+            self.show_items(self.feed.items)
+        self.update_status()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+
+from PyQt5.QtWidgets import QHBoxLayout, QLineEdit, QPushButton, QLabel
+from PyQt5.QtCore import Qt, QObject, pyqtSignal
+from .base_page import BasePage
+from core.applicants.store import get_store
+from core.events import NOTIFY_STATS, get_event_bus
+from core.notifications import SMS, applicant_messages, get_dispatcher
+
+class _QueueSignals(QObject):
+    # تعداد پیام‌های پذیرفته‌شده، از رشته پس‌زمینه به رشته رابط
+    queued = pyqtSignal(int)
+
+class NotificationsPage(BasePage):
+    """صفحه اطلاع‌رسانی به متقاضیان یک ربات وام"""
+    
+    # (کلید آمار، عنوان)
+    STAT_FIELDS = (
+        ('sent', "ارسال شده"),
+        ('failed', "ناموفق"),
+        ('batches', "درخواست"),
+        ('busy', "درخواست رد شده (شلوغی)"),
+        ('limit', "درخواست هم‌زمان"),
+        ('deduplicated', "پیام تکراری"),
+    )
+    
+    def __init__(self, page_id, title, bot, loan_type, parent=None):
+        self.bot = bot
+        self.loan_type = loan_type
+        self.store = get_store()
+        self.dispatcher = get_dispatcher()
+        self.signals = _QueueSignals()
+        super().__init__(page_id, title, parent)
+        
+    def create_content(self):
+        """ایجاد فرم ارسال پیام و آمار ارسال"""
+        self.content_frame.setLayoutDirection(Qt.RightToLeft)
+        
+        section_label = QLabel("ارسال پیام به متقاضیان")
+        section_label.setObjectName("diagnosticsSection")
+        self.content_layout.addWidget(section_label)
+        
+        message_layout = QHBoxLayout()
+        self.message_edit = QLineEdit()
+        self.message_edit.setObjectName("settingsEditor")
+        self.message_edit.setPlaceholderText("متن پیام")
+        self.send_button = QPushButton("ارسال به همه متقاضیان")
+        self.send_button.setObjectName("importButton")
+        self.send_button.clicked.connect(self.on_send_message)
+        message_layout.addWidget(self.message_edit, 1)
+        message_layout.addWidget(self.send_button)
+        self.content_layout.addLayout(message_layout)
+        
+        result_layout = QHBoxLayout()
+        self.results_button = QPushButton("ارسال نتیجه ثبت‌نام")
+        self.results_button.setObjectName("importButton")
+        self.results_button.clicked.connect(self.on_send_results)
+        self.queue_status = QLabel()
+        self.queue_status.setObjectName("importStatus")
+        result_layout.addWidget(self.results_button)
+        result_layout.addWidget(self.queue_status)
+        result_layout.addStretch()
+        self.content_layout.addLayout(result_layout)
+        
+        stats_label = QLabel("وضعیت ارسال")
+        stats_label.setObjectName("diagnosticsSection")
+        self.content_layout.addWidget(stats_label)
+        self.stats_label = QLabel()
+        self.stats_label.setObjectName("importStatus")
+        self.content_layout.addWidget(self.stats_label)
+        self.content_layout.addStretch()
+        
+        if self.dispatcher is None:
+            # بدون سرویس پیامک فقط راهنما نمایش داده می‌شود
+            for widget in (self.message_edit, self.send_button, self.results_button):
+                widget.setEnabled(False)
+            self.stats_label.setText("نشانی سرویس پیامک در صفحه تنظیمات وارد نشده است.")
+            return
+            
+        self.signals.queued.connect(self.on_queued)
+        get_event_bus().subscribe(NOTIFY_STATS, self.on_notify_stats)
+        self.show_stats(self.dispatcher.stats(SMS))
+        
+    def queue_messages(self, make_text, key=None):
+        """ساخت پیام‌ها روی رشته رابط (فروشگاه متقاضیان فقط از این رشته خوانده می‌شود)
+        و ثبت آن‌ها در صف ماندگار در پس‌زمینه"""
+        self.queue_status.setText("در حال آماده‌سازی پیام‌ها...")
+        messages = list(applicant_messages(self.store, self.loan_type, make_text, key))
+        
+        def run():
+            self.signals.queued.emit(len(self.dispatcher.notify_many(messages)))
+            
+        threading.Thread(target=run, name='notify-queue', daemon=True).start()
+        
+    def on_send_message(self):
+        text = self.message_edit.text().strip()
+        if text:
+            self.queue_messages(lambda applicant: text)
+            self.message_edit.clear()
+            
+    def on_send_results(self):
+        loan_type = self.loan_type
+        bot = self.bot
+        self.queue_messages(
+            lambda applicant: f"{applicant['first_name']} عزیز، وضعیت ثبت‌نام وام {loan_type}: "
+                              f"{applicant['status'] or 'در انتظار'}",
+            # هر وضعیت برای هر متقاضی یک بار فرستاده می‌شود
+            lambda row, applicant: f"{bot}:result:{row}:{applicant['status']}")
+            
+    def on_queued(self, count):
+        self.queue_status.setText(f"{count:,} پیام در صف ارسال قرار گرفت")
+        
+    def on_notify_stats(self, batch):
+        # فقط آخرین آمار هر سرویس مهم است
+        self.show_stats(batch[-1])
+        
+    def show_stats(self, stats):
+        self.stats_label.setText("   ".join(f"{title}: {stats[key]:,}" for key, title in self.STAT_FIELDS))
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from PyQt5.QtWidgets import (QFormLayout, QHBoxLayout, QSpinBox, QDoubleSpinBox, QLineEdit,
+                             QPushButton, QLabel)
+from PyQt5.QtCore import Qt
+from .base_page import BasePage
+from core.events import SETTINGS_CHANGED, get_event_bus
+from core.settings import SCHEMA, get_settings
+
+BANK_LIMIT_PREFIX = 'bots.bank_limit.'
+
+class SettingsPage(BasePage):
+    """صفحه تنظیمات سیستم"""
+    
+    MAX_INT = 1000000
+    
+    def __init__(self, page_id, title, parent=None):
+        self.settings = get_settings()
+        self.editors = {}
+        super().__init__(page_id, title, parent)
+        
+    def create_content(self):
+        """ایجاد فرم تنظیمات از روی فهرست تنظیمات شناخته‌شده"""
+        # برچسب‌ها در سمت راست فرم
+        self.content_frame.setLayoutDirection(Qt.RightToLeft)
+        self.form = self.create_form()
+        for setting in SCHEMA:
+            if setting.key.endswith('.*'):
+                continue
+            editor = self.create_editor(setting.key, setting.type)
+            if setting.key in self.settings.overridden:
+                # مقدار متغیر محیطی در این اجرا اولویت دارد
+                editor.setEnabled(False)
+                editor.setToolTip(f"با متغیر محیطی {setting.env} تعیین شده است")
+            self.form.addRow(self.create_label(setting.label), editor)
+        self.content_layout.addLayout(self.form)
+        
+        # سقف جداگانه برای هر بانک
+        section_label = QLabel("سقف جلسه برای بانک‌ها")
+        section_label.setObjectName("diagnosticsSection")
+        self.content_layout.addWidget(section_label)
+        self.bank_form = self.create_form()
+        for key in sorted(self.settings.items(BANK_LIMIT_PREFIX)):
+            self.add_bank_row(key)
+        self.content_layout.addLayout(self.bank_form)
+        
+        add_layout = QHBoxLayout()
+        self.bank_name_edit = QLineEdit()
+        self.bank_name_edit.setObjectName("settingsEditor")
+        self.bank_name_edit.setPlaceholderText("نام بانک")
+        add_button = QPushButton("افزودن بانک")
+        add_button.setObjectName("importButton")
+        add_button.clicked.connect(self.on_add_bank)
+        reset_button = QPushButton("بازگرداندن پیش‌فرض‌ها")
+        reset_button.setObjectName("importButton")
+        reset_button.clicked.connect(self.on_reset)
+        add_layout.addWidget(self.bank_name_edit)
+        add_layout.addWidget(add_button)
+        add_layout.addStretch()
+        add_layout.addWidget(reset_button)
+        self.content_layout.addLayout(add_layout)
+        self.content_layout.addStretch()
+        
+        get_event_bus().subscribe(SETTINGS_CHANGED, self.on_settings_changed)
+        
+    def create_form(self):
+        form = QFormLayout()
+        form.setLabelAlignment(Qt.AlignLeading | Qt.AlignVCenter)
+        form.setFieldGrowthPolicy(QFormLayout.FieldsStayAtSizeHint)
+        return form
+        
+    def create_label(self, text):
+        label = QLabel(text)
+        label.setObjectName("settingsLabel")
+        return label
+        
+    def create_editor(self, key, value_type):
+        """ویرایشگر متناسب با نوع تنظیم؛ هر مقدار پس از پایان ویرایش در حافظه ثبت می‌شود"""
+        if value_type is int:
+            editor = QSpinBox()
+            editor.setRange(0, self.MAX_INT)
+            # مقدار پس از پایان تایپ ثبت می‌شود، نه با هر رقم
+            editor.setKeyboardTracking(False)
+            editor.valueChanged.connect(lambda value: self.settings.set(key, value))
+        elif value_type is float:
+            editor = QDoubleSpinBox()
+            editor.setRange(0, self.MAX_INT)
+            editor.setDecimals(1)
+            editor.setKeyboardTracking(False)
+            editor.valueChanged.connect(lambda value: self.settings.set(key, value))
+        else:
+            editor = QLineEdit()
+            editor.editingFinished.connect(lambda: self.settings.set(key, editor.text()))
+        editor.setObjectName("settingsEditor")
+        self.editors[key] = editor
+        self.show_value(key, self.settings.get(key))
+        return editor
+        
+    def show_value(self, key, value):
+        editor = self.editors[key]
+        editor.blockSignals(True)
+        if isinstance(editor, QLineEdit):
+            if editor.text() != (value or ''):
+                editor.setText(value or '')
+        elif value is not None:
+            editor.setValue(value)
+        editor.blockSignals(False)
+        
+    def add_bank_row(self, key):
+        editor = self.create_editor(key, int)
+        self.bank_form.addRow(self.create_label(key[len(BANK_LIMIT_PREFIX):]), editor)
+        
+    def remove_bank_row(self, key):
+        editor = self.editors.pop(key)
+        self.bank_form.removeRow(editor)
+        
+    def on_add_bank(self):
+        bank = self.bank_name_edit.text().strip()
+        if bank:
+            key = BANK_LIMIT_PREFIX + bank
+            if self.settings.get(key) is None:
+                self.settings.set(key, self.settings['bots.bank_limit'])
+            self.bank_name_edit.clear()
+            
+    def on_reset(self):
+        """بازگرداندن پیش‌فرض‌ها؛ کلیدهایی که متغیر محیطی تعیین کرده دست نمی‌خورند"""
+        keys = [key for key in self.settings.items() if key not in self.settings.overridden]
+        if keys:
+            self.settings.reset(*keys)
+            
+    def on_settings_changed(self, batch):
+        # فقط کلیدهایی که واقعاً تغییر کرده‌اند می‌رسند
+        for key, value in batch:
+            if key.startswith(BANK_LIMIT_PREFIX):
+                if value is None:
+                    if key in self.editors:
+                        self.remove_bank_row(key)
+                    continue
+                if key not in self.editors:
+                    self.add_bank_row(key)
+            if key in self.editors:
+                self.show_value(key, value)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import time
+
+from PyQt5.QtWidgets import (QHBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView,
+                             QPlainTextEdit, QPushButton, QLabel)
+from PyQt5.QtCore import Qt
+from .base_page import BasePage
+from core.watchdog import read_stalls, report_path, summarize_stalls
+
+class StallsPage(BasePage):
+    """صفحه توقف‌های رابط کاربری، دسته‌بندی شده بر اساس پشته فراخوانی"""
+    
+    COLUMNS = ("تعداد", "مجموع (ms)", "بیشینه (ms)", "صفحه", "محل توقف", "آخرین بار")
+    
+    def __init__(self, page_id, title, parent=None):
+        self.path = report_path()
+        self.groups = []
+        super().__init__(page_id, title, parent)
+    
+    def create_content(self):
+        """ایجاد جدول توقف‌ها و نمایش پشته"""
+        header_layout = QHBoxLayout()
+        section_label = QLabel("توقف‌های رابط")
+        section_label.setObjectName("diagnosticsSection")
+        self.status_label = QLabel()
+        self.status_label.setObjectName("importStatus")
+        refresh_button = QPushButton("بروزرسانی")
+        refresh_button.setObjectName("importButton")
+        refresh_button.clicked.connect(self.refresh_page)
+        header_layout.addWidget(section_label)
+        header_layout.addWidget(self.status_label)
+        header_layout.addStretch()
+        header_layout.addWidget(refresh_button)
+        self.content_layout.addLayout(header_layout)
+        
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setObjectName("diagnosticsTable")
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.currentCellChanged.connect(self.on_row_changed)
+        self.content_layout.addWidget(self.table, 1)
+        
+        stack_label = QLabel("پشته فراخوانی طولانی‌ترین توقف")
+        stack_label.setObjectName("diagnosticsSection")
+        self.content_layout.addWidget(stack_label)
+        self.stack_view = QPlainTextEdit()
+        self.stack_view.setObjectName("stallStack")
+        self.stack_view.setReadOnly(True)
+        self.stack_view.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.stack_view.setLayoutDirection(Qt.LeftToRight)
+        self.content_layout.addWidget(self.stack_view, 1)
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh_page()
+    
+    def refresh_page(self):
+        """خواندن دوباره گزارش توقف‌ها از دیسک"""
+        records = read_stalls(self.path)
+        self.groups = summarize_stalls(records)
+        self.status_label.setText(f"{len(records):,} توقف در {len(self.groups):,} دسته")
+        
+        self.table.setRowCount(len(self.groups))
+        for row, group in enumerate(self.groups):
+            filename, lineno, function, _ = group['stack'][-1]
+            route, _ = group['routes'].most_common(1)[0]
+            values = (
+                f"{group['count']:,}",
+                f"{group['total_ms']:,.0f}",
+                f"{group['max_ms']:,.0f}",
+                route or "-",
+                f"{function} ({os.path.basename(filename)}:{lineno})",
+                time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(group['last'])),
+            )
+            for column, text in enumerate(values):
+                item = self.table.item(row, column)
+                if item is None:
+                    item = QTableWidgetItem()
+                    item.setTextAlignment(Qt.AlignCenter)
+                    self.table.setItem(row, column, item)
+                item.setText(text)
+        
+        if self.groups:
+            self.table.setCurrentCell(max(0, self.table.currentRow()), 0)
+            self.show_stack(self.table.currentRow())
+        else:
+            self.stack_view.setPlainText("توقفی ثبت نشده است.")
+    
+    def on_row_changed(self, row, column, previous_row, previous_column):
+        if row != previous_row:
+            self.show_stack(row)
+    
+    def show_stack(self, row):
+        if not 0 <= row < len(self.groups):
+            return
+        # درونی‌ترین فراخوانی در پایین، مانند traceback پایتون
+        lines = []
+        for filename, lineno, function, code in self.groups[row]['stack']:
+            lines.append(f'File "{filename}", line {lineno}, in {function}')
+            if code:
+                lines.append(f"    {code}")
+        self.stack_view.setPlainText("\n".join(lines))
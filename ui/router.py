@@ -0,0 +1,60 @@
+from collections import deque
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from ui.page_registry import PageRegistry
+from ui.routes import ROUTES, DEFAULT_ROUTE
+
+
+class Router(QObject):
+    """Resolves route ids to pages and pre-builds likely next pages when idle."""
+
+    route_changed = pyqtSignal(str)
+
+    def __init__(self, stacked_widget, routes=ROUTES, max_pages=None, max_widgets=None, parent=None):
+        super().__init__(parent)
+        self.routes = routes
+        self.stacked_widget = stacked_widget
+        self.current_route = None
+
+        self.pages = PageRegistry(
+            stacked_widget,
+            max_pages=max_pages,
+            max_widgets=max_widgets,
+            pinned=(DEFAULT_ROUTE,)
+        )
+        for route in routes.values():
+            self.pages.register(route.route_id, route.factory)
+
+        # A zero-timeout timer fires once the event queue is empty, so
+        # prefetching only ever uses time the UI would otherwise sit idle
+        self.prefetch_queue = deque()
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.setInterval(0)
+        self.prefetch_timer.timeout.connect(self.prefetch_next)
+
+    def resolve(self, route_id):
+        return self.routes.get(route_id) or self.routes[DEFAULT_ROUTE]
+
+    def navigate(self, route_id):
+        route = self.resolve(route_id)
+        self.stacked_widget.setCurrentWidget(self.pages.get(route.route_id))
+        self.current_route = route.route_id
+
+        self.prefetch_queue.clear()
+        self.prefetch_queue.extend(route.prefetch)
+        if self.prefetch_queue:
+            self.prefetch_timer.start()
+
+        self.route_changed.emit(route.route_id)
+        return route
+
+    def prefetch_next(self):
+        # Build one page per idle slot so input events can run in between
+        while self.prefetch_queue:
+            route_id = self.prefetch_queue.popleft()
+            if self.pages.prefetch(route_id):
+                break
+        if self.prefetch_queue:
+            self.prefetch_timer.start()
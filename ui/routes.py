@@ -0,0 +1,184 @@
+from collections import namedtuple
+from types import MappingProxyType
+
+from ui.lazy import LazyFactory
+
+# A route ties together everything that used to be rebuilt on every
+# change_page call: how to build the page, what the top menu shows and
+# where the entry sits in the sidebar. `prefetch` lists the routes worth
+# building in idle time once this one is shown.
+Route = namedtuple('Route', 'route_id factory title icon items sidebar prefetch')
+
+# `group` puts the entry in a collapsible sidebar submenu (see SIDEBAR_GROUPS)
+SidebarEntry = namedtuple('SidebarEntry', 'text icon group')
+
+SIDEBAR_GROUPS = MappingProxyType({
+    'robots': ("ربات ها", "🤖"),
+})
+
+
+def menu_item(icon, text, active=False, route=None):
+    # `route` is where clicking the top menu item navigates to
+    return MappingProxyType({'icon': icon, 'text': text, 'active': active, 'route': route})
+
+
+def loan_bot_items(bot, active):
+    return (
+        menu_item('fas fa-cog', 'تنظیمات وام', active == bot, bot),
+        menu_item('fas fa-graduation-cap', 'آموزش استفاده', False, f'education-{bot}'),
+        menu_item('fas fa-users', 'متقاضیان', active == f'{bot}-applicants', f'{bot}-applicants'),
+        menu_item('fas fa-bell', 'اطلاع‌رسانی', active == f'{bot}-notifications', f'{bot}-notifications'),
+    )
+
+
+def education_items(active):
+    return (
+        menu_item('fas fa-heart', 'آموزش وام ازدواج', active == 'marriage-loan', 'education-marriage-loan'),
+        menu_item('fas fa-baby', 'آموزش وام فرزند', active == 'child-loan', 'education-child-loan'),
+        menu_item('fas fa-cog', 'آموزش تنظیمات', active == 'settings', 'education-settings'),
+    )
+
+
+def diagnostics_items(active):
+    return (
+        menu_item('fas fa-network-wired', 'اتصال‌ها', active == 'diagnostics', 'diagnostics'),
+        menu_item('fas fa-hourglass-half', 'توقف‌های رابط', active == 'stalls', 'stalls'),
+    )
+
+
+def _education_page(route_id, title, tutorial):
+    # Tutorials are files under ui/content/tutorials; see ui.documents
+    return LazyFactory('ui.pages.education_page', 'EducationPage', route_id, title, tutorial)
+
+
+def _content_page(route_id, title, text):
+    return LazyFactory('ui.pages.base_page', 'SimpleContentPage', route_id, title, text)
+
+
+_ROUTES = (
+    Route(
+        'home', LazyFactory('ui.pages.home_page', 'HomePage'),
+        'صفحه اصلی', 'fas fa-home', (),
+        SidebarEntry("صفحه اصلی", "🏠", None),
+        ('marriage-loan', 'child-loan'),
+    ),
+    Route(
+        'settings',
+        LazyFactory('ui.pages.settings_page', 'SettingsPage', 'settings', "تنظیمات سیستم"),
+        'تنظیمات سیستم', 'fas fa-cog', (),
+        SidebarEntry("تنظیمات", "⚙️", None),
+        (),
+    ),
+    Route(
+        'marriage-loan',
+        _content_page('marriage-loan', "ربات وام ازدواج", "این بخش مربوط به مدیریت وام ازدواج می‌باشد."),
+        'ربات وام ازدواج', 'fas fa-heart', loan_bot_items('marriage-loan', 'marriage-loan'),
+        SidebarEntry("ربات وام ازدواج", "❤️", 'robots'),
+        ('child-loan',),
+    ),
+    Route(
+        'child-loan',
+        _content_page('child-loan', "ربات وام فرزند", "این بخش مربوط به مدیریت وام فرزند می‌باشد."),
+        'ربات وام فرزند', 'fas fa-baby', loan_bot_items('child-loan', 'child-loan'),
+        SidebarEntry("ربات وام فرزند", "👶", 'robots'),
+        ('marriage-loan',),
+    ),
+    Route(
+        'marriage-loan-applicants',
+        LazyFactory('ui.pages.applicants_page', 'ApplicantsPage',
+                    'marriage-loan-applicants', "متقاضیان وام ازدواج", 'ازدواج'),
+        'ربات وام ازدواج', 'fas fa-heart', loan_bot_items('marriage-loan', 'marriage-loan-applicants'),
+        None,
+        (),
+    ),
+    Route(
+        'child-loan-applicants',
+        LazyFactory('ui.pages.applicants_page', 'ApplicantsPage',
+                    'child-loan-applicants', "متقاضیان وام فرزند", 'فرزند'),
+        'ربات وام فرزند', 'fas fa-baby', loan_bot_items('child-loan', 'child-loan-applicants'),
+        None,
+        (),
+    ),
+    Route(
+        'marriage-loan-notifications',
+        LazyFactory('ui.pages.notifications_page', 'NotificationsPage',
+                    'marriage-loan-notifications', "اطلاع‌رسانی وام ازدواج", 'marriage-loan', 'ازدواج'),
+        'ربات وام ازدواج', 'fas fa-heart', loan_bot_items('marriage-loan', 'marriage-loan-notifications'),
+        None,
+        (),
+    ),
+    Route(
+        'child-loan-notifications',
+        LazyFactory('ui.pages.notifications_page', 'NotificationsPage',
+                    'child-loan-notifications', "اطلاع‌رسانی وام فرزند", 'child-loan', 'فرزند'),
+        'ربات وام فرزند', 'fas fa-baby', loan_bot_items('child-loan', 'child-loan-notifications'),
+        None,
+        (),
+    ),
+    Route(
+        'news',
+        LazyFactory('ui.pages.news_page', 'NewsPage', 'news', "اخبار و اطلاعیه‌ها"),
+        'اخبار و اطلاعیه‌ها', 'fas fa-newspaper', (),
+        SidebarEntry("اخبار", "📰", None),
+        (),
+    ),
+    Route(
+        'education',
+        _education_page('education', "آموزش‌های سیستم", 'education'),
+        'آموزش‌های سیستم', 'fas fa-graduation-cap', education_items(None),
+        SidebarEntry("آموزش ها", "🎓", None),
+        (),
+    ),
+    Route(
+        'education-marriage-loan',
+        _education_page('education-marriage-loan', "آموزش ربات وام ازدواج", 'marriage-loan'),
+        'آموزش‌های سیستم', 'fas fa-graduation-cap', education_items('marriage-loan'),
+        None,
+        (),
+    ),
+    Route(
+        'education-child-loan',
+        _education_page('education-child-loan', "آموزش ربات وام فرزند", 'child-loan'),
+        'آموزش‌های سیستم', 'fas fa-graduation-cap', education_items('child-loan'),
+        None,
+        (),
+    ),
+    Route(
+        'education-settings',
+        _education_page('education-settings', "آموزش تنظیمات", 'settings'),
+        'آموزش‌های سیستم', 'fas fa-graduation-cap', education_items('settings'),
+        None,
+        (),
+    ),
+    Route(
+        'logs',
+        LazyFactory('ui.pages.log_page', 'LogConsolePage', 'logs', "گزارش زنده"),
+        'گزارش زنده', 'fas fa-terminal', (),
+        SidebarEntry("گزارش‌ها", "📜", None),
+        (),
+    ),
+    Route(
+        'diagnostics',
+        LazyFactory('ui.pages.diagnostics_page', 'DiagnosticsPage', 'diagnostics', "عیب‌یابی"),
+        'عیب‌یابی', 'fas fa-stethoscope', diagnostics_items('diagnostics'),
+        SidebarEntry("عیب‌یابی", "🩺", None),
+        (),
+    ),
+    Route(
+        'stalls',
+        LazyFactory('ui.pages.stalls_page', 'StallsPage', 'stalls', "توقف‌های رابط"),
+        'عیب‌یابی', 'fas fa-stethoscope', diagnostics_items('stalls'),
+        None,
+        (),
+    ),
+    Route(
+        'contact',
+        _content_page('contact', "ارتباط با ما", "راه‌های ارتباطی با پشتیبانی سیستم در این بخش قرار دارد."),
+        'ارتباط با ما', 'fas fa-envelope', (),
+        SidebarEntry("ارتباط با ما", "✉️", None),
+        (),
+    ),
+)
+
+ROUTES = MappingProxyType({route.route_id: route for route in _ROUTES})
+DEFAULT_ROUTE = 'home'
@@ -1,12 +0,0 @@
-# colors.py
-colors = {
-    "primary": "#1E88E5",
-    "primary_dark": "#0D47A1",
-    "primary_light": "#64B5F6",
-    "sidebar_bg": "#1A1A1A",
-    "sidebar_hover": "#2A2A2A",
-    "background_dark": "#2B2B2B",
-    "text_light": "#FFFFFF",
-    "text_muted": "#CCCCCC",
-    "border": "#333333",
-}
\ No newline at end of file
@@ -0,0 +1,43 @@
+# Color tokens for the dark theme. Every stylesheet is compiled from THEME,
+# so a palette change only needs to touch this dictionary.
+THEME = {
+    'window_bg': '#0F0F1A',
+    'dark_bg': '#1E1E2D',
+    'dark_secondary': '#2A2A3D',
+    'dark_border': '#3D3D50',
+    'dark_hover': '#3A3A4D',
+    'dark_active': '#1d4ed8',
+    'dark_text': '#E0E0E0',
+    'light_text': '#FFFFFF',
+    'muted_text': '#A0A0B0',
+    'primary': '#2563eb',
+    'primary_light': '#3b82f6',
+    'primary_dark': '#1d4ed8',
+    'primary_tint': 'rgba(59, 130, 246, 0.1)',
+    'submenu_bg': 'rgba(42, 42, 61, 0.7)',
+}
+
+DARK_BG = THEME['dark_bg']
+DARK_SECONDARY = THEME['dark_secondary']
+DARK_BORDER = THEME['dark_border']
+DARK_HOVER = THEME['dark_hover']
+DARK_ACTIVE = THEME['dark_active']
+DARK_TEXT = THEME['dark_text']
+PRIMARY_COLOR = THEME['primary']
+PRIMARY_LIGHT = THEME['primary_light']
+PRIMARY_DARK = THEME['primary_dark']
+
+
+class AppColors:
+    WINDOW_BG = THEME['window_bg']
+    DARK_BG = THEME['dark_bg']
+    DARK_SECONDARY = THEME['dark_secondary']
+    DARK_BORDER = THEME['dark_border']
+    DARK_HOVER = THEME['dark_hover']
+    DARK_ACTIVE = THEME['dark_active']
+    DARK_TEXT = THEME['dark_text']
+    LIGHT_TEXT = THEME['light_text']
+    MUTED_TEXT = THEME['muted_text']
+    PRIMARY = THEME['primary']
+    PRIMARY_LIGHT = THEME['primary_light']
+    PRIMARY_DARK = THEME['primary_dark']
@@ -0,0 +1,75 @@
+import os
+import zlib
+
+from core.paths import cache_dir
+from .colors import THEME
+from .stylesheet import APP_STYLESHEET
+
+
+class StyleCompiler:
+    """Compiles the application stylesheet from color tokens.
+
+    The result is keyed by a hash of the template and the theme, kept in memory
+    and written to the cache directory so later launches skip the substitution.
+    """
+
+    def __init__(self, theme=None, template=APP_STYLESHEET, cache_path=None):
+        self.theme = dict(THEME if theme is None else theme)
+        self.template = template
+        self.cache_path = cache_path
+        self._compiled = None
+
+    def theme_hash(self):
+        # zlib is already loaded at startup, unlike hashlib and json
+        payload = (repr(sorted(self.theme.items())) + self.template).encode('utf-8')
+        return f"{zlib.crc32(payload):08x}{zlib.adler32(payload):08x}"
+
+    def cache_file(self):
+        directory = self.cache_path or cache_dir('styles')
+        return os.path.join(directory, f"app-{self.theme_hash()}.qss")
+
+    def compile(self):
+        if self._compiled is not None:
+            return self._compiled
+
+        try:
+            # Resolving the path creates the cache directory, which can fail too
+            path = self.cache_file()
+            with open(path, encoding='utf-8') as f:
+                self._compiled = f.read()
+            return self._compiled
+        except OSError:
+            pass
+
+        # string pulls in re, so only pay for it on a cache miss
+        from string import Template
+        
+        # Template.substitute raises KeyError on a missing token, which is
+        # what we want: a typo in the theme should fail loudly
+        self._compiled = Template(self.template).substitute(self.theme)
+        try:
+            path = self.cache_file()
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(self._compiled)
+            os.replace(tmp_path, path)
+        except OSError:
+            # A read-only cache only costs us the compile on the next launch
+            pass
+        return self._compiled
+
+
+_default_compiler = None
+
+
+def app_stylesheet():
+    global _default_compiler
+    if _default_compiler is None:
+        _default_compiler = StyleCompiler()
+    return _default_compiler.compile()
+
+
+def apply_app_stylesheet(app):
+    stylesheet = app_stylesheet()
+    if app.styleSheet() != stylesheet:
+        app.setStyleSheet(stylesheet)
@@ -0,0 +1,385 @@
+# Application stylesheet template. Widgets are matched by objectName and
+# dynamic properties so a single sheet can be installed on the QApplication
+# instead of every widget parsing its own. Tokens are $names from THEME.
+APP_STYLESHEET = """
+QMainWindow#mainWindow {
+    background-color: $window_bg;
+}
+
+/* Page stack */
+QStackedWidget#pageStack {
+    background-color: $dark_secondary;
+    border-radius: 10px;
+    border: 1px solid $dark_border;
+    margin: 20px;
+}
+QFrame#pageContent {
+    background-color: transparent;
+    border: none;
+}
+QLabel#pageTitle {
+    color: $primary_light;
+    font-size: 20px;
+    font-weight: bold;
+    padding-bottom: 10px;
+    border-bottom: 1px solid $dark_border;
+}
+QLabel#pageText {
+    color: $dark_text;
+    font-size: 16px;
+    padding: 20px;
+}
+
+/* Sidebar */
+QWidget#sidebar {
+    background-color: $dark_bg;
+    border-left: 1px solid $dark_border;
+}
+QWidget#sidebarHeader {
+    background-color: $dark_bg;
+    border-bottom: 1px solid $dark_border;
+}
+QLabel#sidebarLogo {
+    color: white;
+    font-weight: bold;
+    font-size: 16px;
+}
+QLabel#sidebarProfile {
+    background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 1, stop: 0 $primary, stop: 1 $primary_light);
+    color: white;
+    font-weight: bold;
+    border-radius: 18px;
+    qproperty-alignment: AlignCenter;
+}
+QScrollArea#sidebarScroll {
+    border: none;
+    background-color: $dark_bg;
+}
+QWidget#sidebarMenu {
+    background-color: $dark_bg;
+}
+QScrollArea#sidebarScroll QScrollBar:vertical {
+    border: none;
+    background: $dark_bg;
+    width: 5px;
+    margin: 0px;
+}
+QScrollArea#sidebarScroll QScrollBar::handle:vertical {
+    background: $primary;
+    border-radius: 2px;
+}
+QScrollArea#sidebarScroll QScrollBar::add-line:vertical,
+QScrollArea#sidebarScroll QScrollBar::sub-line:vertical {
+    height: 0px;
+}
+QFrame#sidebarSubmenu {
+    background-color: $submenu_bg;
+    border-radius: 6px;
+    margin: 5px 0px;
+}
+QPushButton#sidebarToggle {
+    background-color: $dark_bg;
+    border: 1px solid $dark_border;
+    border-radius: 14px;
+    color: $dark_text;
+}
+QPushButton#sidebarToggle:hover {
+    background-color: $dark_hover;
+}
+
+/* Top menu */
+QWidget#topMenu {
+    background-color: $dark_secondary;
+    border-bottom: 1px solid $dark_border;
+}
+QLabel#topMenuTitle {
+    color: $dark_text;
+    font-size: 18px;
+    font-weight: bold;
+}
+QPushButton#topMenuItem {
+    background-color: $submenu_bg;
+    color: $dark_text;
+    border: 1px solid $dark_border;
+    border-radius: 6px;
+    padding: 8px 15px;
+    font-size: 14px;
+}
+QPushButton#topMenuItem:hover {
+    background-color: $dark_hover;
+}
+QPushButton#topMenuItem:pressed,
+QPushButton#topMenuItem[active="true"] {
+    background-color: $dark_active;
+    color: white;
+    border-color: $primary;
+}
+QLabel#topMenuStatus {
+    color: $muted_text;
+    padding: 0 12px;
+}
+
+/* Home page */
+QLabel#homeWelcome {
+    color: $dark_text;
+    font-size: 16px;
+    padding: 20px;
+    background-color: $primary_tint;
+    border-radius: 8px;
+    border: 1px solid $primary;
+}
+QFrame#infoCard {
+    background-color: $dark_bg;
+    border: 1px solid $dark_border;
+    border-radius: 12px;
+    padding: 20px;
+}
+QFrame#infoCard:hover {
+    border-color: $primary;
+    background-color: $dark_hover;
+}
+QLabel#infoCardIcon {
+    margin-bottom: 10px;
+    border: none;
+    background: transparent;
+}
+QLabel#infoCardTitle {
+    color: $light_text;
+    font-size: 18px;
+    font-weight: bold;
+    margin-bottom: 10px;
+    border: none;
+    background: transparent;
+}
+QLabel#infoCardDesc {
+    color: $muted_text;
+    font-size: 14px;
+    border: none;
+    background: transparent;
+}
+QLabel#infoCardStats {
+    color: $dark_text;
+    font-size: 12px;
+    padding-top: 8px;
+    border: none;
+    border-top: 1px solid $dark_border;
+    background: transparent;
+}
+
+/* Applicants */
+QTableView#applicantsTable {
+    background-color: $dark_bg;
+    alternate-background-color: $dark_secondary;
+    color: $dark_text;
+    gridline-color: $dark_border;
+    border: 1px solid $dark_border;
+    border-radius: 8px;
+    selection-background-color: $primary_dark;
+}
+QTableView#applicantsTable QHeaderView::section {
+    background-color: $dark_secondary;
+    color: $dark_text;
+    border: none;
+    border-bottom: 1px solid $dark_border;
+    padding: 6px;
+}
+QLineEdit#applicantsSearch {
+    background-color: $dark_bg;
+    color: $dark_text;
+    border: 1px solid $dark_border;
+    border-radius: 6px;
+    padding: 6px 10px;
+    min-width: 260px;
+}
+QLineEdit#applicantsSearch:focus {
+    border-color: $primary;
+}
+QComboBox#applicantsFilter {
+    background-color: $dark_bg;
+    color: $dark_text;
+    border: 1px solid $dark_border;
+    border-radius: 6px;
+    padding: 6px 10px;
+    min-width: 160px;
+}
+QPushButton#importButton {
+    background-color: $primary;
+    color: white;
+    border: none;
+    border-radius: 6px;
+    padding: 6px 14px;
+}
+QPushButton#importButton:hover {
+    background-color: $primary_light;
+}
+QLabel#importStatus {
+    color: $muted_text;
+}
+QProgressBar#importProgress {
+    background-color: $dark_bg;
+    border: 1px solid $dark_border;
+    border-radius: 4px;
+    height: 8px;
+}
+QProgressBar#importProgress::chunk {
+    background-color: $primary;
+    border-radius: 4px;
+}
+
+/* Diagnostics */
+QLabel#diagnosticsSection {
+    color: $dark_text;
+    font-size: 15px;
+    font-weight: bold;
+}
+QTableWidget#diagnosticsTable {
+    background-color: $dark_bg;
+    color: $dark_text;
+    gridline-color: $dark_border;
+    border: 1px solid $dark_border;
+    border-radius: 8px;
+}
+QTableWidget#diagnosticsTable QHeaderView::section {
+    background-color: $dark_secondary;
+    color: $dark_text;
+    border: none;
+    border-bottom: 1px solid $dark_border;
+    padding: 6px;
+}
+
+/* Log console */
+QListView#logList {
+    background-color: $dark_bg;
+    color: $dark_text;
+    border: 1px solid $dark_border;
+    border-radius: 8px;
+    font-family: monospace;
+    font-size: 12px;
+}
+QListView#logList::item:selected {
+    background-color: $dark_active;
+}
+QPlainTextEdit#stallStack {
+    background-color: $dark_bg;
+    color: $dark_text;
+    border: 1px solid $dark_border;
+    border-radius: 8px;
+    font-family: monospace;
+    font-size: 12px;
+}
+
+/* News */
+QLabel#newsStatus {
+    color: $muted_text;
+}
+QScrollArea#newsScroll {
+    background: transparent;
+    border: none;
+}
+QScrollArea#newsScroll > QWidget#qt_scrollarea_viewport {
+    background: transparent;
+}
+QWidget#newsItems {
+    background: transparent;
+}
+QFrame#newsCard {
+    background-color: $dark_bg;
+    border: 1px solid $dark_border;
+    border-radius: 12px;
+    padding: 14px;
+}
+QLabel#newsTitle {
+    color: $light_text;
+    font-size: 16px;
+    font-weight: bold;
+    border: none;
+    background: transparent;
+}
+QLabel#newsDate {
+    color: $muted_text;
+    font-size: 12px;
+    border: none;
+    background: transparent;
+}
+QLabel#newsBody {
+    color: $dark_text;
+    font-size: 14px;
+    border: none;
+    background: transparent;
+}
+
+/* Education */
+QScrollArea#educationScroll {
+    background: transparent;
+    border: none;
+}
+QScrollArea#educationScroll > QWidget#qt_scrollarea_viewport {
+    background: transparent;
+}
+QScrollArea#educationScroll QScrollBar:vertical {
+    border: none;
+    background: $dark_secondary;
+    width: 8px;
+}
+QScrollArea#educationScroll QScrollBar::handle:vertical {
+    background: $dark_border;
+    border-radius: 4px;
+    min-height: 30px;
+}
+QScrollArea#educationScroll QScrollBar::add-line:vertical,
+QScrollArea#educationScroll QScrollBar::sub-line:vertical {
+    height: 0px;
+}
+QPushButton#pagerButton {
+    background-color: $submenu_bg;
+    color: $dark_text;
+    border: 1px solid $dark_border;
+    border-radius: 6px;
+    padding: 6px 14px;
+}
+QPushButton#pagerButton:hover {
+    background-color: $dark_hover;
+}
+QPushButton#pagerButton:disabled {
+    color: $muted_text;
+}
+QLabel#pagerLabel {
+    color: $muted_text;
+}
+
+/* Settings */
+QLabel#settingsLabel {
+    color: $dark_text;
+    font-size: 14px;
+}
+QSpinBox#settingsEditor,
+QDoubleSpinBox#settingsEditor,
+QLineEdit#settingsEditor {
+    background-color: $dark_bg;
+    color: $dark_text;
+    border: 1px solid $dark_border;
+    border-radius: 6px;
+    padding: 5px 8px;
+    min-width: 200px;
+}
+QSpinBox#settingsEditor:focus,
+QDoubleSpinBox#settingsEditor:focus,
+QLineEdit#settingsEditor:focus {
+    border-color: $primary;
+}
+QSpinBox#settingsEditor:disabled,
+QDoubleSpinBox#settingsEditor:disabled,
+QLineEdit#settingsEditor:disabled {
+    color: $muted_text;
+}
+/* Performance overlay */
+QLabel#perfOverlay {
+    background-color: rgba(0, 0, 0, 190);
+    color: $dark_text;
+    border: 1px solid $dark_border;
+    border-radius: 6px;
+    padding: 8px 10px;
+    font-family: "DejaVu Sans Mono", "Consolas", monospace;
+    font-size: 12px;
+}
+"""
@@ -0,0 +1,208 @@
+import csv
+import logging
+import threading
+
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+from core.applicants.importer import read_applicant_batches, ImportCancelled
+
+log = logging.getLogger('yara.import')
+
+
+class ImportWorker(QObject):
+    """Reads an applicant file on a worker thread and emits column batches.
+    
+    At most MAX_IN_FLIGHT batches are queued towards the GUI thread; the
+    worker blocks until the receiver acknowledges one, which keeps memory
+    bounded when parsing outruns the store.
+    """
+    
+    MAX_IN_FLIGHT = 2
+    
+    batch_ready = pyqtSignal(object)
+    progress = pyqtSignal(int, int, int, int)    # rows, failed rows, bytes read, total bytes
+    finished = pyqtSignal(int, int)              # rows, failed rows
+    cancelled = pyqtSignal(int, int)
+    failed = pyqtSignal(str)
+    
+    def __init__(self, path, defaults=None, batch_size=5000):
+        super().__init__()
+        self.path = path
+        self.defaults = defaults
+        self.batch_size = batch_size
+        self.cancel_event = threading.Event()
+        self.in_flight = threading.Semaphore(self.MAX_IN_FLIGHT)
+        self.rows = 0
+        self.failed_rows = 0
+        
+    def run(self):
+        try:
+            for batch, rows, failed_rows, bytes_read, total_bytes in read_applicant_batches(
+                    self.path, self.batch_size, self.defaults, cancel_event=self.cancel_event):
+                while not self.in_flight.acquire(timeout=0.1):
+                    if self.cancel_event.is_set():
+                        raise ImportCancelled()
+                self.rows = rows
+                self.failed_rows = failed_rows
+                self.batch_ready.emit(batch)
+                self.progress.emit(rows, failed_rows, bytes_read, total_bytes)
+        except ImportCancelled:
+            self.cancelled.emit(self.rows, self.failed_rows)
+        except (OSError, ValueError, UnicodeDecodeError, csv.Error) as e:
+            self.failed.emit(str(e))
+        else:
+            self.finished.emit(self.rows, self.failed_rows)
+            
+    def acknowledge(self):
+        self.in_flight.release()
+        
+    def cancel(self):
+        self.cancel_event.set()
+
+
+class SortIndexWarmer(QObject):
+    """Builds a store's sort orders on a worker thread, one column at a time.
+    
+    Each column is copied on the GUI thread and its order installed back
+    there, so the store is still only touched from the GUI thread. A
+    column edited while its order was being built just drops the result.
+    """
+    
+    built = pyqtSignal(object)
+    
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.pending = []
+        self.thread = None
+        self.cancel_event = threading.Event()
+        self.built.connect(self.on_built)
+        
+    def warm(self, columns=None):
+        if columns is None:
+            columns = range(len(self.store.columns))
+        self.pending = list(columns)
+        if self.thread is None:
+            self.build_next()
+            
+    def build_next(self):
+        while self.pending:
+            column = self.pending.pop(0)
+            if self.store.has_sort_index(column):
+                continue
+            self.thread = threading.Thread(target=self.run, args=(self.store.sort_index_builder(column),),
+                                           name='sort-index', daemon=True)
+            self.thread.start()
+            return
+            
+    def run(self, build):
+        result = build(self.cancel_event)
+        if result is not None:
+            self.built.emit(result)
+            
+    def stop(self):
+        """Abandon the orders not built yet; returns once the worker is done."""
+        self.pending = []
+        self.cancel_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        
+    def on_built(self, result):
+        self.thread = None
+        self.store.install_sort_index(result)
+        self.build_next()
+
+
+class ApplicantImporter(QObject):
+    """Runs one ImportWorker at a time and appends its batches to a store."""
+    
+    started = pyqtSignal()
+    progress = pyqtSignal(int, int, int, int)
+    finished = pyqtSignal(int, int)
+    cancelled = pyqtSignal(int, int)
+    failed = pyqtSignal(str)
+    
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.thread = None
+        self.worker = None
+        self.rejected = 0      # rows of batches the store refused
+        self.sort_warmer = SortIndexWarmer(store, self)
+        
+    def is_running(self):
+        return self.thread is not None
+        
+    def start(self, path, defaults=None):
+        if self.is_running():
+            raise RuntimeError("an import is already running")
+        
+        self.thread = QThread(self)
+        self.rejected = 0
+        self.worker = ImportWorker(path, defaults)
+        self.worker.moveToThread(self.thread)
+        
+        # Cross-thread signals are queued, so store appends run on this thread
+        self.worker.batch_ready.connect(self.on_batch)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.finished.connect(lambda rows, failed: self.on_done(self.finished, rows, failed))
+        self.worker.cancelled.connect(lambda rows, failed: self.on_done(self.cancelled, rows, failed))
+        self.worker.failed.connect(lambda message: self.on_done(self.failed, message))
+        
+        self.thread.started.connect(self.worker.run)
+        self.thread.start()
+        self.started.emit()
+        
+    def on_batch(self, batch):
+        try:
+            self.store.append_columns(batch)
+        except (ValueError, TypeError, OverflowError) as e:
+            # The store keeps nothing of a batch it refuses
+            rows = len(next(iter(batch.values()), ()))
+            self.rejected += rows
+            log.warning("dropped a batch of %d applicants: %s", rows, e)
+        finally:
+            self.worker.acknowledge()
+        
+    def on_progress(self, rows, failed, bytes_read, total_bytes):
+        self.progress.emit(rows - self.rejected, failed + self.rejected, bytes_read, total_bytes)
+        
+    def cancel(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            
+    def on_done(self, signal, *result):
+        self.thread.quit()
+        self.thread.wait()
+        self.worker.deleteLater()
+        self.thread.deleteLater()
+        self.worker = None
+        self.thread = None
+        # Even a failed or cancelled import may have added rows; have every
+        # column's order ready before the user clicks a header
+        if len(self.store):
+            self.sort_warmer.warm()
+        # Emitted after cleanup so receivers already see is_running() == False
+        if signal is not self.failed:
+            rows, failed = result
+            result = (rows - self.rejected, failed + self.rejected)
+        signal.emit(*result)
+
+
+_default_importer = None
+
+
+def get_importer():
+    """Application-wide importer, so an import outlives the page that started it."""
+    global _default_importer
+    if _default_importer is None:
+        from core.applicants.store import get_store
+        _default_importer = ApplicantImporter(get_store())
+    return _default_importer
+
+
+def stop_sort_warmer():
+    """Stop building sort orders, so no worker outlives the application."""
+    if _default_importer is not None:
+        _default_importer.sort_warmer.stop()
@@ -0,0 +1,30 @@
+from PyQt5.QtCore import QObject, QTimer
+
+
+class PoolBridge(QObject):
+    """Polls a ProcessBotPool's shared-memory progress once per frame.
+    
+    Polling runs the pool's progress callbacks on the GUI thread, and those
+    publish to the event bus like the in-process engine's callbacks do (see
+    core.bots.engine.publish_session_events). Nothing here emits a signal
+    per bot event; the EventPump delivers coalesced batches.
+    """
+    
+    FRAME_MS = 33
+    
+    def __init__(self, pool, parent=None):
+        super().__init__(parent)
+        self.pool = pool
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(self.FRAME_MS)
+        self.poll_timer.timeout.connect(pool.poll)
+        self.poll_timer.start()
+        
+    def submit(self, session):
+        return self.pool.submit(session)
+        
+    def cancel(self, session_id):
+        self.pool.cancel(session_id)
+        
+    def cancel_all(self):
+        self.pool.cancel_all()
@@ -0,0 +1,44 @@
+from PyQt5.QtCore import QObject, QTimer, QElapsedTimer, pyqtSignal
+
+from core import instrument
+
+
+class EventPump(QObject):
+    """Flushes an EventBus on the GUI thread, at most once per frame.
+    
+    The bus wakes the pump when events start piling up; publishers on other
+    threads only emit a queued signal then, never once per event.
+    """
+    
+    FRAME_MS = 16
+    
+    wakeup = pyqtSignal()
+    
+    def __init__(self, bus, parent=None):
+        super().__init__(parent)
+        self.bus = bus
+        self.clock = QElapsedTimer()
+        self.clock.start()
+        
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.timeout.connect(self.flush)
+        
+        # Emitted from publishing threads, delivered on the GUI thread
+        self.wakeup.connect(self.schedule)
+        bus.set_wakeup(self.wakeup.emit)
+        # The bus only wakes on going from empty to pending, so events
+        # published before the pump existed would otherwise never flush
+        if bus.pending():
+            self.schedule()
+        
+    def schedule(self):
+        if not self.flush_timer.isActive():
+            self.flush_timer.start(max(0, self.FRAME_MS - self.clock.elapsed()))
+            
+    @instrument.timed('ui.event_flush')
+    def flush(self):
+        self.clock.restart()
+        self.bus.flush()
+        if self.bus.pending():
+            self.schedule()